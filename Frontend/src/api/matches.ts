@@ -1,5 +1,85 @@
-import { apiRequest } from "./client";
+import { API_BASE_URL, apiRequest } from "./client";
 
 export async function fetchMatches(token: string) {
   return apiRequest("/api/matches/", {}, token);
 }
+
+export type MatchStatus = "pending" | "accepted" | "rejected";
+
+export type TriageResult = {
+  id: number;
+  status: MatchStatus;
+  outcome: "updated" | "unchanged" | "not_found";
+};
+
+// Recruiters: apply many status changes in one request (up to 500).
+export async function triageMatches(
+  token: string,
+  updates: { id: number; status: MatchStatus }[]
+): Promise<{ results: TriageResult[] }> {
+  return apiRequest(
+    "/api/matches/triage/",
+    { method: "POST", body: JSON.stringify({ updates }) },
+    token
+  );
+}
+
+export type MatchDelta<T = any> = {
+  results: T[];
+  removed: number[];
+  cursor: string | null;
+};
+
+// Delta sync: pass the cursor from the previous call (or null for a full
+// sync), upsert `results` by id and drop `removed`. Returns null when the
+// server answered 304 for the given etag, i.e. nothing changed.
+export async function syncMatches(
+  token: string,
+  cursor: string | null,
+  etag?: string | null
+): Promise<{ delta: MatchDelta; etag: string | null } | null> {
+  const headers: Record<string, string> = {
+    Accept: "application/json",
+    Authorization: `Bearer ${token}`,
+  };
+  if (etag) headers["If-None-Match"] = etag;
+
+  const since = encodeURIComponent(cursor ?? "");
+  const res = await fetch(`${API_BASE_URL}/api/matches/?since=${since}`, { headers });
+  if (res.status === 304) return null;
+  if (!res.ok) throw { status: res.status, data: await res.text() };
+  return { delta: await res.json(), etag: res.headers.get("ETag") };
+}
+
+export type MatchEvent =
+  | { type: "match.liked"; job_id: number; jobseeker_id: number; match_id: number | null }
+  | { type: "match.status"; match_id: number; job_id: number; status: string };
+
+// Pushes match events for the logged-in profile; call syncMatches() when one
+// arrives. Reconnects with backoff until the returned function is called.
+export function subscribeMatchEvents(token: string, onEvent: (event: MatchEvent) => void) {
+  let socket: WebSocket | null = null;
+  let closed = false;
+  let delay = 1000;
+
+  const connect = () => {
+    const url = `${API_BASE_URL.replace(/^http/, "ws")}/ws/matches/?token=${encodeURIComponent(token)}`;
+    socket = new WebSocket(url);
+    socket.onopen = () => {
+      delay = 1000;
+    };
+    socket.onmessage = (message) => onEvent(JSON.parse(message.data));
+    socket.onclose = (event) => {
+      // 4401: token invalid or expired; the caller resubscribes with a new one.
+      if (closed || event.code === 4401) return;
+      setTimeout(connect, delay);
+      delay = Math.min(delay * 2, 30000);
+    };
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    socket?.close();
+  };
+}
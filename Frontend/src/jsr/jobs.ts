@@ -17,8 +17,89 @@ export interface CreateJobPayload {
 }
 
 
-export async function fetchJobsForSeeker(accessToken: string) {
-  return apiRequest("/api/jobs/", { method: "GET" }, accessToken);
+export interface SwipeFeedPage<T = any> {
+  next_cursor: string | null;
+  has_more: boolean;
+  prefetch_at: number | null;
+  results: T[];
+}
+
+// /api/jobs/ and /api/my-jobs/ are paginated like the swipe feed; follow
+// next_cursor until the last page. The swipe screen pages fetchSwipeFeed
+// on demand instead.
+async function fetchAllJobPages(path: string, accessToken: string) {
+  const jobs: any[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ limit: "100" });
+    if (cursor) params.append("cursor", cursor);
+    const page = (await apiRequest(
+      `${path}?${params.toString()}`,
+      { method: "GET" },
+      accessToken
+    )) as SwipeFeedPage;
+    jobs.push(...page.results);
+    cursor = page.has_more ? page.next_cursor : null;
+  } while (cursor);
+  return jobs;
+}
+
+// "card" leaves out description, tags and recruiter; load them with fetchJob.
+export type JobView = "card" | "detail";
+
+export interface JobFacetFilters {
+  category?: string;
+  governorate?: string;
+  experience?: number;
+}
+
+export interface JobFacets {
+  count: number;
+  facets: {
+    category: Record<string, number>;
+    governorate: Record<string, number>;
+    experience: Record<string, number>;
+  };
+}
+
+function appendFilters(params: URLSearchParams, filters: JobFacetFilters = {}) {
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value !== undefined && value !== "") params.append(key, String(value));
+  });
+}
+
+export async function fetchJobFacets(accessToken: string, filters: JobFacetFilters = {}) {
+  const params = new URLSearchParams();
+  appendFilters(params, filters);
+  return apiRequest(
+    `/api/jobs/facets/?${params.toString()}`,
+    { method: "GET" },
+    accessToken
+  ) as Promise<JobFacets>;
+}
+
+export async function fetchSwipeFeed(
+  accessToken: string,
+  cursor?: string | null,
+  limit = 20,
+  ranked = false,
+  view?: JobView,
+  filters?: JobFacetFilters
+) {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) params.append("cursor", cursor);
+  if (view) params.append("view", view);
+  appendFilters(params, filters);
+  const path = ranked ? "/api/jobs/feed/ranked/" : "/api/jobs/feed/";
+  return apiRequest(
+    `${path}?${params.toString()}`,
+    { method: "GET" },
+    accessToken
+  ) as Promise<SwipeFeedPage>;
+}
+
+export async function fetchJob(accessToken: string, jobId: number) {
+  return apiRequest(`/api/jobs/${jobId}/`, { method: "GET" }, accessToken);
 }
 
 export async function likeOrDislikeJob(
@@ -33,6 +114,27 @@ export async function likeOrDislikeJob(
   );
 }
 
+export interface Swipe {
+  job_id: number;
+  action: "like" | "dislike";
+  client_ts?: string;
+}
+
+export async function sendSwipes(accessToken: string, swipes: Swipe[]) {
+  return apiRequest(
+    "/api/jobs/swipes/",
+    { method: "POST", body: JSON.stringify({ swipes }) },
+    accessToken
+  ) as Promise<{
+    results: {
+      job_id: number;
+      status: "ok" | "not_found";
+      action?: "like" | "dislike";
+      match_id?: number | null;
+    }[];
+  }>;
+}
+
 export async function createJob(accessToken: string, payload: CreateJobPayload) {
   return apiRequest(
     "/api/my-jobs/",
@@ -42,7 +144,7 @@ export async function createJob(accessToken: string, payload: CreateJobPayload)
 }
 
 export async function fetchMyJobs(accessToken: string) {
-  return apiRequest("/api/my-jobs/", { method: "GET" }, accessToken);
+  return fetchAllJobPages("/api/my-jobs/", accessToken);
 }
 
 // ----- NEW: update & delete helpers -----
@@ -66,3 +168,15 @@ export async function deleteJob(accessToken: string, jobId: number) {
     accessToken
   );
 }
+
+export async function fetchJobCandidates(
+  accessToken: string,
+  jobId: number,
+  mode: "and" | "or" = "and"
+) {
+  return apiRequest(
+    `/api/jobs/${jobId}/candidates/?mode=${mode}`,
+    { method: "GET" },
+    accessToken
+  );
+}
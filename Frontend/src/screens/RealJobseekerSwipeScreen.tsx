@@ -18,10 +18,14 @@ import { Colors } from "../theme/colors";
 import { Spacing } from "../theme/spacing";
 import { Radius } from "../theme/radius";
 import { Shadow } from "../theme/shadow";
-import { fetchJobsForSeeker, likeOrDislikeJob } from "../jsr/jobs";
+import { fetchSwipeFeed, likeOrDislikeJob } from "../jsr/jobs";
 
 const { width: SCREEN_WIDTH } = Dimensions.get("window");
 const SWIPE_THRESHOLD = SCREEN_WIDTH * 0.25;
+// Cards are fetched a page at a time ("card" view, see jsr/jobs.ts); the
+// next page is requested once this few cards are left in the deck.
+const PAGE_SIZE = 20;
+const PREFETCH_REMAINING = 5;
 
 export default function RealJobseekerSwipeScreen() {
   const { role, accessToken } = useAppContext() as any;
@@ -30,6 +34,8 @@ export default function RealJobseekerSwipeScreen() {
   const [swipedIds, setSwipedIds] = useState<number[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const position = useRef(new Animated.ValueXY()).current;
 
@@ -54,8 +60,11 @@ export default function RealJobseekerSwipeScreen() {
     setLoading(true);
     setError(null);
     try {
-      const data = (await fetchJobsForSeeker(accessToken)) as Job[];
-      setJobs(data);
+      const page = await fetchSwipeFeed(accessToken, null, PAGE_SIZE, false, "card");
+      setJobs(page.results as Job[]);
+      setCursor(page.has_more ? page.next_cursor : null);
+      setSwipedIds([]);
+      setCurrentIndex(0);
     } catch (e: any) {
       const msg =
         e?.data?.detail ||
@@ -68,6 +77,27 @@ export default function RealJobseekerSwipeScreen() {
     }
   };
 
+  const loadMore = async () => {
+    if (!cursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchSwipeFeed(accessToken, cursor, PAGE_SIZE, false, "card");
+      setJobs((prev) => {
+        const seen = new Set(prev.map((j) => j.id));
+        return [...prev, ...(page.results as Job[]).filter((j) => !seen.has(j.id))];
+      });
+      setCursor(page.has_more ? page.next_cursor : null);
+    } catch {
+      // the next swipe retries
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  useEffect(() => {
+    if (availableJobs.length - currentIndex <= PREFETCH_REMAINING) loadMore();
+  }, [availableJobs.length, currentIndex, cursor]);
+
   useEffect(() => {
     if (currentJob) {
       Animated.timing(cardEntranceAnim, {
@@ -2,6 +2,7 @@
 ASGI config for Projet_Mobile project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSocket connections are routed by jsr.routing.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -13,4 +14,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Projet_Mobile.settings')
 
-application = get_asgi_application()
+# Set up Django before importing consumers, which import models.
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from jsr.routing import websocket_urlpatterns  # noqa: E402
+
+# No origin check: sockets authenticate with a bearer token, not cookies,
+# and the mobile client sends no Origin header.
+application = ProtocolTypeRouter(
+    {
+        "http": django_asgi_app,
+        "websocket": URLRouter(websocket_urlpatterns),
+    }
+)
@@ -0,0 +1,12 @@
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+
+def health_view(request):
+    """GET /healthz: 200 once the app is loaded and the database answers."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return JsonResponse({"status": "unavailable"}, status=503)
+    return JsonResponse({"status": "ok"})
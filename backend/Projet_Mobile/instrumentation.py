@@ -0,0 +1,275 @@
+"""
+Per-request instrumentation.
+
+RequestMetricsMiddleware records, per route template (e.g.
+"api/jobs/<int:pk>/like/") and method: latency, DB query count, DB time,
+serializer time and response size as Prometheus histograms, exposed by
+metrics_view at /metrics. Serializer time is what the response builders
+report through timed_serialization(): serializers with TimedDataMixin and
+the jsr.fast_json row builders.
+
+Requests slower than METRICS_SLOW_REQUEST_MS are sampled at
+METRICS_SLOW_SAMPLE_RATE and logged to "Projet_Mobile.slow_requests" with
+their slowest SQL statements.
+
+Values computed when scraped (e.g. jsr.swipe_queue's depth and lag) are
+collectors registered with register_scrape_collector(): per-process Gauge
+callbacks do not survive prometheus_client's multiprocess mode, so
+metrics_view adds these collectors to the aggregated registry itself.
+/metrics needs METRICS_TOKEN as a bearer token, or DEBUG when none is set.
+
+Works for sync and async views. The per-request cost is a ContextVar, a few
+perf_counter() calls per query and one observe() per histogram. Labels are route templates, never raw paths, so
+cardinality stays bounded.
+"""
+import hmac
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from rest_framework.serializers import ListSerializer
+
+logger = logging.getLogger("Projet_Mobile.slow_requests")
+
+LABELS = ("route", "method")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request.",
+    LABELS + ("status",),
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run by a request.",
+    LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in the database during a request.",
+    LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_SERIALIZER_TIME = Histogram(
+    "http_request_serializer_duration_seconds",
+    "Time spent building response data during a request.",
+    LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of non-streaming response bodies.",
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+_current = ContextVar("request_stats", default=None)
+_scrape_collectors = []
+
+
+def register_scrape_collector(collector):
+    """Export a collector from every process, multiprocess mode included."""
+    _scrape_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "serializer_time", "serializer_depth", "statements")
+
+    def __init__(self, keep_statements):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.statements = [] if keep_statements else None
+
+
+def record_query(execute, sql, params, many, context):
+    # Installed on every connection; async views run their queries in a
+    # worker thread, so the stats travel in a ContextVar, not a wrapper
+    # scoped to the request's thread.
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        stats.queries += 1
+        stats.db_time += elapsed
+        if stats.statements is not None:
+            stats.statements.append((elapsed, sql))
+
+
+def install_query_recorder(connection, **kwargs):
+    # At the front: execute_wrapper() blocks pop() from the end, and the
+    # connection may open inside one.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Count the block as the current request's serializer time. Only the
+    outermost block is timed, so nested serializers are counted once.
+    """
+    stats = _current.get()
+    if stats is None or stats.serializer_depth:
+        yield
+        return
+    stats.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += time.perf_counter() - start
+        stats.serializer_depth -= 1
+
+
+class TimedDataMixin:
+    """Serializer mixin that times .data with timed_serialization()."""
+
+    @property
+    def data(self):
+        with timed_serialization():
+            return super().data
+
+
+class TimedListSerializer(TimedDataMixin, ListSerializer):
+    """Meta.list_serializer_class for timed serializers used with many=True."""
+
+
+def route_of(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.route or match.view_name or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Put first in MIDDLEWARE so the latency covers the whole stack."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "METRICS_ENABLED", True)
+        self.slow_seconds = getattr(settings, "METRICS_SLOW_REQUEST_MS", 0) / 1000
+        self.slow_sample_rate = getattr(settings, "METRICS_SLOW_SAMPLE_RATE", 1.0)
+        # Connections opened before this module was imported.
+        for conn in connections.all(initialized_only=True):
+            install_query_recorder(conn)
+
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.measured(request):
+            return self.get_response(request)
+
+        stats, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        if not self.measured(request):
+            return await self.get_response(request)
+
+        stats, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, start)
+
+    def measured(self, request):
+        return self.enabled and request.path_info != "/metrics"
+
+    def start(self, request):
+        # Statements are only kept when this request could be logged as slow.
+        sampled = self.slow_seconds > 0 and random.random() < self.slow_sample_rate
+        stats = RequestStats(keep_statements=sampled)
+        return stats, _current.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, start):
+        elapsed = time.perf_counter() - start
+        route = route_of(request)
+        labels = (route, request.method)
+        REQUEST_LATENCY.labels(route, request.method, str(response.status_code)).observe(elapsed)
+        REQUEST_QUERIES.labels(*labels).observe(stats.queries)
+        REQUEST_DB_TIME.labels(*labels).observe(stats.db_time)
+        REQUEST_SERIALIZER_TIME.labels(*labels).observe(stats.serializer_time)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+        if stats.statements is not None and elapsed >= self.slow_seconds:
+            self.log_slow_request(request, route, response, elapsed, stats)
+        return response
+
+    def log_slow_request(self, request, route, response, elapsed, stats):
+        slowest = sorted(stats.statements, key=lambda s: s[0], reverse=True)[:10]
+        logger.warning(
+            "Slow request %s %s (%s) status=%s %.1fms queries=%d db=%.1fms "
+            "serializer=%.1fms\n%s",
+            request.method,
+            request.path,
+            route,
+            response.status_code,
+            elapsed * 1000,
+            stats.queries,
+            stats.db_time * 1000,
+            stats.serializer_time * 1000,
+            "\n".join(f"  {t * 1000:.1f}ms {sql}" for t, sql in slowest),
+        )
+
+
+def metrics_allowed(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        return settings.DEBUG
+    header = request.headers.get("Authorization", "")
+    return hmac.compare_digest(header.encode("utf-8"), f"Bearer {token}".encode("utf-8"))
+
+
+def metrics_view(request):
+    """GET /metrics in the Prometheus text format."""
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # One registry per worker process; aggregate them on read.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _scrape_collectors:
+            registry.register(collector)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,33 @@
+"""
+Uploaded media served by the application servers.
+
+Responses are FileResponses streamed from MEDIA_ROOT by
+django.views.static.serve, which also answers If-Modified-Since with 304.
+Processed avatars (api.avatars) have content-addressed names and are
+cached for a year; anything else for a few minutes. Raw avatar uploads
+waiting for the worker still carry their EXIF metadata and are not served,
+nor are stored job imports (jsr.bulk).
+"""
+import posixpath
+
+from django.conf import settings
+from django.http import Http404
+from django.views.static import serve
+
+from api.avatars import is_processed, is_raw_upload
+from jsr.bulk import is_import_upload
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=300"
+
+
+def media_view(request, path):
+    name = posixpath.normpath(path).lstrip("/")
+    if is_raw_upload(name) or is_import_upload(name):
+        raise Http404
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_processed(path):
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response["Cache-Control"] = DEFAULT_CACHE_CONTROL
+    return response
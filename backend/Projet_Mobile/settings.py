@@ -30,6 +30,8 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1", "192.168.1.6"]
 # Application definition
 
 INSTALLED_APPS = [
+    # Before staticfiles: makes runserver serve ASGI, WebSockets included.
+    "daphne",
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -38,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     "rest_framework",
     "rest_framework.authtoken",
+    "channels",
     "api",
     "jsr",
     "corsheaders",
@@ -45,11 +48,34 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.ProfileJWTAuthentication",
     ),
 }
 
+# jsr (swipe/feed/match) endpoints trust the role/profile_id claims in the
+# access token instead of loading the user, see api.authentication.
+JSR_STATELESS_AUTH = os.getenv("JSR_STATELESS_AUTH", "1") == "1"
+
+# Swipes are queued and materialized by the jsr.tasks.drain_swipe_queue
+# worker instead of inside the request, see jsr.swipe_queue.
+SWIPE_WRITE_BEHIND = os.getenv("SWIPE_WRITE_BEHIND", "1") == "1"
+SWIPE_QUEUE_BACKEND = os.getenv("SWIPE_QUEUE_BACKEND", "database")
+
+# Feed, matches and /me GETs use the async views (api.async_views,
+# jsr.async_views). Meant for ASGI servers; they also run under WSGI.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "1") == "1"
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_BEAT_SCHEDULE = {
+    "drain-swipe-queue": {
+        "task": "jsr.tasks.drain_swipe_queue",
+        "schedule": 1.0,
+    },
+}
+
 MIDDLEWARE = [
+    "Projet_Mobile.instrumentation.RequestMetricsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -79,6 +105,23 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'Projet_Mobile.wsgi.application'
+ASGI_APPLICATION = "Projet_Mobile.asgi.application"
+
+# Channel layer for WebSocket match events (jsr.notifications). Redis when
+# CHANNEL_REDIS_URL is set, so web servers and workers share groups;
+# in-memory (single process only) otherwise.
+
+if os.getenv("CHANNEL_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [os.getenv("CHANNEL_REDIS_URL")]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+    }
 
 
 # Database
@@ -97,6 +140,24 @@ DATABASES = {
     }
 }
 
+# Cache
+# Redis when CACHE_URL is set (shared by all web processes), otherwise a
+# per-process locmem cache for development and tests.
+
+if os.getenv("CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -119,6 +180,16 @@ AUTH_PASSWORD_VALIDATORS = [
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
+# Per-request latency/query/serializer histograms served at /metrics, see
+# Projet_Mobile.instrumentation. Requests slower than METRICS_SLOW_REQUEST_MS
+# (0 disables) are sampled at METRICS_SLOW_SAMPLE_RATE and logged with their SQL.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_SLOW_REQUEST_MS = int(os.getenv("METRICS_SLOW_REQUEST_MS", "500"))
+METRICS_SLOW_SAMPLE_RATE = float(os.getenv("METRICS_SLOW_SAMPLE_RATE", "0.1"))
+# Scrapers send "Authorization: Bearer <METRICS_TOKEN>". Without a token,
+# /metrics is only served with DEBUG on.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
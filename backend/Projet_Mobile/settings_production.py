@@ -0,0 +1,26 @@
+"""
+Production profile: DJANGO_SETTINGS_MODULE=Projet_Mobile.settings_production.
+
+Served by gunicorn (see gunicorn.conf.py). Migrations run as a separate
+one-off step (the migrate service in docker-compose), never at boot.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+DEBUG = False
+SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "localhost").split(",")
+
+# Reuse each worker thread's connection for DB_CONN_MAX_AGE seconds instead
+# of connecting per request; health checks replace dead ones before use.
+# Set DB_CONN_MAX_AGE=0 for ASGI servers: Django runs each request's sync
+# code in a fresh thread there, so persistent connections would only pile up
+# (put PgBouncer in front instead).
+DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# The HTTP API runs on threaded WSGI workers, where the async views only add
+# an event loop per request.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "0") == "1"
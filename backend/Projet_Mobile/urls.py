@@ -15,14 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.conf.urls.static import static
 from django.urls import path, include
 from django.conf import settings
 
+from .health import health_view
+from .instrumentation import metrics_view
+from .media import media_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("api.urls")),
     path("api/", include("jsr.urls")),
+    path("metrics", metrics_view),
+    path("healthz", health_view),
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", media_view),
 ]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
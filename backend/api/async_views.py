@@ -0,0 +1,109 @@
+"""
+Async views for read-heavy endpoints.
+
+DRF 3.14 views are synchronous; under ASGI Django runs each one in the single
+thread reserved for sync code, so slow queries queue behind each other.
+AsyncAPIView is a plain Django async view with the parts of APIView these
+endpoints need: authentication_classes (authenticators with an
+aauthenticate(), like StatelessProfileJWTAuthentication, run on the event
+loop; others in a thread), IsAuthenticated, CSRF exemption, DRF-style error
+bodies, and JSON output of serializer data built from rows fetched with the
+async ORM. Bodies are rendered by DRF's JSONRenderer, so they are the bytes
+the sync views return.
+
+Under WSGI the same views still work (Django runs them through
+async_to_sync), just without the concurrency benefit. settings.ASYNC_VIEWS
+selects them in the URL confs.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from .serializers import MeSerializer
+from .views import MeView
+
+User = get_user_model()
+
+
+class AsyncAPIView(View):
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    renderer = JSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # As APIView: requests are authenticated by token, not by session
+        # cookie, so CsrfViewMiddleware must not reject them.
+        view.csrf_exempt = True
+        return view
+
+    def get_authenticators(self):
+        return [auth() for auth in self.authentication_classes]
+
+    async def authenticate(self, request):
+        # Honour APIClient.force_authenticate, as DRF's Request does.
+        forced = getattr(request, "_force_auth_user", None)
+        if forced is not None:
+            return forced, getattr(request, "_force_auth_token", None)
+
+        for authenticator in self.get_authenticators():
+            if hasattr(authenticator, "aauthenticate"):
+                result = await authenticator.aauthenticate(request)
+            else:
+                result = await sync_to_async(authenticator.authenticate)(request)
+            if result is not None:
+                return result
+        raise exceptions.NotAuthenticated()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user, request.auth = await self.authenticate(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def handle_exception(self, exc):
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        response = self.json(data, status=exc.status_code)
+        authenticators = self.get_authenticators()
+        if authenticators and isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            response["WWW-Authenticate"] = authenticators[0].authenticate_header(None)
+        return response
+
+    def json(self, data, status=200):
+        return HttpResponse(
+            self.renderer.render(data), status=status, content_type=self.renderer.media_type
+        )
+
+
+class AsyncMeView(AsyncAPIView):
+    """
+    GET /api/auth/me/ with the async ORM.
+    PATCH is delegated to the sync MeView (uploads, validation), which
+    reuses the user authenticated here instead of checking the token again.
+    Authenticates as MeView does.
+    """
+    authentication_classes = MeView.authentication_classes
+
+    async def get(self, request):
+        user = request.user
+        if not isinstance(user, User):
+            # Token-claims user (stateless authentication): load the row.
+            user = await User.objects.select_related("userprofile").aget(pk=user.pk)
+            if not user.is_active:
+                raise exceptions.AuthenticationFailed("User is inactive.", code="user_inactive")
+        return self.json(MeSerializer(user).data)
+
+    async def patch(self, request):
+        # DRF's Request takes these as already authenticated (force_authenticate).
+        request._force_auth_user, request._force_auth_token = request.user, request.auth
+        return await sync_to_async(MeView.as_view())(request)
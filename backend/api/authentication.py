@@ -0,0 +1,157 @@
+import threading
+from datetime import datetime, timezone
+
+from cachetools import LRUCache, TTLCache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken, UserProfile
+from .profiles import get_profile_ref
+
+ROLE_CLAIM = "role"
+PROFILE_ID_CLAIM = "profile_id"
+
+# Revoked ids are cached until the process restarts (they expire with the
+# token anyway); confirmed-good ids are re-checked after CHECKED_TTL seconds.
+CHECKED_TTL = 30
+
+_revoked = LRUCache(maxsize=100_000)
+_checked = TTLCache(maxsize=100_000, ttl=CHECKED_TTL)
+_lock = threading.Lock()
+
+
+class _UserWithProfileModel:
+    """
+    Stands in for the user model inside JWTAuthentication.get_user so the
+    user lookup also joins the UserProfile; token checks stay upstream's.
+    """
+
+    def __init__(self, model):
+        self.objects = model.objects.select_related("userprofile")
+        self.DoesNotExist = model.DoesNotExist
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads request.user together with its UserProfile,
+    so api.profiles.get_user_profile costs no query for the rest of the request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user_model = _UserWithProfileModel(self.user_model)
+
+    def get_user(self, validated_token):
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and is_revoked(jti):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        return super().get_user(validated_token)
+
+
+class ClaimsUser(TokenUser):
+    """
+    Token-backed user whose `userprofile` is built from the role/profile_id
+    claims. Other profile fields are deferred and load on first access.
+    Tokens issued before those claims existed fall back to the cached
+    api.profiles.get_profile_ref lookup.
+    """
+
+    @property
+    def has_profile_claims(self):
+        return PROFILE_ID_CLAIM in self.token and ROLE_CLAIM in self.token
+
+    @cached_property
+    def userprofile(self):
+        if self.has_profile_claims:
+            pk, role = self.token[PROFILE_ID_CLAIM], self.token[ROLE_CLAIM]
+        else:
+            try:
+                pk, role = get_profile_ref(self.id)
+            except UserProfile.DoesNotExist:
+                raise AuthenticationFailed("User has no profile.", code="user_not_found")
+        return UserProfile.from_db("default", ["id", "user_id", "role"], [pk, self.id, role])
+
+
+def _cached_revocation(jti):
+    """True/False when the local caches know the answer, else None."""
+    with _lock:
+        if jti in _revoked:
+            return True
+        if jti in _checked:
+            return False
+    return None
+
+
+def _remember_revocation(jti, revoked):
+    with _lock:
+        if revoked:
+            _revoked[jti] = True
+        else:
+            _checked[jti] = True
+    return revoked
+
+
+def is_revoked(jti) -> bool:
+    cached = _cached_revocation(jti)
+    if cached is not None:
+        return cached
+    return _remember_revocation(jti, RevokedToken.objects.filter(jti=jti).exists())
+
+
+async def ais_revoked(jti) -> bool:
+    cached = _cached_revocation(jti)
+    if cached is not None:
+        return cached
+    return _remember_revocation(jti, await RevokedToken.objects.filter(jti=jti).aexists())
+
+
+def revoke(token):
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token["exp"], tz=timezone.utc)
+    RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    with _lock:
+        _checked.pop(jti, None)
+        _revoked[jti] = True
+
+
+class StatelessProfileJWTAuthentication(JWTAuthentication):
+    """
+    Trusts the signed claims instead of loading the User row: request.user
+    is a ClaimsUser. The only database access is the revocation check, and
+    only when the token id is not already in the local caches.
+
+    User deactivation and password changes take effect when the (short-lived)
+    access token expires; use revoke() to cut a token off earlier.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and is_revoked(jti):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+
+        return ClaimsUser(validated_token)
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views: same checks, async ORM."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if jti and await ais_revoked(jti):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+
+        return ClaimsUser(validated_token), validated_token
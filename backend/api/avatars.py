@@ -0,0 +1,246 @@
+"""
+Avatar image pipeline.
+
+MeSerializer checks uploads with validate_avatar() before they are stored:
+the file must decode as JPEG, PNG or WebP and stay within MAX_AVATAR_BYTES
+and MAX_AVATAR_PIXELS. Once the profile is saved, schedule() hands it to a
+Celery worker (api.tasks.process_avatar), which runs process():
+
+    avatars/v/<profile>-<digest>.jpg             the upload, at most 1600px
+    avatars/v/<profile>-<digest>-thumb.webp|jpg  128x128, match lists
+    avatars/v/<profile>-<digest>-medium.webp|jpg 512x512, profile screens
+
+All of them are re-encoded from pixels only, so EXIF (GPS position, camera
+serial) and other metadata never leave the server; the raw upload is deleted,
+or dropped from the profile if it does not decode. <digest> is a hash of the
+uploaded bytes, so a file under avatars/v/ never changes and
+Projet_Mobile.media serves it as immutable. The profile id keeps profiles
+that upload the same image from sharing files, so replacing one avatar never
+deletes another's.
+
+Raw uploads (UPLOAD_PREFIX, outside avatars/v/) still carry their metadata:
+no URL points at them (the avatar URLs are None until the worker has run)
+and Projet_Mobile.media does not serve them.
+"""
+import hashlib
+import logging
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+MAX_AVATAR_BYTES = 8 * 1024 * 1024
+MAX_AVATAR_PIXELS = 40_000_000
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP"}
+
+UPLOAD_PREFIX = "avatars/"  # UserProfile.avatar upload_to
+PROCESSED_PREFIX = "avatars/v/"
+ORIGINAL_MAX_SIZE = 1600
+VARIANTS = {"thumb": 128, "medium": 512}
+ENCODINGS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+# Sent with profile_id once a profile's processed avatar is in place.
+avatar_processed = Signal()
+
+
+def validate_avatar(upload):
+    if upload.size > MAX_AVATAR_BYTES:
+        raise serializers.ValidationError(
+            f"Avatar must be at most {MAX_AVATAR_BYTES // (1024 * 1024)} MB."
+        )
+    try:
+        upload.seek(0)
+        # Only the header is read; pixels are decoded by the worker.
+        with Image.open(upload) as image:
+            image_format, (width, height) = image.format, image.size
+    except (OSError, Image.DecompressionBombError):
+        raise serializers.ValidationError("Upload a valid image.")
+    finally:
+        upload.seek(0)
+    if image_format not in ALLOWED_FORMATS:
+        raise serializers.ValidationError("Avatar must be a JPEG, PNG or WebP image.")
+    if width * height > MAX_AVATAR_PIXELS:
+        raise serializers.ValidationError("Avatar dimensions are too large.")
+    return upload
+
+
+def is_processed(name):
+    return bool(name) and name.startswith(PROCESSED_PREFIX)
+
+
+def is_raw_upload(name):
+    return name.startswith(UPLOAD_PREFIX) and not is_processed(name)
+
+
+def stored_names(profile):
+    """Every file the profile's avatar currently occupies."""
+    names = [profile.avatar.name] if profile.avatar else []
+    for encodings in (profile.avatar_variants or {}).values():
+        names.extend(encodings.values())
+    return names
+
+
+def schedule(profile, stale=()):
+    """Process the profile's avatar after commit, then delete stale files."""
+    from .tasks import process_avatar
+
+    stale = list(stale)
+
+    def enqueue():
+        try:
+            process_avatar.delay(profile.pk, stale)
+        except Exception:
+            # The profile shows no avatar until process_avatars (run with
+            # every migrate) picks the raw upload up.
+            logger.exception("Could not queue avatar processing for profile %s", profile.pk)
+
+    transaction.on_commit(enqueue)
+
+
+def _encode(image, encoding):
+    image_format, options = ENCODINGS[encoding]
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def render(data):
+    """Return {storage name suffix: bytes} for the stripped original and variants."""
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGB")
+    image.info = {}
+
+    original = image.copy()
+    original.thumbnail((ORIGINAL_MAX_SIZE, ORIGINAL_MAX_SIZE), Image.Resampling.LANCZOS)
+    files = {".jpg": _encode(original, "jpeg")}
+    for variant, size in VARIANTS.items():
+        resized = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for encoding in ENCODINGS:
+            files[f"-{variant}.{EXTENSIONS[encoding]}"] = _encode(resized, encoding)
+    return files
+
+
+def process(profile_id, stale=()):
+    profile = UserProfile.objects.only("id", "avatar", "avatar_variants").filter(pk=profile_id).first()
+    if profile is not None and profile.avatar and not is_processed(profile.avatar.name):
+        _process(profile)
+        profile.refresh_from_db(fields=["avatar", "avatar_variants"])
+    current = set(stored_names(profile)) if profile is not None else set()
+    stale = set(stale) - current
+    if stale:
+        stale -= _shared(stale, profile_id)
+    for name in stale:
+        default_storage.delete(name)
+
+
+def _original_name(name):
+    """The avatar column value of the processed set `name` belongs to."""
+    if not is_processed(name):
+        return name
+    stem = name.rsplit(".", 1)[0]
+    for variant in VARIANTS:
+        if stem.endswith(f"-{variant}"):
+            stem = stem[: -len(variant) - 1]
+    return stem + ".jpg"
+
+
+def _shared(names, profile_id):
+    """
+    The names also in use by another profile. Files processed before names
+    carried the profile id are shared by every profile with the same upload.
+    """
+    originals = {name: _original_name(name) for name in names}
+    in_use = set(
+        UserProfile.objects.exclude(pk=profile_id)
+        .filter(avatar__in=set(originals.values()))
+        .values_list("avatar", flat=True)
+    )
+    return {name for name, original in originals.items() if original in in_use}
+
+
+def _process(profile):
+    source = profile.avatar.name
+    with default_storage.open(source, "rb") as f:
+        data = f.read()
+    try:
+        files = render(data)
+    except (OSError, Image.DecompressionBombError):
+        logger.warning("Avatar %s of profile %s could not be decoded", source, profile.pk)
+        # The raw file is never served, so the profile is left without avatar.
+        if UserProfile.objects.filter(pk=profile.pk, avatar=source).update(avatar=""):
+            default_storage.delete(source)
+        return
+
+    base = f"{PROCESSED_PREFIX}{profile.pk}-{hashlib.sha256(data).hexdigest()[:24]}"
+    for suffix, content in files.items():
+        if not default_storage.exists(base + suffix):
+            default_storage.save(base + suffix, ContentFile(content))
+    variants = {
+        variant: {encoding: f"{base}-{variant}.{EXTENSIONS[encoding]}" for encoding in ENCODINGS}
+        for variant in VARIANTS
+    }
+
+    # Only if the avatar was not replaced meanwhile; the newer upload has a
+    # task of its own.
+    updated = UserProfile.objects.filter(pk=profile.pk, avatar=source).update(
+        avatar=base + ".jpg", avatar_variants=variants
+    )
+    if updated:
+        default_storage.delete(source)
+        avatar_processed.send(sender=UserProfile, profile_id=profile.pk)
+
+
+def _url(name, request):
+    url = default_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def stored_variant_url(avatar, variants, variant, encoding="webp", request=None):
+    """variant_url() from the stored column values (avatar name, avatar_variants)."""
+    if not is_processed(avatar):
+        return None
+    name = (variants or {}).get(variant, {}).get(encoding, avatar)
+    return _url(name, request)
+
+
+def variant_url(profile, variant, encoding="webp", request=None):
+    return stored_variant_url(
+        profile.avatar.name, profile.avatar_variants, variant, encoding, request
+    )
+
+
+class AvatarField(serializers.ImageField):
+    """ImageField whose URL is None until the upload has been processed."""
+
+    def to_representation(self, value):
+        if not is_processed(getattr(value, "name", None)):
+            return None
+        return super().to_representation(value)
+
+
+def avatar_urls(profile, request=None):
+    """
+    {"thumb": {"webp": url, "jpeg": url}, "medium": {...}}, or None without
+    a processed avatar.
+    """
+    if not is_processed(profile.avatar.name):
+        return None
+    return {
+        variant: {
+            encoding: variant_url(profile, variant, encoding, request) for encoding in ENCODINGS
+        }
+        for variant in VARIANTS
+    }
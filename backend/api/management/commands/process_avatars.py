@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api import avatars
+from api.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Process avatars that are still raw uploads (backfill, or when the queue was unavailable)."
+
+    def handle(self, *args, **options):
+        pending = (
+            UserProfile.objects.exclude(avatar="")
+            .exclude(avatar__isnull=True)
+            .exclude(avatar__startswith=avatars.PROCESSED_PREFIX)
+            .values_list("id", flat=True)
+        )
+        count = 0
+        for profile_id in pending.iterator():
+            avatars.process(profile_id)
+            count += 1
+        self.stdout.write(f"processed={count}")
@@ -15,10 +15,19 @@ class UserProfile(models.Model):
     experience_years = models.PositiveIntegerField(null=True, blank=True)
     bio = models.TextField(blank=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    # Resized copies of avatar, written by api.avatars.process().
+    avatar_variants = models.JSONField(default=dict, blank=True)
     
     company_name = models.CharField(max_length=255, blank=True)
     position_title = models.CharField(max_length=255, blank=True)
 
     def __str__(self):
         return f"{self.user.username} ({self.role})"
-    
\ No newline at end of file
+    
+
+class RevokedToken(models.Model):
+    """Access and refresh token ids revoked before expiry, see api.authentication."""
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,72 @@
+"""
+UserProfile resolution.
+
+get_user_profile() returns the profile joined by ProfileJWTAuthentication
+(or loads it once and keeps it on the user object for the rest of the request).
+aget_user_profile() is the same for async views.
+
+get_profile_ref() returns only (id, role) for a user id and caches it in two
+tiers: a small per-process TTL cache in front of the shared Django cache.
+Entries are dropped by invalidate_profile_ref() when a profile is saved
+through MeSerializer; other processes see the change within the TTL.
+"""
+import threading
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from cachetools import TTLCache
+from django.core.cache import cache
+
+from .models import UserProfile
+
+PROFILE_REF_TTL = 60
+LOCAL_CACHE_SIZE = 10_000
+
+_local = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=PROFILE_REF_TTL)
+_local_lock = threading.Lock()
+
+
+class ProfileRef(NamedTuple):
+    id: int
+    role: str
+
+
+def get_user_profile(user) -> UserProfile:
+    # Reverse one-to-one access is cached on the instance after the first hit.
+    return user.userprofile
+
+
+async def aget_user_profile(user) -> UserProfile:
+    # Token claims carry the profile: no query, no thread hop.
+    if getattr(user, "has_profile_claims", False):
+        return user.userprofile
+    return await sync_to_async(get_user_profile)(user)
+
+
+def _cache_key(user_id):
+    return f"profile-ref:{user_id}"
+
+
+def get_profile_ref(user_id) -> ProfileRef:
+    with _local_lock:
+        ref = _local.get(user_id)
+    if ref is not None:
+        return ref
+
+    cached = cache.get(_cache_key(user_id))
+    if cached is not None:
+        ref = ProfileRef(*cached)
+    else:
+        pk, role = UserProfile.objects.values_list("id", "role").get(user_id=user_id)
+        ref = ProfileRef(pk, role)
+        cache.set(_cache_key(user_id), tuple(ref), PROFILE_REF_TTL)
+
+    with _local_lock:
+        _local[user_id] = ref
+    return ref
+
+
+def invalidate_profile_ref(user_id):
+    with _local_lock:
+        _local.pop(user_id, None)
+    cache.delete(_cache_key(user_id))
@@ -1,11 +1,19 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from Projet_Mobile.instrumentation import TimedDataMixin
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import avatars
+from .authentication import PROFILE_ID_CLAIM, ROLE_CLAIM, is_revoked
 from .models import UserProfile
+from .profiles import invalidate_profile_ref
 
 User = get_user_model()
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(TimedDataMixin, serializers.ModelSerializer):
     role = serializers.ChoiceField(
         choices=UserProfile.ROLE_CHOICES,
         write_only=True,
@@ -57,7 +65,46 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class MeSerializer(serializers.ModelSerializer):
+class ProfileTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embeds the profile id and role so jsr endpoints can skip the user lookup."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        profile = UserProfile.objects.filter(user=user).values_list("id", "role").first()
+        if profile is not None:
+            token[PROFILE_ID_CLAIM], token[ROLE_CLAIM] = profile
+        return token
+
+
+class ProfileTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses refresh tokens revoked by LogoutView."""
+
+    def validate(self, attrs):
+        try:
+            jti = RefreshToken(attrs["refresh"]).get(jwt_settings.JTI_CLAIM)
+        except TokenError as exc:
+            raise InvalidToken(exc.args[0])
+        if jti and is_revoked(jti):
+            raise InvalidToken("Token has been revoked.")
+        return super().validate(attrs)
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, value):
+        try:
+            token = RefreshToken(value)
+        except TokenError as exc:
+            raise serializers.ValidationError(exc.args[0])
+        user_id = self.context["request"].user.pk
+        if str(token.get(jwt_settings.USER_ID_CLAIM)) != str(user_id):
+            raise serializers.ValidationError("Token belongs to another user.")
+        return token
+
+
+class MeSerializer(TimedDataMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(read_only=True)
 
     # Frontend uses "name" but it maps to User.username
@@ -67,7 +114,8 @@ class MeSerializer(serializers.ModelSerializer):
     # Profile fields
     role = serializers.CharField(source="userprofile.role", read_only=True)
 
-    avatar = serializers.ImageField(source="userprofile.avatar", required=False, allow_null=True)
+    avatar = avatars.AvatarField(source="userprofile.avatar", required=False, allow_null=True)
+    avatar_urls = serializers.SerializerMethodField()
     skills = serializers.CharField(source="userprofile.skills", required=False, allow_blank=True)
     experience_years = serializers.IntegerField(source="userprofile.experience_years", required=False, allow_null=True)
     bio = serializers.CharField(source="userprofile.bio", required=False, allow_blank=True)
@@ -82,6 +130,7 @@ class MeSerializer(serializers.ModelSerializer):
             "email",
             "role",
             "avatar",
+            "avatar_urls",
             "skills",
             "experience_years",
             "bio",
@@ -89,6 +138,17 @@ class MeSerializer(serializers.ModelSerializer):
             "position_title",
         )
 
+    def get_avatar_urls(self, obj):
+        profile = getattr(obj, "userprofile", None)
+        if profile is None:
+            return None
+        return avatars.avatar_urls(profile, self.context.get("request"))
+
+    def validate_avatar(self, value):
+        if value is None:
+            return value
+        return avatars.validate_avatar(value)
+
     def update(self, instance, validated_data):
         # user fields
         instance.username = validated_data.get("username", instance.username)
@@ -97,7 +157,10 @@ class MeSerializer(serializers.ModelSerializer):
 
         # profile fields (nested via source="userprofile.xxx")
         profile_data = validated_data.pop("userprofile", {})
-        profile, _ = UserProfile.objects.get_or_create(user=instance)
+        try:
+            profile = instance.userprofile
+        except UserProfile.DoesNotExist:
+            profile = UserProfile(user=instance)
 
         allowed = {
             "avatar",
@@ -107,9 +170,21 @@ class MeSerializer(serializers.ModelSerializer):
             "company_name",
             "position_title",
         }
-        for k, v in profile_data.items():
-            if k in allowed:
-                setattr(profile, k, v)
-
-        profile.save()
+        stale = []
+        changed = [k for k in profile_data if k in allowed]
+        if "avatar" in profile_data:
+            # Files of the previous avatar go once the new one is processed.
+            stale = avatars.stored_names(profile)
+            profile.avatar_variants = {}
+            changed.append("avatar_variants")
+        for k in changed:
+            if k in profile_data:
+                setattr(profile, k, profile_data[k])
+
+        # Naming the fields lets the jsr signals skip work a PATCH of, say,
+        # the bio does not need (skill links, rankings).
+        profile.save(update_fields=changed if profile.pk else None)
+        if "avatar" in profile_data and (stale or profile.avatar):
+            avatars.schedule(profile, stale)
+        invalidate_profile_ref(instance.id)
         return instance
\ No newline at end of file
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from . import avatars
+
+
+@shared_task(ignore_result=True)
+def process_avatar(profile_id, stale=()):
+    return avatars.process(profile_id, stale)
@@ -1,3 +1,280 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import Client, TestCase, override_settings
+from django.urls import path
+
+from PIL import Image
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from . import avatars, profiles
+from .async_views import AsyncMeView
+from .authentication import (
+    PROFILE_ID_CLAIM,
+    ROLE_CLAIM,
+    ProfileJWTAuthentication,
+    StatelessProfileJWTAuthentication,
+    revoke,
+)
+from .models import UserProfile
+from .serializers import MeSerializer, ProfileTokenObtainPairSerializer
+from .views import MeView
+
+# Both /me views whatever settings.ASYNC_VIEWS selects in api.urls.
+urlpatterns = [
+    path("async/me/", AsyncMeView.as_view()),
+    path("sync/me/", MeView.as_view()),
+]
+
+
+def make_user(username, role="jobseeker", **fields):
+    user = User.objects.create_user(username, f"{username}@example.com", "password")
+    UserProfile.objects.create(user=user, role=role, **fields)
+    return user
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncMeViewTests(TestCase):
+    def setUp(self):
+        self.user = make_user("seeker", skills="python")
+        self.token = ProfileTokenObtainPairSerializer.get_token(self.user).access_token
+        # Clients without a session, as mobile apps: CSRF checks still run.
+        self.client = Client(enforce_csrf_checks=True, HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_get_matches_sync_view(self):
+        responses = [self.client.get(f"/{kind}/me/") for kind in ("async", "sync")]
+        for response in responses:
+            self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(responses[0].content, responses[1].content)
+        self.assertEqual(responses[0]["Content-Type"], responses[1]["Content-Type"])
+        self.assertEqual(responses[0].json(), MeSerializer(self.user).data)
+
+    def test_patch_with_token_skips_csrf(self):
+        authenticate = ProfileJWTAuthentication.authenticate
+        with mock.patch.object(
+            ProfileJWTAuthentication, "authenticate", autospec=True, side_effect=authenticate
+        ) as calls:
+            response = self.client.patch(
+                "/async/me/", {"skills": "django"}, content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(calls.call_count, 1)
+        self.user.userprofile.refresh_from_db()
+        self.assertEqual(self.user.userprofile.skills, "django")
+
+    def test_rejects_missing_and_revoked_tokens(self):
+        response = Client().get("/async/me/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+        self.assertEqual(response.content, Client().get("/sync/me/").content)
+
+        revoke(self.token)
+        self.assertEqual(self.client.get("/async/me/").status_code, 401)
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/async/me/").status_code, 401)
+
+
+class AuthTokenTests(TestCase):
+    def setUp(self):
+        self.user = make_user("seeker")
+        response = self.client.post(
+            "/api/auth/login/", {"username": "seeker", "password": "password"}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.access, self.refresh = response.json()["access"], response.json()["refresh"]
+
+    def auth(self, access=None):
+        return {"HTTP_AUTHORIZATION": f"Bearer {access or self.access}"}
+
+    def logout(self, refresh):
+        return self.client.post("/api/auth/logout/", {"refresh": refresh}, **self.auth())
+
+    def test_tokens_carry_profile_claims(self):
+        for token in (AccessToken(self.access), RefreshToken(self.refresh)):
+            self.assertEqual(token[PROFILE_ID_CLAIM], self.user.userprofile.pk)
+            self.assertEqual(token[ROLE_CLAIM], "jobseeker")
+
+    def test_logout_revokes_access_and_refresh(self):
+        self.assertEqual(self.logout(self.refresh).status_code, 204)
+        self.assertEqual(self.client.get("/api/auth/me/", **self.auth()).status_code, 401)
+        response = self.client.post("/api/auth/refresh/", {"refresh": self.refresh})
+        self.assertEqual(response.status_code, 401, response.content)
+
+    def test_refresh_before_logout(self):
+        response = self.client.post("/api/auth/refresh/", {"refresh": self.refresh})
+        self.assertEqual(response.status_code, 200, response.content)
+        access = response.json()["access"]
+        self.assertEqual(self.client.get("/api/auth/me/", **self.auth(access)).status_code, 200)
+
+    def test_logout_requires_own_refresh_token(self):
+        self.assertEqual(self.logout("").status_code, 400)
+        self.assertEqual(self.logout("garbage").status_code, 400)
+        other = RefreshToken.for_user(make_user("other"))
+        self.assertEqual(self.logout(str(other)).status_code, 400)
+        # Nothing was revoked.
+        self.assertEqual(self.client.get("/api/auth/me/", **self.auth()).status_code, 200)
+
+
+class StatelessAuthenticationTests(TestCase):
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return StatelessProfileJWTAuthentication().authenticate(request)
+
+    def test_profile_from_claims(self):
+        user = make_user("recruiter", role="recruiter")
+        token = ProfileTokenObtainPairSerializer.get_token(user).access_token
+        with self.assertNumQueries(1):  # the revocation check only
+            claims_user, _ = self.authenticate(token)
+        self.assertEqual(str(claims_user.pk), str(user.pk))
+        self.assertEqual(claims_user.userprofile.pk, user.userprofile.pk)
+        self.assertEqual(claims_user.userprofile.role, "recruiter")
+
+    def test_token_without_claims(self):
+        user = make_user("seeker")
+        claims_user, _ = self.authenticate(RefreshToken.for_user(user).access_token)
+        self.assertEqual(claims_user.userprofile.pk, user.userprofile.pk)
+        self.assertEqual(claims_user.userprofile.role, "jobseeker")
+
+    def test_revoked(self):
+        token = ProfileTokenObtainPairSerializer.get_token(make_user("seeker")).access_token
+        revoke(token)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+
+class ProfileRefCacheTests(TestCase):
+    def setUp(self):
+        # User ids are reused once each test rolls back.
+        for clear in (cache.clear, profiles._local.clear):
+            clear()
+            self.addCleanup(clear)
+        self.user = make_user("seeker")
+
+    def set_role(self, role):
+        UserProfile.objects.filter(user=self.user).update(role=role)
+
+    def test_local_then_shared_cache(self):
+        with self.assertNumQueries(1):
+            ref = profiles.get_profile_ref(self.user.pk)
+        self.assertEqual(ref, (self.user.userprofile.pk, "jobseeker"))
+        with self.assertNumQueries(0):
+            self.assertEqual(profiles.get_profile_ref(self.user.pk), ref)
+
+        # Another process: an empty local tier in front of the shared cache.
+        profiles._local.clear()
+        self.set_role("recruiter")
+        with self.assertNumQueries(0):
+            self.assertEqual(profiles.get_profile_ref(self.user.pk).role, "jobseeker")
+
+        profiles.invalidate_profile_ref(self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(profiles.get_profile_ref(self.user.pk).role, "recruiter")
+
+    def test_profile_save_invalidates(self):
+        profiles.get_profile_ref(self.user.pk)
+        self.set_role("recruiter")
+        user = User.objects.get(pk=self.user.pk)
+        serializer = MeSerializer(user, data={"bio": "Hello"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(profiles.get_profile_ref(self.user.pk).role, "recruiter")
+
+    def test_missing_profile_is_not_cached(self):
+        user = User.objects.create_user("bare")
+        with self.assertRaises(UserProfile.DoesNotExist):
+            profiles.get_profile_ref(user.pk)
+        UserProfile.objects.create(user=user, role="recruiter")
+        self.assertEqual(profiles.get_profile_ref(user.pk).role, "recruiter")
+
+
+def image_bytes(color="red", size=(64, 64)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class AvatarTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def upload(self, user, data):
+        """What MeSerializer.update and the worker do for a new avatar."""
+        profile = UserProfile.objects.get(user=user)
+        stale = avatars.stored_names(profile)
+        profile.avatar_variants = {}
+        profile.avatar.save("me.jpg", ContentFile(data))
+        return profile, stale
+
+    def processed(self, user, data):
+        profile, stale = self.upload(user, data)
+        avatars.process(profile.pk, stale)
+        profile.refresh_from_db()
+        return profile
+
+    def test_same_image_is_not_shared(self):
+        first, second = make_user("first"), make_user("second")
+        a = self.processed(first, image_bytes())
+        b = self.processed(second, image_bytes())
+        self.assertNotEqual(a.avatar.name, b.avatar.name)
+
+        self.processed(first, image_bytes("blue"))
+        for name in avatars.stored_names(b):
+            self.assertTrue(default_storage.exists(name), name)
+        for name in avatars.stored_names(a):
+            self.assertFalse(default_storage.exists(name), name)
+
+    def test_files_shared_by_older_names_are_kept(self):
+        first, second = make_user("first"), make_user("second")
+        a = self.processed(first, image_bytes())
+        UserProfile.objects.filter(user=second).update(
+            avatar=a.avatar.name, avatar_variants=a.avatar_variants
+        )
+        self.processed(first, image_bytes("blue"))
+        for name in avatars.stored_names(a):
+            self.assertTrue(default_storage.exists(name), name)
+
+    def test_raw_upload_is_not_exposed(self):
+        user = make_user("seeker")
+        profile, _ = self.upload(user, image_bytes())
+        raw = profile.avatar.name
+        self.assertTrue(avatars.is_raw_upload(raw))
+
+        data = MeSerializer(User.objects.get(pk=user.pk)).data
+        self.assertIsNone(data["avatar"])
+        self.assertIsNone(data["avatar_urls"])
+        self.assertIsNone(avatars.variant_url(profile, "thumb"))
+        for path in (raw, f"avatars/v/../{raw[len('avatars/'):]}"):
+            self.assertEqual(self.client.get(f"/media/{path}").status_code, 404)
+
+        avatars.process(profile.pk)
+        data = MeSerializer(User.objects.get(pk=user.pk)).data
+        self.assertTrue(data["avatar"].endswith(".jpg"))
+        self.assertTrue(data["avatar_urls"]["thumb"]["webp"].endswith("-thumb.webp"))
+        self.assertFalse(default_storage.exists(raw))
+        response = self.client.get(data["avatar_urls"]["thumb"]["webp"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_undecodable_upload_is_dropped(self):
+        user = make_user("seeker")
+        profile, _ = self.upload(user, image_bytes(size=(512, 512))[:400])
+        raw = profile.avatar.name
+        with self.assertLogs("api.avatars", "WARNING"):
+            avatars.process(profile.pk)
+        profile.refresh_from_db()
+        self.assertFalse(profile.avatar)
+        self.assertFalse(default_storage.exists(raw))
@@ -1,10 +1,12 @@
+from django.conf import settings
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from .views import RegisterView, MeView
+from .async_views import AsyncMeView
+from .views import RegisterView, LoginView, LogoutView, MeView, RefreshView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
-    path("login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("me/", MeView.as_view(), name="me"),
+    path("login/", LoginView.as_view(), name="token_obtain_pair"),
+    path("logout/", LogoutView.as_view(), name="logout"),
+    path("refresh/", RefreshView.as_view(), name="token_refresh"),
+    path("me/", (AsyncMeView if settings.ASYNC_VIEWS else MeView).as_view(), name="me"),
 ]
@@ -3,7 +3,15 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from .serializers import RegisterSerializer, MeSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .authentication import revoke
+from .serializers import (
+    LogoutSerializer,
+    MeSerializer,
+    ProfileTokenObtainPairSerializer,
+    ProfileTokenRefreshSerializer,
+    RegisterSerializer,
+)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -20,6 +28,30 @@ class RegisterView(generics.CreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class LoginView(TokenObtainPairView):
+    serializer_class = ProfileTokenObtainPairSerializer
+
+
+class RefreshView(TokenRefreshView):
+    serializer_class = ProfileTokenRefreshSerializer
+
+
+class LogoutView(APIView):
+    """
+    POST /api/auth/logout/ {"refresh": "<refresh token>"}
+    Revokes the access token used for this request and the caller's refresh
+    token, so neither can be used again (RefreshView refuses the latter).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        revoke(serializer.validated_data["refresh"])
+        revoke(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser, JSONParser]  # ✅ enables ImageField upload [web:585]
@@ -28,8 +60,6 @@ class MeView(APIView):
         return Response(MeSerializer(request.user).data)
 
     def patch(self, request):
-        print("CONTENT_TYPE =", request.META.get("CONTENT_TYPE"))
-        print("data keys =", list(request.data.keys()) if hasattr(request, "data") else None)
         serializer = MeSerializer(request.user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
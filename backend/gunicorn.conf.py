@@ -0,0 +1,58 @@
+"""
+Gunicorn settings for the production profile.
+
+  gunicorn -c gunicorn.conf.py Projet_Mobile.wsgi                      (HTTP API)
+  gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker \
+      Projet_Mobile.asgi:application                                   (WebSockets)
+
+Worker counts follow the CPU count; WEB_CONCURRENCY and GUNICORN_THREADS
+override them.
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+cpus = multiprocessing.cpu_count()
+if worker_class == "gthread":
+    # Requests mostly wait on Postgres: a few threads per core, each
+    # keeping its own persistent connection (CONN_MAX_AGE).
+    default_workers = cpus
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+elif "uvicorn" in worker_class.lower():
+    # One event loop per core holds any number of idle sockets.
+    default_workers = cpus
+else:
+    default_workers = 2 * cpus + 1
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+
+# Import Django once in the master and fork: faster boot and restarts,
+# shared memory for the code.
+preload_app = True
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to bound slow leaks.
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Per-worker Prometheus files, merged by /metrics (Projet_Mobile.instrumentation).
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,83 @@
+"""
+Async variants of the read-heavy jsr endpoints (see api.async_views).
+
+Querysets, pagination, ETags, row layout and JSON rendering (jsr.fast_json)
+are the sync views'; only the queries run through the async ORM. Rows are
+read with .values(), so building them does not touch the database.
+"""
+from api.async_views import AsyncAPIView
+from api.profiles import aget_user_profile
+from . import fast_json, match_sync
+from .etags import is_not_modified, make_etag, not_modified, with_etag
+from .pagination import RankedFeedPagination, SwipeFeedPagination
+from .search import filter_jobs
+from .views import (
+    JSR_AUTHENTICATION,
+    facet_filters,
+    feed_queryset,
+    job_fields,
+    match_scope,
+    ranked_feed_queryset,
+)
+
+
+class AsyncListView(AsyncAPIView):
+    authentication_classes = JSR_AUTHENTICATION
+
+    def json(self, data, status=200):
+        return fast_json.json_response(data, status=status)
+
+
+class AsyncJobFeedView(AsyncListView):
+    """GET /api/jobs/feed/, as JobFeedView."""
+    pagination_class = SwipeFeedPagination
+
+    def get_queryset(self, profile):
+        return feed_queryset(profile)
+
+    async def get(self, request):
+        fields = job_fields(request.GET)
+        filters = facet_filters(request.GET)
+        profile = await aget_user_profile(request.user)
+        paginator = self.pagination_class()
+        ordering = [field.lstrip("-") for field in paginator.ordering]
+        queryset = fast_json.job_values(
+            filter_jobs(self.get_queryset(profile), **filters), *ordering, fields=fields
+        )
+        page = await paginator.apaginate_queryset(queryset, request.GET)
+        data = fast_json.job_rows(page, fields)
+        return self.json(paginator.get_paginated_data(data))
+
+
+class AsyncRankedJobFeedView(AsyncJobFeedView):
+    """GET /api/jobs/feed/ranked/, as RankedJobFeedView."""
+    pagination_class = RankedFeedPagination
+
+    def get_queryset(self, profile):
+        return ranked_feed_queryset(profile)
+
+
+class AsyncMatchListView(AsyncListView):
+    """GET /api/matches/[?since=<cursor>], as MatchListView."""
+
+    async def get(self, request):
+        since_param = request.GET.get("since")
+        since = match_sync.parse_since(since_param)
+        scope, listed = match_scope(await aget_user_profile(request.user))
+
+        last_updated, count = await match_sync.ascope_state(scope)
+        etag = make_etag("matches", request.user.pk, since_param, last_updated, count)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        results, removed = match_sync.changes(scope, listed, since)
+        data = fast_json.match_rows(
+            [values async for values in fast_json.match_values(results)], request=request
+        )
+        if since_param is not None:
+            data = {
+                "results": data,
+                "removed": [pk async for pk in removed],
+                "cursor": match_sync.encode_cursor(last_updated),
+            }
+        return with_etag(self.json(data), etag)
@@ -0,0 +1,313 @@
+"""
+Bulk job import and CSV/NDJSON exports for recruiters.
+
+import_jobs() reads an uploaded CSV (header row of JobSerializer field names)
+or NDJSON file one row at a time. Rows are validated with JobSerializer and
+inserted with bulk_create IMPORT_CHUNK_SIZE at a time, each chunk in its own
+transaction, so memory is bounded by the chunk size whatever the file size:
+Django spools large uploads to disk (FILE_UPLOAD_MAX_MEMORY_SIZE) and rows
+are decoded lazily from there. Invalid rows are skipped and reported by
+line number, up to MAX_REPORTED_ERRORS of them.
+
+Uploads are not imported inside the request: the view stores the file as a
+JobImport (under IMPORT_PREFIX, which Projet_Mobile.media does not serve)
+and schedule() hands it to a Celery worker (jsr.tasks.import_jobs), which
+runs run_import(). Clients poll the JobImport for its status and report.
+
+bulk_create skips the Job signals (jsr.signals), so each chunk links its
+skills, updates jsr.facet_index and schedules the ranking refresh of its jobs
+(jsr.ranking.schedule) itself, and the import invalidates the cached job
+lists once.
+
+Exports stream rows from .iterator() querysets in EXPORT_BATCH_SIZE lines
+per chunk; see stream_response() for how they are served under ASGI. CSV
+cells that a spreadsheet would run as a formula get a leading quote.
+"""
+import csv
+import io
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import job_cache, ranking, skill_links
+from .facet_index import index as facet_index
+from .models import Job, JobImport, Match
+from .serializers import JobSerializer
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_PREFIX = "imports/"  # JobImport.file upload_to
+MAX_REPORTED_ERRORS = 1000
+EXPORT_BATCH_SIZE = 500
+
+CSV = "csv"
+NDJSON = "ndjson"
+FORMATS = {
+    CSV: "text/csv; charset=utf-8",
+    NDJSON: "application/x-ndjson",
+}
+EXTENSIONS = {".csv": CSV, ".ndjson": NDJSON, ".jsonl": NDJSON}
+
+JOB_EXPORT_FIELDS = [
+    "id",
+    "title",
+    "company_name",
+    "category",
+    "governorate",
+    "location",
+    "salary_range",
+    "min_experience_years",
+    "max_experience_years",
+    "skills",
+    "short_description",
+    "description",
+    "tags",
+    "image_url",
+    "created_at",
+]
+MATCH_EXPORT_FIELDS = {
+    "id": "id",
+    "job_id": "job_id",
+    "job_title": "job__title",
+    "jobseeker_id": "jobseeker_id",
+    "jobseeker_name": "jobseeker__user__username",
+    "status": "status",
+    "is_active": "is_active",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
+def upload_format(upload):
+    """CSV or NDJSON from the file name, else the part's content type."""
+    name = (upload.name or "").lower()
+    for extension, fmt in EXTENSIONS.items():
+        if name.endswith(extension):
+            return fmt
+    for fmt, content_type in FORMATS.items():
+        if (upload.content_type or "") == content_type.split(";")[0]:
+            return fmt
+    return None
+
+
+def _csv_rows(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # CSV has no null; an empty cell means "not given".
+        yield reader.line_num, {k: v for k, v in row.items() if k and v not in ("", None)}
+
+
+def _ndjson_rows(stream):
+    for line_num, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_num, None
+            continue
+        yield line_num, row if isinstance(row, dict) else None
+
+
+def read_rows(upload, fmt):
+    """Yield (line number, dict or None if the line is not an object)."""
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        rows = _csv_rows(stream) if fmt == CSV else _ndjson_rows(stream)
+        yield from rows
+    finally:
+        # Leave the upload's file to Django, which deletes temporary files.
+        stream.detach()
+
+
+def is_import_upload(name):
+    return name.startswith(IMPORT_PREFIX)
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, line, detail):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": detail})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def import_jobs(profile, rows, context=None):
+    """Validate and insert (line, row) pairs for one recruiter."""
+    report = ImportReport()
+    validator = JobSerializer(context=context or {})
+    chunk = []
+
+    def flush():
+        with transaction.atomic():
+            Job.objects.bulk_create(chunk)
+            skill_links.link_jobs(chunk)
+            for job in chunk:
+                ranking.schedule("job", job.pk)
+        for job in chunk:
+            facet_index.update(job)
+        report.created += len(chunk)
+        chunk.clear()
+
+    try:
+        for line, row in rows:
+            if row is None:
+                report.error(line, {"non_field_errors": ["Expected a JSON object."]})
+                continue
+            try:
+                data = validator.run_validation(row)
+            except serializers.ValidationError as exc:
+                report.error(line, exc.detail)
+                continue
+            chunk.append(Job(recruiter=profile, **data))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        if report.created:
+            job_cache.invalidate_jobs(profile.id)
+    return report
+
+
+def schedule(job_import):
+    """Run the import on a worker after commit."""
+    from .tasks import import_jobs as import_jobs_task
+
+    def enqueue():
+        try:
+            import_jobs_task.delay(job_import.pk)
+        except Exception:
+            logger.exception("Could not queue job import %s", job_import.pk)
+            _finish(job_import, JobImport.STATUS_FAILED, {"error": "The import could not be queued."})
+
+    transaction.on_commit(enqueue)
+
+
+def _finish(job_import, status, report):
+    if job_import.file:
+        job_import.file.delete(save=False)
+    JobImport.objects.filter(pk=job_import.pk).update(
+        status=status, report=report, file="", finished_at=timezone.now()
+    )
+
+
+def run_import(import_id):
+    """Import a stored upload; a redelivered task finds it claimed and returns."""
+    claimed = JobImport.objects.filter(
+        pk=import_id, status=JobImport.STATUS_PENDING
+    ).update(status=JobImport.STATUS_RUNNING)
+    if not claimed:
+        return None
+    job_import = JobImport.objects.select_related("recruiter").get(pk=import_id)
+    try:
+        with job_import.file.open("rb") as upload:
+            report = import_jobs(job_import.recruiter, read_rows(upload, job_import.format))
+    except Exception:
+        logger.exception("Job import %s failed", import_id)
+        _finish(job_import, JobImport.STATUS_FAILED, {"error": "The import stopped on a server error."})
+        raise
+    _finish(job_import, JobImport.STATUS_DONE, report.as_dict())
+    return report.created
+
+
+class _Echo:
+    """File-like object whose write() returns what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+# Cells starting with these are formulas to spreadsheet applications.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def render_rows(header, rows, fmt):
+    """Serialize tuples of values as CSV or NDJSON text chunks."""
+    if fmt == CSV:
+        writer = csv.writer(_Echo())
+        lines = (writer.writerow([_csv_cell(value) for value in row]) for row in rows)
+        yield writer.writerow(header)
+    else:
+        encoder = DjangoJSONEncoder(separators=(",", ":"))
+        lines = (encoder.encode(dict(zip(header, row))) + "\n" for row in rows)
+    yield from _batched(lines)
+
+
+def export_jobs(profile):
+    return (
+        Job.objects.filter(recruiter=profile)
+        .order_by("id")
+        .values_list(*JOB_EXPORT_FIELDS)
+        .iterator(chunk_size=2000)
+    )
+
+
+def export_matches(profile):
+    return (
+        Match.objects.filter(job__recruiter=profile)
+        .order_by("id")
+        .values_list(*MATCH_EXPORT_FIELDS.values())
+        .iterator(chunk_size=2000)
+    )
+
+
+async def _aiterate(iterator):
+    # Every step runs in the request's sync thread, where the .iterator()
+    # cursor and its connection live.
+    step = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    while (chunk := await step(iterator, done)) is not done:
+        yield chunk
+
+
+def stream_response(request, chunks, fmt, filename):
+    """
+    StreamingHttpResponse over text chunks. Under ASGI a sync iterator would
+    be read into a list before the first byte is sent, so it is wrapped in
+    an async iterator that pulls one chunk at a time.
+    """
+    # DRF's Request wraps the HttpRequest.
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = _aiterate(iter(chunks))
+    response = StreamingHttpResponse(chunks, content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    response["Cache-Control"] = "private, no-store"
+    return response
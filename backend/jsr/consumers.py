@@ -0,0 +1,78 @@
+import asyncio
+import time
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from api.authentication import StatelessProfileJWTAuthentication
+from .notifications import profile_group
+
+# Close codes in the 4000-4999 application range.
+CLOSE_UNAUTHORIZED = 4401
+
+
+def _raw_token(scope):
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            parts = value.decode("latin1").split()
+            if len(parts) == 2 and parts[0] == "Bearer":
+                return parts[1]
+    # Browsers cannot set headers on a WebSocket handshake.
+    return parse_qs(scope.get("query_string", b"").decode()).get("token", [None])[0]
+
+
+def _authenticate(raw):
+    auth = StatelessProfileJWTAuthentication()
+    token = auth.get_validated_token(raw)
+    user = auth.get_user(token)
+    return user.userprofile.id, token["exp"]
+
+
+class MatchEventsConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ws://<host>/ws/matches/?token=<access token>
+    (or an "Authorization: Bearer <token>" handshake header)
+
+    Server-to-client only: forwards jsr.notifications events for the
+    authenticated profile. The socket is closed with 4401 when the token is
+    invalid, revoked, or expires.
+    """
+
+    group = None
+    expiry = None
+
+    async def connect(self):
+        raw = _raw_token(self.scope)
+        try:
+            if not raw:
+                raise InvalidToken("No token.")
+            profile_id, expires_at = await database_sync_to_async(_authenticate)(raw)
+        except (AuthenticationFailed, InvalidToken, TokenError):
+            await self.close(code=CLOSE_UNAUTHORIZED)
+            return
+
+        self.group = profile_group(profile_id)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+        loop = asyncio.get_running_loop()
+        self.expiry = loop.call_later(
+            max(0, expires_at - time.time()),
+            lambda: loop.create_task(self.close(code=CLOSE_UNAUTHORIZED)),
+        )
+
+    async def disconnect(self, code):
+        if self.expiry is not None:
+            self.expiry.cancel()
+        if self.group is not None:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Nothing to receive; clients only listen.
+        pass
+
+    async def match_event(self, message):
+        await self.send_json(message["event"])
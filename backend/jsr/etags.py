@@ -0,0 +1,35 @@
+"""
+ETag / If-None-Match handling for list endpoints whose validators are cheap
+to compute (a cache version, or an aggregate over an index) without
+building the response body.
+"""
+import hashlib
+
+from django.http import HttpResponseNotModified
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as for GET in RFC 9110.
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags
+
+
+def with_etag(response, etag):
+    response["ETag"] = etag
+    # Per-user content: only the client may keep it, and it must revalidate.
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(etag):
+    return with_etag(HttpResponseNotModified(), etag)
@@ -0,0 +1,198 @@
+"""
+In-process bitmap index over the low-cardinality job attributes.
+
+Every job gets an ordinal (its position in the arrays) and sets one bit in
+packed uint8 bitmaps, one bitmap per value:
+
+    ("category", value), ("governorate", value)
+    ("years", n)          jobs open to someone with n years, n <= MAX_YEARS
+                          (null bounds are open, as in jsr.search.filter_jobs)
+    ("experience", name)  jobs open to some years in EXPERIENCE_BUCKETS[name]
+
+Filters are ANDs of bitmaps and counts are popcounts, so counts() answers
+the facet counts for any combination of filters with a few vector ops on
+size / 8 bytes instead of GROUP BY queries. Each facet is counted with the
+other facets' filters applied but not its own, so the UI can show what
+picking another value would give. Experience filters above MAX_YEARS are
+read as MAX_YEARS (JobFacetParamsSerializer), by the counts and the feeds
+alike.
+
+Like jsr.skill_index, the index is built lazily on first use and kept
+current in this process by the Job signals in jsr.signals (bulk import
+updates it directly). Other processes see changes once their copy is older
+than MAX_AGE seconds: new jobs elsewhere are missing from the counts until
+then. The counts only guide the filter UI; the filtered feeds themselves
+are read in SQL (jsr.search.filter_jobs), so they are never stale.
+"""
+import threading
+import time
+
+import numpy as np
+
+from .models import Job
+
+MAX_AGE = 300
+MAX_YEARS = 40
+# (first, last) years, last None for open-ended.
+EXPERIENCE_BUCKETS = {"0-1": (0, 1), "2-4": (2, 4), "5-9": (5, 9), "10+": (10, None)}
+FACET_VALUES = {
+    "category": [value for value, _ in Job.CATEGORY_CHOICES],
+    "governorate": [value for value, _ in Job.GOVERNORATE_CHOICES],
+    "experience": list(EXPERIENCE_BUCKETS),
+}
+
+ALIVE = ("alive",)
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def job_keys(category, governorate, min_years, max_years):
+    """The bitmaps a job with these values belongs to."""
+    keys = [ALIVE, ("category", category), ("governorate", governorate)]
+    low = 0 if min_years is None else min_years
+    if max_years is not None and max_years < low:
+        return keys
+    # ("years", MAX_YEARS) holds the jobs filter_jobs() returns for
+    # MAX_YEARS, so only the upper bound is capped.
+    high = MAX_YEARS if max_years is None else min(max_years, MAX_YEARS)
+    keys += [("years", n) for n in range(low, high + 1)]
+    keys += [
+        ("experience", name)
+        for name, (first, last) in EXPERIENCE_BUCKETS.items()
+        if (max_years is None or first <= max_years) and (last is None or last >= low)
+    ]
+    return keys
+
+
+def _popcount(bitmap):
+    return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+
+class FacetIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.built_at = None
+        self._reset(0)
+
+    def _reset(self, capacity):
+        self.size = 0
+        self.capacity = capacity
+        self.ordinals = {}
+        self.job_keys = {}
+        self.bitmaps = {}
+
+    def build(self):
+        rows = list(
+            Job.objects.order_by("id").values_list(
+                "id",
+                "category",
+                "governorate",
+                "min_experience_years",
+                "max_experience_years",
+            )
+        )
+        capacity = max(64, -(-len(rows) // 8) * 8)
+        members = {}
+        with self.lock:
+            self._reset(capacity)
+            for ordinal, (pk, *values) in enumerate(rows):
+                self.ordinals[pk] = ordinal
+                keys = self.job_keys[pk] = job_keys(*values)
+                for key in keys:
+                    members.setdefault(key, []).append(ordinal)
+            self.size = len(rows)
+            for key, ordinals in members.items():
+                bits = np.zeros(capacity, dtype=bool)
+                bits[ordinals] = True
+                self.bitmaps[key] = np.packbits(bits)
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self.built_at is None or time.monotonic() - self.built_at > MAX_AGE:
+            self.build()
+
+    def _grow(self):
+        capacity = self.capacity = self.capacity * 2
+        for key, bitmap in self.bitmaps.items():
+            self.bitmaps[key] = np.concatenate(
+                [bitmap, np.zeros(capacity // 8 - len(bitmap), dtype=np.uint8)]
+            )
+
+    def _set(self, key, ordinal):
+        bitmap = self.bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self.bitmaps[key] = np.zeros(self.capacity // 8, dtype=np.uint8)
+        bitmap[ordinal >> 3] |= 0x80 >> (ordinal & 7)
+
+    def _clear(self, key, ordinal):
+        self.bitmaps[key][ordinal >> 3] &= 0xFF ^ (0x80 >> (ordinal & 7))
+
+    def update(self, job):
+        """Re-index one saved job."""
+        with self.lock:
+            if self.built_at is None:
+                return
+            ordinal = self.ordinals.get(job.pk)
+            if ordinal is None:
+                if self.size == self.capacity:
+                    self._grow()
+                ordinal = self.ordinals[job.pk] = self.size
+                self.size += 1
+            for key in self.job_keys.pop(job.pk, ()):
+                self._clear(key, ordinal)
+            keys = self.job_keys[job.pk] = job_keys(
+                job.category, job.governorate, job.min_experience_years, job.max_experience_years
+            )
+            for key in keys:
+                self._set(key, ordinal)
+
+    def remove(self, pk):
+        """The ordinal stays unused until the next build."""
+        with self.lock:
+            ordinal = self.ordinals.get(pk)
+            for key in self.job_keys.pop(pk, ()):
+                self._clear(key, ordinal)
+
+    def _filter_keys(self, category=None, governorate=None, experience=None):
+        keys = {}
+        if category is not None:
+            keys["category"] = ("category", category)
+        if governorate is not None:
+            keys["governorate"] = ("governorate", governorate)
+        if experience is not None:
+            keys["experience"] = ("years", min(experience, MAX_YEARS))
+        return keys
+
+    def _mask(self, keys):
+        length = -(-self.size // 8)
+        mask = self.bitmaps.get(ALIVE, _EMPTY.astype(np.uint8))[:length].copy()
+        for key in keys:
+            bitmap = self.bitmaps.get(key)
+            if bitmap is None:
+                return np.zeros(length, dtype=np.uint8)
+            np.bitwise_and(mask, bitmap[:length], out=mask)
+        return mask
+
+    def counts(self, **filters):
+        """
+        {"count": jobs passing every filter,
+         "facets": {facet: {value: count}}} for category, governorate and
+        the experience buckets.
+        """
+        self.ensure_built()
+        with self.lock:
+            keys = self._filter_keys(**filters)
+            facets = {}
+            for facet, values in FACET_VALUES.items():
+                base = self._mask(key for name, key in keys.items() if name != facet)
+                length = len(base)
+                facets[facet] = {
+                    value: _popcount(base & self.bitmaps[(facet, value)][:length])
+                    if (facet, value) in self.bitmaps
+                    else 0
+                    for value in values
+                }
+            return {"count": _popcount(self._mask(keys.values())), "facets": facets}
+
+
+index = FacetIndex()
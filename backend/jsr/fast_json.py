@@ -0,0 +1,211 @@
+"""
+Fast path for the read-only job and match lists.
+
+The lists are the hottest responses in the API and build nothing but plain
+fields, so they skip ModelSerializer: job_values()/match_values() read the
+columns with .values(), job_rows()/match_rows() lay each row out exactly as
+JobSerializer / MatchSerializer would (same keys in the same order,
+datetimes formatted as DRF's DateTimeField), and FastJSONRenderer writes
+them with orjson.
+
+The bytes are the same as the serializer + JSONRenderer path
+(jsr.tests.FastJSONTests compares them). The renderer gives the data back to
+JSONRenderer for anything orjson would write differently: indented output
+(browsable API, "; indent=" in Accept), non-default COMPACT/UNICODE/STRICT
+JSON settings, and values orjson rejects; types orjson does not know
+(datetimes, Decimals, lazy strings) go through DRF's encoder. Without orjson
+installed, everything is JSONRenderer.
+
+manage.py bench_render measures both paths per 1k rows.
+"""
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from Projet_Mobile.instrumentation import timed_serialization
+from api import avatars
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Output key -> .values() path, in JobSerializer.Meta.fields order.
+JOB_VALUES = {
+    "id": "id",
+    "title": "title",
+    "company_name": "company_name",
+    "category": "category",
+    "governorate": "governorate",
+    "location": "location",
+    "salary_range": "salary_range",
+    "min_experience_years": "min_experience_years",
+    "max_experience_years": "max_experience_years",
+    "skills": "skills",
+    "short_description": "short_description",
+    "description": "description",
+    "tags": "tags",
+    "image_url": "image_url",
+    "created_at": "created_at",
+    "recruiter_id": "recruiter_id",
+    "recruiter_name": "recruiter__company_name",
+}
+
+# view=card (JobFieldsParamsSerializer): what a swipe card shows, without the
+# description (unbounded), tags and the recruiter join. The full job is one
+# GET /api/jobs/<id>/ away.
+JOB_VIEWS = {
+    "card": (
+        "id",
+        "title",
+        "company_name",
+        "category",
+        "governorate",
+        "location",
+        "salary_range",
+        "min_experience_years",
+        "max_experience_years",
+        "skills",
+        "short_description",
+        "image_url",
+        "created_at",
+    ),
+    "detail": tuple(JOB_VALUES),
+}
+
+MATCH_VALUES = (
+    "id",
+    "job_id",
+    "job__title",
+    "job__company_name",
+    "jobseeker__user__username",
+    "jobseeker__avatar",
+    "jobseeker__avatar_variants",
+    "created_at",
+    "updated_at",
+    "status",
+)
+
+
+def datetime_formatter():
+    """
+    DateTimeField().to_representation, with the current timezone looked up
+    once instead of per value; get one per list.
+    """
+    field = serializers.DateTimeField()
+    tz = field.default_timezone()
+    if tz is None or api_settings.DATETIME_FORMAT.lower() != ISO_8601:
+        return field.to_representation
+
+    def format_datetime(value):
+        if not value or timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return format_datetime
+
+
+def job_values(queryset, *extra, fields=None):
+    """
+    The queryset as .values() rows for job_rows(). `fields` limits the
+    output keys, and so the columns and joins in the SELECT; `extra` adds
+    columns the caller needs besides the output (e.g. a paginator's ordering).
+    """
+    paths = [JOB_VALUES[key] for key in fields or JOB_VALUES]
+    return queryset.values(*dict.fromkeys([*paths, *extra]))
+
+
+def job_rows(rows, fields=None):
+    """JobSerializer(many=True).data from job_values() rows, limited to `fields`."""
+    format_datetime = datetime_formatter()
+    items = [(key, JOB_VALUES[key]) for key in fields or JOB_VALUES]
+    dated = any(key == "created_at" for key, _ in items)
+    jobs = []
+    with timed_serialization():
+        for values in rows:
+            job = {key: values[path] for key, path in items}
+            if dated:
+                job["created_at"] = format_datetime(job["created_at"])
+            jobs.append(job)
+    return jobs
+
+
+def match_values(queryset):
+    return queryset.values(*MATCH_VALUES)
+
+
+def match_rows(rows, request=None):
+    """
+    MatchSerializer(many=True).data from match_values() rows; pass the
+    request the serializer's context had.
+    """
+    format_datetime = datetime_formatter()
+    with timed_serialization():
+        return [
+            {
+                "id": values["id"],
+                "job": values["job_id"],
+                "job_title": values["job__title"],
+                "company_name": values["job__company_name"],
+                "jobseeker_name": values["jobseeker__user__username"],
+                "jobseeker_avatar": avatars.stored_variant_url(
+                    values["jobseeker__avatar"],
+                    values["jobseeker__avatar_variants"],
+                    "thumb",
+                    request=request,
+                ),
+                "created_at": format_datetime(values["created_at"]),
+                "updated_at": format_datetime(values["updated_at"]),
+                "status": values["status"],
+            }
+            for values in rows
+        ]
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is not None
+            and data is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        ):
+            try:
+                return _escape_separators(
+                    orjson.dumps(
+                        data,
+                        default=self.encoder_class().default,
+                        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+                    )
+                )
+            except TypeError:
+                pass
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def _escape_separators(content):
+    # As JSONRenderer: U+2028/U+2029 are escaped so the output is valid JS.
+    if b"\xe2\x80" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+# The default renderers with JSONRenderer swapped for FastJSONRenderer.
+RENDERER_CLASSES = [
+    FastJSONRenderer if renderer is JSONRenderer else renderer
+    for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+]
+
+_renderer = FastJSONRenderer()
+
+
+def json_response(data, status=200):
+    """For views outside DRF's response cycle (jsr.async_views)."""
+    return HttpResponse(
+        _renderer.render(data), status=status, content_type=_renderer.media_type
+    )
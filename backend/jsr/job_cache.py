@@ -0,0 +1,80 @@
+"""
+Shared cache for serialized job lists.
+
+Lists are keyset-paginated (jsr.pagination.JobListPagination) and each page
+is stored in the Django cache under a versioned key:
+
+    jobs:page:<scope>:<version>:<digest of filters, cursor and limit>
+
+where scope is "all" (every job, shared by all jobseekers) or
+"recruiter:<id>". Changing a job bumps the version of "all" and of its
+recruiter (invalidate_jobs, called from jsr.signals), so stale pages are
+never read again and simply expire. Versions start from the clock, so an
+evicted version never goes back to a number that older pages were stored
+under.
+
+A jobseeker's page is the shared "all" page minus that jobseeker's dislikes,
+so it can hold fewer than `limit` jobs; next_cursor still follows the shared
+page. The dislikes never enter the cache key.
+
+ETags (jsr.etags) are derived from the version, the page key and the dislike
+set, so a client that sends If-None-Match gets a 304 without the page being
+loaded or rendered.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+JOB_PAGE_TTL = 60 * 10
+ALL_JOBS = "all"
+
+
+def recruiter_scope(recruiter_id):
+    return f"recruiter:{recruiter_id}"
+
+
+def _version_key(scope):
+    return f"jobs:v:{scope}"
+
+
+def get_version(scope):
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*scopes):
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.set(_version_key(scope), time.time_ns(), None)
+
+
+def invalidate_jobs(recruiter_id):
+    scopes = (ALL_JOBS, recruiter_scope(recruiter_id))
+    bump_version(*scopes)
+    # Again after commit: a concurrent request may have rebuilt the page from
+    # the rows as they were before this transaction.
+    transaction.on_commit(lambda: bump_version(*scopes))
+
+
+def page_params(filters, cursor, limit, fields=()):
+    """What tells the pages of one scope apart, for get_page() and ETags."""
+    return repr((sorted(filters.items()), cursor or "", limit, tuple(fields)))
+
+
+def get_page(scope, version, build, params=""):
+    """Return the cached page for this version, calling build() on a miss."""
+    digest = hashlib.blake2b(params.encode("utf-8"), digest_size=12).hexdigest()
+    key = f"jobs:page:{scope}:{version}:{digest}"
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, JOB_PAGE_TTL)
+    return data
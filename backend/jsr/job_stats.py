@@ -0,0 +1,127 @@
+"""
+Per-job counters for the recruiter dashboard.
+
+JobStats holds, per job: likes and dislikes (JobLike rows by action),
+matches (active Match rows, i.e. the recruiter's list) and accepted
+(active and accepted). They are never aggregated on read: every code path
+that changes a JobLike or Match works out the before/after state of the
+rows it touches, turns that into deltas (swipe_delta, match_delta) and
+applies them with F() expressions in the same transaction (apply). A job
+without a JobStats row has no activity yet.
+
+Concurrent writers to the same (jobseeker, job) pair can still make the
+counters drift; reconcile() recomputes them from the rows
+(manage.py reconcile_job_stats), and bulk loaders call it directly.
+"""
+from collections import Counter
+
+from django.db.models import Case, Count, F, Q, Value, When
+
+from .models import JobLike, JobStats, Match
+
+FIELDS = ("likes", "dislikes", "matches", "accepted")
+ZERO = dict.fromkeys(FIELDS, 0)
+
+_ACTION_FIELDS = {"like": "likes", "dislike": "dislikes"}
+
+
+def swipe_delta(old_action, new_action):
+    delta = Counter()
+    if old_action != new_action:
+        if old_action in _ACTION_FIELDS:
+            delta[_ACTION_FIELDS[old_action]] -= 1
+        if new_action in _ACTION_FIELDS:
+            delta[_ACTION_FIELDS[new_action]] += 1
+    return delta
+
+
+def _match_counts(state):
+    """state: (is_active, status), or None when there is no match."""
+    if state is None or not state[0]:
+        return Counter()
+    return Counter(matches=1, accepted=int(state[1] == "accepted"))
+
+
+def match_delta(old_state, new_state):
+    delta = _match_counts(new_state)
+    delta.subtract(_match_counts(old_state))
+    return delta
+
+
+def apply(deltas):
+    """Add {job_id: Counter} to the counters, creating missing rows."""
+    deltas = {job_id: delta for job_id, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+    JobStats.objects.bulk_create(
+        [JobStats(job_id=job_id) for job_id in deltas], ignore_conflicts=True
+    )
+    changes = {}
+    for field in FIELDS:
+        cases = [
+            When(job_id=job_id, then=Value(delta[field]))
+            for job_id, delta in deltas.items()
+            if delta[field]
+        ]
+        if cases:
+            changes[field] = F(field) + Case(*cases, default=Value(0))
+    JobStats.objects.filter(job_id__in=deltas).update(**changes)
+
+
+def counters(job_ids):
+    """{job_id: {"likes", "dislikes", "matches", "accepted"}} for every id."""
+    job_ids = list(job_ids)
+    found = {
+        row[0]: dict(zip(FIELDS, row[1:]))
+        for row in JobStats.objects.filter(job_id__in=job_ids).values_list("job_id", *FIELDS)
+    }
+    return {job_id: found.get(job_id, ZERO) for job_id in job_ids}
+
+
+def recruiter_counters(recruiter_id):
+    """Counters of every job of one recruiter that has any activity."""
+    rows = JobStats.objects.filter(job__recruiter_id=recruiter_id).values_list("job_id", *FIELDS)
+    return {row[0]: dict(zip(FIELDS, row[1:])) for row in rows}
+
+
+def _recount(job_ids):
+    counts = {job_id: dict(ZERO) for job_id in job_ids}
+    likes = (
+        JobLike.objects.filter(job_id__in=job_ids)
+        .values("job_id")
+        .annotate(
+            likes=Count("id", filter=Q(action="like")),
+            dislikes=Count("id", filter=Q(action="dislike")),
+        )
+    )
+    matches = (
+        Match.objects.filter(job_id__in=job_ids, is_active=True)
+        .values("job_id")
+        .annotate(matches=Count("id"), accepted=Count("id", filter=Q(status="accepted")))
+    )
+    for row in list(likes) + list(matches):
+        counts[row.pop("job_id")].update(row)
+    return counts
+
+
+def reconcile(job_ids, batch_size=2000):
+    """
+    Recompute the counters of job_ids from JobLike and Match in bulk and
+    write the ones that drifted. Returns the number of rows corrected.
+    """
+    job_ids = list(job_ids)
+    corrected = 0
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start : start + batch_size]
+        expected = _recount(batch)
+        current = counters(batch)
+        stale = [
+            JobStats(job_id=job_id, **counts)
+            for job_id, counts in expected.items()
+            if counts != current[job_id]
+        ]
+        JobStats.objects.bulk_create(
+            stale, update_conflicts=True, unique_fields=["job"], update_fields=list(FIELDS)
+        )
+        corrected += len(stale)
+    return corrected
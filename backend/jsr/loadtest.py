@@ -0,0 +1,425 @@
+"""
+Synthetic data and in-process load generation for the api/jsr endpoints.
+
+seed() bulk-inserts users, profiles, jobs, likes and matches at a given
+scale. run() replays a weighted traffic mix through the full Django stack
+(middleware, JWT authentication, views, serializers) with the test client
+and returns per-endpoint latency percentiles and query counts as a dict
+ready for JSON. run_http() drives a real server over keep-alive HTTP/1.1
+connections with asyncio, to compare servers and worker models under
+concurrency. Used by the seed_data, benchmark and bench_http commands.
+"""
+import asyncio
+import random
+import statistics
+import time
+from urllib.parse import urlsplit
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, reset_queries, transaction
+from rest_framework.test import APIClient
+
+from api.models import UserProfile
+from api.serializers import ProfileTokenObtainPairSerializer
+from . import job_cache, job_stats, skill_links
+from .models import Job, JobLike, Match
+
+User = get_user_model()
+
+SKILLS = [
+    "python", "django", "react", "react native", "typescript", "javascript",
+    "java", "kotlin", "swift", "go", "rust", "sql", "postgresql", "docker",
+    "kubernetes", "aws", "pandas", "numpy", "machine learning", "pytorch",
+    "figma", "product discovery", "agile", "scrum", "git", "linux",
+]
+
+SEED_PASSWORD = "benchmark-password"
+
+
+def _skills(rng, low=2, high=6):
+    return ", ".join(rng.sample(SKILLS, rng.randint(low, high)))
+
+
+def seed(
+    jobseekers=1000,
+    recruiters=50,
+    jobs=5000,
+    likes_per_jobseeker=20,
+    seed=0,
+    batch_size=1000,
+):
+    """
+    Insert a synthetic dataset. Usernames are prefixed with "bench-<seed>-",
+    so a different seed adds another batch to the same database.
+    Returns the row counts created.
+    """
+    rng = random.Random(seed)
+    password = make_password(SEED_PASSWORD)
+    prefix = f"bench-{seed}-"
+
+    User.objects.bulk_create(
+        [
+            User(username=f"{prefix}recruiter-{i}", password=password)
+            for i in range(recruiters)
+        ]
+        + [
+            User(username=f"{prefix}seeker-{i}", password=password)
+            for i in range(jobseekers)
+        ],
+        batch_size=batch_size,
+    )
+    users = dict(User.objects.filter(username__startswith=prefix).values_list("username", "id"))
+
+    UserProfile.objects.bulk_create(
+        [
+            UserProfile(
+                user_id=users[f"{prefix}recruiter-{i}"],
+                role="recruiter",
+                company_name=f"Company {i}",
+                position_title="Talent lead",
+            )
+            for i in range(recruiters)
+        ]
+        + [
+            UserProfile(
+                user_id=users[f"{prefix}seeker-{i}"],
+                role="jobseeker",
+                skills=_skills(rng),
+                experience_years=rng.randint(0, 12),
+                bio="Synthetic jobseeker",
+            )
+            for i in range(jobseekers)
+        ],
+        batch_size=batch_size,
+    )
+    profiles = UserProfile.objects.filter(user__username__startswith=prefix)
+    recruiter_ids = list(profiles.filter(role="recruiter").values_list("id", flat=True))
+    jobseeker_ids = list(profiles.filter(role="jobseeker").values_list("id", flat=True))
+
+    categories = [c for c, _ in Job.CATEGORY_CHOICES]
+    governorates = [g for g, _ in Job.GOVERNORATE_CHOICES] + [""]
+    new_jobs = []
+    for i in range(jobs):
+        low = rng.randint(0, 6)
+        new_jobs.append(
+            Job(
+                recruiter_id=rng.choice(recruiter_ids),
+                title=f"{rng.choice(SKILLS).title()} engineer #{i}",
+                company_name=f"Company {i % max(recruiters, 1)}",
+                category=rng.choice(categories),
+                governorate=rng.choice(governorates),
+                min_experience_years=low,
+                max_experience_years=low + rng.randint(1, 6),
+                skills=_skills(rng, 1, 5),
+                short_description="Synthetic job used for benchmarks.",
+                description="Synthetic job description. " * rng.randint(5, 40),
+                tags=", ".join(rng.sample(["remote", "hybrid", "onsite", "senior"], 2)),
+            )
+        )
+    Job.objects.bulk_create(new_jobs, batch_size=batch_size)
+    skill_links.link_jobs(new_jobs)
+    for recruiter_id in recruiter_ids:
+        job_cache.invalidate_jobs(recruiter_id)
+    job_ids = list(
+        Job.objects.filter(recruiter_id__in=recruiter_ids).values_list("id", flat=True)
+    )
+
+    likes, matches = [], []
+    for jobseeker_id in jobseeker_ids:
+        for job_id in rng.sample(job_ids, min(likes_per_jobseeker, len(job_ids))):
+            action = "like" if rng.random() < 0.4 else "dislike"
+            likes.append(JobLike(job_id=job_id, jobseeker_id=jobseeker_id, action=action))
+            if action == "like":
+                matches.append(
+                    Match(
+                        job_id=job_id,
+                        jobseeker_id=jobseeker_id,
+                        status=rng.choice(["pending", "pending", "accepted", "rejected"]),
+                    )
+                )
+                if matches[-1].status == "rejected":
+                    matches[-1].is_active = False
+    JobLike.objects.bulk_create(likes, batch_size=batch_size)
+    Match.objects.bulk_create(matches, batch_size=batch_size)
+    job_stats.reconcile(job_ids, batch_size=batch_size)
+
+    return {
+        "users": len(users),
+        "jobs": len(new_jobs),
+        "likes": len(likes),
+        "matches": len(matches),
+    }
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class TrafficMix:
+    """
+    Builds requests for each endpoint of the mix against the seeded data.
+    Each method does its lookups up front and returns a zero-argument
+    callable that issues the request, so only the request is measured.
+    """
+
+    weights = {
+        "swipe": 40,
+        "feed": 15,
+        "swipe_feed": 10,
+        "matches": 15,
+        "match_status": 5,
+        "profile": 15,
+    }
+
+    def __init__(self, rng, sample_users=50):
+        self.rng = rng
+        seekers = list(
+            UserProfile.objects.filter(role="jobseeker").select_related("user")[:sample_users]
+        )
+        recruiters = list(
+            UserProfile.objects.filter(role="recruiter").select_related("user")[:sample_users]
+        )
+        if not seekers or not recruiters:
+            raise ValueError("No data to replay; run the seed_data command first.")
+
+        self.seekers = [self.client_for(p.user) for p in seekers]
+        self.recruiters = [(self.client_for(p.user), p) for p in recruiters]
+        self.job_ids = list(Job.objects.values_list("id", flat=True)[:10000])
+
+    def client_for(self, user):
+        client = APIClient(SERVER_NAME="localhost")
+        token = ProfileTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def pick(self):
+        names = list(self.weights)
+        return self.rng.choices(names, weights=[self.weights[n] for n in names])[0]
+
+    def swipe(self):
+        client = self.rng.choice(self.seekers)
+        action = self.rng.choice(["like", "dislike"])
+        job_id = self.rng.choice(self.job_ids)
+        return lambda: client.post(
+            f"/api/jobs/{job_id}/like/", {"action": action}, format="json"
+        )
+
+    def feed(self):
+        client = self.rng.choice(self.seekers)
+        return lambda: client.get("/api/jobs/")
+
+    def swipe_feed(self):
+        client = self.rng.choice(self.seekers)
+        return lambda: client.get("/api/jobs/feed/")
+
+    def matches(self):
+        if self.rng.random() < 0.5:
+            client = self.rng.choice(self.seekers)
+        else:
+            client = self.rng.choice(self.recruiters)[0]
+        return lambda: client.get("/api/matches/")
+
+    def match_status(self):
+        client, profile = self.rng.choice(self.recruiters)
+        match_id = (
+            Match.objects.filter(job__recruiter=profile, is_active=True)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if match_id is None:
+            return lambda: client.get("/api/matches/")
+        status = self.rng.choice(["accepted", "pending"])
+        return lambda: client.patch(
+            f"/api/matches/{match_id}/", {"status": status}, format="json"
+        )
+
+    def profile(self):
+        client = self.rng.choice(self.seekers)
+        return lambda: client.get("/api/auth/me/")
+
+
+def run(requests=2000, warmup=100, seed=0, sample_users=50, keep=False):
+    """
+    Replay `requests` calls of the traffic mix. Writes are rolled back
+    unless keep=True, so runs on the same data stay comparable.
+    """
+    rng = random.Random(seed)
+    samples = {name: [] for name in TrafficMix.weights}
+    queries = {name: [] for name in TrafficMix.weights}
+    errors = {name: 0 for name in TrafficMix.weights}
+
+    with transaction.atomic():
+        mix = TrafficMix(rng, sample_users=sample_users)
+
+        for _ in range(warmup):
+            getattr(mix, mix.pick())()()
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            name = mix.pick()
+            send = getattr(mix, name)()
+            with count_queries() as counter:
+                begin = time.perf_counter()
+                response = send()
+                elapsed = time.perf_counter() - begin
+            samples[name].append(elapsed * 1000)
+            queries[name].append(counter.count)
+            if response.status_code >= 400:
+                errors[name] += 1
+            reset_queries()
+        wall = time.perf_counter() - started
+
+        if not keep:
+            transaction.set_rollback(True)
+
+    endpoints = {}
+    for name, latencies in samples.items():
+        if not latencies:
+            continue
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": errors[name],
+            "throughput_rps": round(len(latencies) / (sum(latencies) / 1000), 1),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "queries_mean": round(statistics.fmean(queries[name]), 2),
+            "queries_max": max(queries[name]),
+        }
+
+    return {
+        "backend": connection.vendor,
+        "requests": requests,
+        "seed": seed,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(requests / wall, 1),
+        "endpoints": endpoints,
+    }
+
+
+def access_tokens(role="jobseeker", count=50):
+    profiles = UserProfile.objects.filter(role=role).select_related("user")[:count]
+    return [
+        str(ProfileTokenObtainPairSerializer.get_token(p.user).access_token) for p in profiles
+    ]
+
+
+async def _read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get("connection", "").lower() != "close"
+
+
+async def _http_worker(url, paths, tokens, deadline, rng, samples, errors):
+    host, port = url.hostname, url.port or 80
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\n"
+            f"Authorization: Bearer {rng.choice(tokens)}\r\n\r\n"
+        ).encode()
+        begin = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors[path] += 1
+            writer = None
+            continue
+        samples[path].append((time.perf_counter() - begin) * 1000)
+        if status >= 400:
+            errors[path] += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _run_http(base_url, paths, tokens, concurrency, duration, seed):
+    url = urlsplit(base_url)
+    samples = {path: [] for path in paths}
+    errors = {path: 0 for path in paths}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _http_worker(url, paths, tokens, deadline, random.Random(seed + i), samples, errors)
+            for i in range(concurrency)
+        )
+    )
+    return samples, errors, time.perf_counter() - started
+
+
+def run_http(base_url, paths, tokens, concurrency=50, duration=10.0, seed=0):
+    """
+    Keep `concurrency` connections busy with GETs of random `paths` for
+    `duration` seconds. The server must use the same database as the tokens.
+    """
+    samples, errors, wall = asyncio.run(
+        _run_http(base_url, paths, tokens, concurrency, duration, seed)
+    )
+    endpoints = {}
+    for path, latencies in samples.items():
+        if not latencies:
+            endpoints[path] = {"requests": 0, "errors": errors[path]}
+            continue
+        endpoints[path] = {
+            "requests": len(latencies),
+            "errors": errors[path],
+            "throughput_rps": round(len(latencies) / wall, 1),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+        }
+    total = sum(len(latencies) for latencies in samples.values())
+    return {
+        "url": base_url,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "requests": total,
+        "throughput_rps": round(total / wall, 1),
+        "endpoints": endpoints,
+    }
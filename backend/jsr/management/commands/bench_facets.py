@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+
+from jsr.facet_index import index as facet_index
+from jsr.models import Job
+from jsr.search import filter_jobs
+
+FILTERS = [
+    {},
+    {"category": "data_scientist"},
+    {"category": "data_scientist", "governorate": "tunis"},
+    {"category": "software_engineer", "governorate": "tunis", "experience": 3},
+]
+
+
+def group_by_counts(filters):
+    """What a screen load costs without the index: one GROUP BY per facet."""
+    counts = {"count": filter_jobs(Job.objects.all(), **filters).count()}
+    for facet in ("category", "governorate"):
+        others = {name: value for name, value in filters.items() if name != facet}
+        rows = filter_jobs(Job.objects.all(), **others).values(facet).annotate(n=Count("id"))
+        counts[facet] = {row[facet]: row["n"] for row in rows}
+    return counts
+
+
+class Command(BaseCommand):
+    help = "Compare jsr.facet_index counts against GROUP BY queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def timed(self, run, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - start) * 1_000_000)
+        return statistics.median(samples)
+
+    def handle(self, *args, repeat, **options):
+        start = time.perf_counter()
+        facet_index.build()
+        self.stdout.write(
+            f"backend={connection.vendor} jobs={facet_index.size} "
+            f"build {(time.perf_counter() - start) * 1000:.1f} ms "
+            f"bitmaps {len(facet_index.bitmaps)} x {facet_index.capacity // 8} bytes"
+        )
+        for filters in FILTERS:
+            index_us = self.timed(lambda: facet_index.counts(**filters), repeat)
+            # Category and governorate only: the experience buckets would
+            # cost the queries four more counts.
+            sql_us = self.timed(lambda: group_by_counts(filters), max(1, repeat // 10))
+            self.stdout.write(
+                f"{str(filters):>75}  index {index_us:8.1f} us  group by {sql_us:9.1f} us"
+                f"  ({sql_us / index_us:.0f}x)"
+            )
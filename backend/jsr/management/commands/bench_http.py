@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jsr import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server with concurrent keep-alive GETs and print "
+        "throughput and latency percentiles as JSON. Compare worker models by "
+        "pointing it at the same database served different ways, e.g. "
+        "ASYNC_VIEWS=0 gunicorn Projet_Mobile.wsgi -w 1 --threads 8, versus "
+        "ASYNC_VIEWS=1 uvicorn Projet_Mobile.asgi:application --workers 1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=["/api/jobs/feed/", "/api/matches/", "/api/auth/me/"],
+        )
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds.")
+        parser.add_argument("--users", type=int, default=50, help="Distinct jobseekers.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        tokens = loadtest.access_tokens("jobseeker", options["users"])
+        if not tokens:
+            self.stderr.write("No jobseekers; run the seed_data command first.")
+            return
+
+        report = loadtest.run_http(
+            options["url"],
+            options["paths"],
+            tokens,
+            concurrency=options["concurrency"],
+            duration=options["duration"],
+            seed=options["seed"],
+        )
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(text + "\n")
+        self.stdout.write(text)
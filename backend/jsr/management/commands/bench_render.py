@@ -0,0 +1,71 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from jsr import fast_json
+from jsr.fast_json import FastJSONRenderer
+from jsr.models import Job, Match
+from jsr.serializers import JobSerializer, MatchSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ModelSerializer + JSONRenderer against jsr.fast_json for the job "
+        "and match lists, in ms per 1k rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def timed(self, run, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), body
+
+    def compare(self, name, queryset, serialize, build, repeat):
+        rows = queryset.count()
+        if not rows:
+            raise CommandError(f"No {name} rows; run seed_data first.")
+        per_1k = 1000 / rows
+
+        timings = {
+            "serializer": lambda: JSONRenderer().render(serialize(queryset.all())),
+            "fast": lambda: FastJSONRenderer().render(build(queryset.all())),
+            # Cached job pages only pay for rendering.
+            "render only (serializer)": lambda: JSONRenderer().render(data),
+            "render only (fast)": lambda: FastJSONRenderer().render(data),
+        }
+        data = build(queryset.all())
+        results = {label: self.timed(run, repeat) for label, run in timings.items()}
+        if results["serializer"][1] != results["fast"][1]:
+            raise CommandError(f"{name}: fast output differs from the serializer output.")
+
+        self.stdout.write(f"{name} ({rows} rows, {len(results['fast'][1])} bytes)")
+        for label, (median, _) in results.items():
+            self.stdout.write(f"{label:>26}  {median * per_1k:8.2f} ms / 1k rows")
+        speedup = results["serializer"][0] / results["fast"][0]
+        self.stdout.write(f"{'speedup':>26}  {speedup:8.1f}x")
+
+    def handle(self, *args, rows, repeat, **options):
+        request = APIRequestFactory().get("/api/matches/")
+        self.compare(
+            "jobs",
+            Job.objects.select_related("recruiter").order_by("-created_at")[:rows],
+            lambda queryset: JobSerializer(queryset, many=True).data,
+            lambda queryset: fast_json.job_rows(fast_json.job_values(queryset)),
+            repeat,
+        )
+        self.compare(
+            "matches",
+            Match.objects.select_related("job", "jobseeker__user").order_by("-created_at")[:rows],
+            lambda queryset: MatchSerializer(queryset, many=True, context={"request": request}).data,
+            lambda queryset: fast_json.match_rows(fast_json.match_values(queryset), request),
+            repeat,
+        )
@@ -0,0 +1,37 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from jsr.models import Job
+from jsr.search import naive_search, search_jobs
+
+
+class Command(BaseCommand):
+    help = "Compare indexed job search against naive icontains queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("queries", nargs="*", default=["python", "data scien", "django react"])
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--limit", type=int, default=20)
+
+    def timed(self, build, text, repeat, limit):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = list(build(Job.objects.all(), text)[:limit].values_list("id", flat=True))
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), max(samples), len(rows)
+
+    def handle(self, *args, queries, repeat, limit, **options):
+        self.stdout.write(
+            f"backend={connection.vendor} jobs={Job.objects.count()} repeat={repeat}"
+        )
+        for text in queries:
+            for name, build in (("search", search_jobs), ("icontains", naive_search)):
+                median, worst, hits = self.timed(build, text, repeat, limit)
+                self.stdout.write(
+                    f"{text!r:>20} {name:>10}  median {median:8.2f} ms"
+                    f"  max {worst:8.2f} ms  rows {hits}"
+                )
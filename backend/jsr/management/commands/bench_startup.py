@@ -0,0 +1,91 @@
+import json
+import os
+import shlex
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jsr import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a server, time it until /healthz answers and its first API "
+        "request, then measure sequential keep-alive requests. Run it once per "
+        "configuration, e.g. with DB_CONN_MAX_AGE=0 and =60, or against "
+        "runserver and gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--server",
+            default="gunicorn -c gunicorn.conf.py -b 127.0.0.1:8000 Projet_Mobile.wsgi",
+            help="Server command line, run from the current directory.",
+        )
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--path", default="/api/auth/me/")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds.")
+        parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to boot.")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def get(self, url, token=None):
+        request = urllib.request.Request(url)
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+            return response.status
+
+    def wait_ready(self, url, process, timeout):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Server exited with {process.returncode}.")
+            try:
+                if self.get(url + "/healthz") == 200:
+                    return
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.05)
+        raise CommandError("Server did not become ready in time.")
+
+    def handle(self, *args, **options):
+        tokens = loadtest.access_tokens("jobseeker", 50)
+        if not tokens:
+            raise CommandError("No jobseekers; run the seed_data command first.")
+
+        url = options["url"]
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            shlex.split(options["server"]), env=os.environ.copy(), stdout=subprocess.DEVNULL
+        )
+        try:
+            self.wait_ready(url, process, options["timeout"])
+            ready = time.perf_counter() - started
+
+            begin = time.perf_counter()
+            self.get(url + options["path"], tokens[0])
+            first = time.perf_counter() - begin
+
+            steady = loadtest.run_http(
+                url, [options["path"]], tokens, concurrency=1, duration=options["duration"]
+            )
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        report = {
+            "server": options["server"],
+            "conn_max_age": os.getenv("DB_CONN_MAX_AGE"),
+            "ready_seconds": round(ready, 3),
+            "first_request_ms": round(first * 1000, 3),
+            "steady": steady["endpoints"][options["path"]],
+        }
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(text + "\n")
+        self.stdout.write(text)
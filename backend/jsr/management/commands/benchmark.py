@@ -0,0 +1,34 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jsr import loadtest
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a swipe/feed/matches/profile traffic mix in-process and print "
+        "per-endpoint throughput, latency percentiles and query counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--warmup", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--users", type=int, default=50, help="Distinct users per role.")
+        parser.add_argument("--keep", action="store_true", help="Commit the writes.")
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        report = loadtest.run(
+            requests=options["requests"],
+            warmup=options["warmup"],
+            seed=options["seed"],
+            sample_users=options["users"],
+            keep=options["keep"],
+        )
+        text = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(text + "\n")
+        self.stdout.write(text)
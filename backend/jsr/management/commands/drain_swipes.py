@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jsr import swipe_queue
+
+
+class Command(BaseCommand):
+    help = "Materialize queued swipes; with --follow, keep polling like the Celery beat task."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--follow", action="store_true")
+        parser.add_argument("--interval", type=float, default=1.0)
+
+    def handle(self, *args, batch_size, follow, interval, **options):
+        queue = swipe_queue.get_queue()
+        while True:
+            processed = swipe_queue.drain(batch_size=batch_size)
+            self.stdout.write(
+                f"processed={processed} depth={queue.depth()} lag={queue.lag():.2f}s"
+            )
+            if not follow:
+                break
+            time.sleep(interval)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jsr.ranking import rebuild_all_feeds
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized ranked feed of every jobseeker."
+
+    def handle(self, *args, **options):
+        count = rebuild_all_feeds()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} jobseeker feeds."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jsr import job_stats
+from jsr.models import Job
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-job like/dislike/match counters from JobLike and Match."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--job", type=int, action="append", dest="jobs", help="Only this job (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, jobs, batch_size, **options):
+        job_ids = jobs or Job.objects.order_by("pk").values_list("pk", flat=True)
+        corrected = job_stats.reconcile(job_ids, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} job counters."))
@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jsr import loadtest
+from jsr.ranking import rebuild_all_feeds
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert a synthetic dataset (users, profiles, jobs, likes, matches)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobseekers", type=int, default=1000)
+        parser.add_argument("--recruiters", type=int, default=50)
+        parser.add_argument("--jobs", type=int, default=5000)
+        parser.add_argument("--likes-per-jobseeker", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--rank",
+            action="store_true",
+            help="Rebuild the ranked feeds afterwards (bulk inserts skip the signals).",
+        )
+
+    def handle(self, *args, **options):
+        counts = loadtest.seed(
+            jobseekers=options["jobseekers"],
+            recruiters=options["recruiters"],
+            jobs=options["jobs"],
+            likes_per_jobseeker=options["likes_per_jobseeker"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        if options["rank"]:
+            counts["ranked_feeds"] = rebuild_all_feeds()
+        self.stdout.write(json.dumps(counts))
@@ -0,0 +1,84 @@
+"""
+Delta sync for the matches lists.
+
+A client that holds a cursor asks for ?since=<cursor> and gets the matches
+whose updated_at moved past it: created, status/is_active changed, or
+touched because a field the lists show from the job (JOB_FIELDS) or the
+jobseeker's avatar changed (jsr.signals).
+Changed matches that no longer belong in its list (deactivated, or no longer
+accepted for a jobseeker) come back as tombstones, by id.
+
+The cursor is the largest updated_at in the user's matches at read time,
+as an ISO 8601 timestamp; a plain timestamp is accepted too. Rows are
+re-read from SYNC_OVERLAP before it, because updated_at is stamped before
+commit and a slower transaction can land behind a cursor already handed
+out. Clients upsert by id, so the overlap only repeats rows.
+
+Matches deleted with their job leave no tombstone; the count in the ETag
+changes, and clients should resync from an empty since now and then.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+SYNC_OVERLAP = timedelta(seconds=5)
+# Job fields the match lists show.
+JOB_FIELDS = {"title", "company_name"}
+
+
+def parse_since(value):
+    """None for an absent or empty since, else an aware datetime."""
+    if not value:
+        return None
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        since = None
+    if since is None:
+        raise ValidationError({"since": "Expected a cursor or an ISO 8601 timestamp."})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, dt_timezone.utc)
+    return since
+
+
+def encode_cursor(last_updated):
+    return last_updated.isoformat() if last_updated else None
+
+
+def touch(matches):
+    """Move the matches past every cursor, so the lists send them again."""
+    return matches.update(updated_at=timezone.now())
+
+
+def _state():
+    return {"last_updated": Max("updated_at"), "count": Count("id")}
+
+
+def scope_state(scope):
+    """(latest updated_at, row count): changes whenever the list can change."""
+    state = scope.aggregate(**_state())
+    return state["last_updated"], state["count"]
+
+
+async def ascope_state(scope):
+    state = await scope.aaggregate(**_state())
+    return state["last_updated"], state["count"]
+
+
+def changes(scope, listed, since):
+    """
+    (matches to upsert, ids to drop) since the cursor, both lazy querysets.
+    A since of None is a full sync: every listed match and no tombstones.
+    """
+    if since is None:
+        results, removed = scope.filter(listed), scope.none()
+    else:
+        changed = scope.filter(updated_at__gte=since - SYNC_OVERLAP)
+        results, removed = changed.filter(listed), changed.exclude(listed)
+    return (
+        results.select_related("job", "jobseeker__user").order_by("-created_at"),
+        removed.values_list("id", flat=True),
+    )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.1 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0004_job_image_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], default='pending', max_length=10),
+        ),
+    ]
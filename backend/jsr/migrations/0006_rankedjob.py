@@ -0,0 +1,28 @@
+# Generated by Django 4.2.1 on 2026-10-18 11:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_userprofile_avatar'),
+        ('jsr', '0005_match_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankedJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranked_entries', to='jsr.job')),
+                ('jobseeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranked_jobs', to='api.userprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['jobseeker', '-score', 'job'], name='jsr_rankedj_jobseek_86fd6e_idx')],
+                'unique_together': {('jobseeker', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.1 on 2026-10-18 11:47
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+CREATE_SEARCH_TRIGGER = """
+CREATE OR REPLACE FUNCTION jsr_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.skills, '') || ' ' || coalesce(NEW.tags, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.short_description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jsr_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, skills, tags, short_description, description
+    ON jsr_job FOR EACH ROW EXECUTE FUNCTION jsr_job_search_vector_update();
+
+UPDATE jsr_job SET title = title;
+
+CREATE INDEX jsr_job_search_vector_gin ON jsr_job USING gin (search_vector);
+"""
+
+DROP_SEARCH_TRIGGER = """
+DROP INDEX IF EXISTS jsr_job_search_vector_gin;
+DROP TRIGGER IF EXISTS jsr_job_search_vector_trigger ON jsr_job;
+DROP FUNCTION IF EXISTS jsr_job_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    # Other backends use the icontains fallback in jsr.search.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEARCH_TRIGGER, params=None)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_TRIGGER, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0006_rankedjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
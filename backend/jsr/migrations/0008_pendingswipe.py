@@ -0,0 +1,24 @@
+# Generated by Django 4.2.1 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0007_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSwipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jobseeker_id', models.BigIntegerField()),
+                ('job_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('like', 'Like'), ('dislike', 'Dislike')], max_length=10)),
+                ('client_ts', models.DateTimeField(blank=True, null=True)),
+                ('enqueued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.1 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0008_pendingswipe'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-id'], name='jsr_job_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['recruiter', '-created_at'], name='jsr_job_recruiter_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblike',
+            index=models.Index(fields=['jobseeker', 'action', 'job'], name='jsr_joblike_seeker_action_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['jobseeker', 'status', '-created_at'], name='jsr_match_seeker_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job', '-created_at'], name='jsr_match_job_active_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:08
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    Match = apps.get_model("jsr", "Match")
+    Match.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['jobseeker', 'updated_at'], name='jsr_match_seeker_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['job', 'updated_at'], name='jsr_match_job_updated_idx'),
+        ),
+    ]
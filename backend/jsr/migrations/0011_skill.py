@@ -0,0 +1,32 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_userprofile_avatar_variants'),
+        ('jsr', '0010_match_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('profiles', models.ManyToManyField(blank=True, related_name='skill_set', to='api.userprofile')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='jobs', to='jsr.skill'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='tagged_jobs', to='jsr.skill'),
+        ),
+    ]
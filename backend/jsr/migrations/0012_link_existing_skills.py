@@ -0,0 +1,104 @@
+import re
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+MAX_NAME_LENGTH = 100
+
+# A frozen copy of jsr.skills.parse_skills as of this migration, so later
+# changes to the parser do not change what it links.
+_SEPARATORS = re.compile(r"[,;\n]+")
+_WHITESPACE = re.compile(r"\s+")
+
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "reactjs": "react",
+    "react.js": "react",
+    "react js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "django rest framework": "drf",
+    "amazon web services": "aws",
+}
+
+
+def parse_skills(text):
+    if not text:
+        return []
+    tokens = []
+    seen = set()
+    for part in _SEPARATORS.split(text):
+        token = _WHITESPACE.sub(" ", part).strip().lower()
+        token = SKILL_ALIASES.get(token, token)
+        if token and token not in seen:
+            seen.add(token)
+            tokens.append(token)
+    return tokens
+
+
+def _names(text):
+    return [name for name in parse_skills(text) if len(name) <= MAX_NAME_LENGTH]
+
+
+def _link(Skill, through, owner_field, rows):
+    """rows: iterable of (owner id, text)."""
+    pending = []
+
+    def flush():
+        names = {name for _, names in pending for name in names}
+        Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+        ids = dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+        through.objects.bulk_create(
+            [
+                through(**{owner_field: owner_id, "skill_id": ids[name]})
+                for owner_id, names in pending
+                for name in names
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        pending.clear()
+
+    for owner_id, text in rows:
+        pending.append((owner_id, _names(text)))
+        if len(pending) >= BATCH_SIZE:
+            flush()
+    if pending:
+        flush()
+
+
+def link_existing_skills(apps, schema_editor):
+    Skill = apps.get_model("jsr", "Skill")
+    Job = apps.get_model("jsr", "Job")
+
+    jobs = Job.objects.order_by("pk")
+    _link(Skill, Job.skill_set.through, "job_id", jobs.values_list("pk", "skills").iterator())
+    _link(Skill, Job.tag_set.through, "job_id", jobs.values_list("pk", "tags").iterator())
+    # Skill.profiles is removed by 0016_remove_skill_profiles; nothing reads it.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0011_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_existing_skills, migrations.RunPython.noop),
+    ]
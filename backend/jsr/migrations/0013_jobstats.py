@@ -0,0 +1,58 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:35
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+BATCH_SIZE = 2000
+
+
+def count_existing(apps, schema_editor):
+    Job = apps.get_model("jsr", "Job")
+    JobLike = apps.get_model("jsr", "JobLike")
+    JobStats = apps.get_model("jsr", "JobStats")
+    Match = apps.get_model("jsr", "Match")
+
+    job_ids = list(Job.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(job_ids), BATCH_SIZE):
+        batch = job_ids[start : start + BATCH_SIZE]
+        counts = {}
+        likes = (
+            JobLike.objects.filter(job_id__in=batch)
+            .values("job_id")
+            .annotate(
+                likes=Count("id", filter=Q(action="like")),
+                dislikes=Count("id", filter=Q(action="dislike")),
+            )
+        )
+        matches = (
+            Match.objects.filter(job_id__in=batch, is_active=True)
+            .values("job_id")
+            .annotate(matches=Count("id"), accepted=Count("id", filter=Q(status="accepted")))
+        )
+        for row in list(likes) + list(matches):
+            counts.setdefault(row.pop("job_id"), {}).update(row)
+        JobStats.objects.bulk_create(
+            [JobStats(job_id=job_id, **fields) for job_id, fields in counts.items()]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0012_link_existing_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStats',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='jsr.job')),
+                ('likes', models.IntegerField(default=0)),
+                ('dislikes', models.IntegerField(default=0)),
+                ('matches', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.1 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0013_jobstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingswipe',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='pendingswipe',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
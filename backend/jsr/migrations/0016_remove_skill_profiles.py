@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-18 14:44
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jsr', '0015_jobimport'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='skill',
+            name='profiles',
+        ),
+    ]
@@ -1,8 +1,21 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from api.models import UserProfile
 
 
+class Skill(models.Model):
+    """
+    Canonical skill or tag (jsr.skills.canonical_skill). Job.skill_set and
+    Job.tag_set mirror the comma-separated text fields, see jsr.skill_links.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
 class Job(models.Model):
     recruiter = models.ForeignKey(
         UserProfile, on_delete=models.CASCADE, related_name="jobs"
@@ -44,9 +57,21 @@ class Job(models.Model):
     short_description = models.CharField(max_length=280, blank=True, default="")
     description = models.TextField()
     tags = models.CharField(max_length=255, blank=True)
+    skill_set = models.ManyToManyField(Skill, related_name="jobs", blank=True)
+    tag_set = models.ManyToManyField(Skill, related_name="tagged_jobs", blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Maintained by a database trigger on PostgreSQL, see jsr.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Feed keyset order and the recruiter's own job list.
+            models.Index(fields=["-created_at", "-id"], name="jsr_job_created_id_idx"),
+            models.Index(fields=["recruiter", "-created_at"], name="jsr_job_recruiter_created_idx"),
+        ]
+
 
 class JobLike(models.Model):
     LIKE_CHOICES = (("like", "Like"), ("dislike", "Dislike"))
@@ -60,6 +85,10 @@ class JobLike(models.Model):
 
     class Meta:
         unique_together = ("job", "jobseeker")
+        indexes = [
+            # Disliked/swiped job ids per jobseeker; covers the feed exclusion.
+            models.Index(fields=["jobseeker", "action", "job"], name="jsr_joblike_seeker_action_idx"),
+        ]
 
 
 class Match(models.Model):
@@ -75,11 +104,99 @@ class Match(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # Drives delta sync (GET /api/matches/?since=). QuerySet.update() skips
+    # auto_now, so bulk status changes must set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
     is_active = models.BooleanField(default=True)
 
     class Meta:
         unique_together = ("job", "jobseeker")
+        indexes = [
+            # Only active matches are ever listed, so index just those.
+            models.Index(
+                fields=["jobseeker", "status", "-created_at"],
+                condition=models.Q(is_active=True),
+                name="jsr_match_seeker_active_idx",
+            ),
+            models.Index(
+                fields=["job", "-created_at"],
+                condition=models.Q(is_active=True),
+                name="jsr_match_job_active_idx",
+            ),
+            models.Index(
+                fields=["jobseeker", "updated_at"], name="jsr_match_seeker_updated_idx"
+            ),
+            models.Index(fields=["job", "updated_at"], name="jsr_match_job_updated_idx"),
+        ]
+
+
+class JobStats(models.Model):
+    """Per-job swipe and match counters, maintained by jsr.job_stats."""
+
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    likes = models.IntegerField(default=0)
+    dislikes = models.IntegerField(default=0)
+    # Active matches (the recruiter's list) and the accepted ones among them.
+    matches = models.IntegerField(default=0)
+    accepted = models.IntegerField(default=0)
+
+
+class PendingSwipe(models.Model):
+    """
+    Append-only write-behind log of swipes, drained by jsr.tasks. Swipes
+    that fail on their own are kept with failed_at set (dead letters).
+    """
+
+    jobseeker_id = models.BigIntegerField()
+    job_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=JobLike.LIKE_CHOICES)
+    client_ts = models.DateTimeField(null=True, blank=True)
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+
+class JobImport(models.Model):
+    """
+    A recruiter's bulk job upload, imported by a Celery worker (jsr.bulk).
+    The stored file is deleted once the import has run.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    recruiter = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="job_imports"
+    )
+    file = models.FileField(upload_to="imports/", blank=True)
+    format = models.CharField(max_length=10)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    report = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+
+class RankedJob(models.Model):
+    """Materialized top-K feed entry for a jobseeker, see jsr.ranking."""
+
+    jobseeker = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="ranked_jobs"
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="ranked_entries")
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ("jobseeker", "job")
+        indexes = [models.Index(fields=["jobseeker", "-score", "job"])]
 
 
 class Profile(models.Model):
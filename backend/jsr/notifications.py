@@ -0,0 +1,67 @@
+"""
+Match events pushed to connected clients over WebSockets.
+
+Each profile has a channel layer group; jsr.consumers.MatchEventsConsumer
+joins it for every open socket of that user. Events are small "something
+changed" notices; clients react with a delta sync of /api/matches/?since=
+(jsr.match_sync), so a missed event costs nothing but latency.
+
+  recruiter: {"type": "match.liked", "job_id", "jobseeker_id", "match_id"}
+  jobseeker: {"type": "match.status", "match_id", "job_id", "status"}
+
+Events are sent after the surrounding transaction commits. The channel layer
+is settings.CHANNEL_LAYERS: in-memory (one process, tests) unless
+CHANNEL_REDIS_URL points at a broker shared by web servers and workers.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def profile_group(profile_id):
+    return f"profile.{profile_id}"
+
+
+def _send(profile_id, event):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(
+            profile_group(profile_id), {"type": "match.event", "event": event}
+        )
+    except Exception:
+        # Notifications are best effort; the write they describe succeeded.
+        logger.exception("Could not publish %s to profile %s", event["type"], profile_id)
+
+
+def publish(profile_id, event):
+    transaction.on_commit(lambda: _send(profile_id, event))
+
+
+def match_liked(recruiter_id, job_id, jobseeker_id, match_id=None):
+    publish(
+        recruiter_id,
+        {
+            "type": "match.liked",
+            "job_id": job_id,
+            "jobseeker_id": jobseeker_id,
+            "match_id": match_id,
+        },
+    )
+
+
+def match_status(match):
+    publish(
+        match.jobseeker_id,
+        {
+            "type": "match.status",
+            "match_id": match.id,
+            "job_id": match.job_id,
+            "status": match.status,
+        },
+    )
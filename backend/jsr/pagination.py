@@ -0,0 +1,136 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+def _get(obj, name):
+    """A field of a model instance or of a .values() row."""
+    return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+
+class SwipeFeedPagination(BasePagination):
+    """
+    Keyset pagination, newest first on (created_at, id).
+
+    GET ?cursor=<opaque>&limit=<n>
+    The cursor encodes the ordering values of the last card the client holds,
+    so every page is an index range scan no matter how deep the client is.
+    Subclasses change `ordering` together with get_position/parse_position.
+    Pages can be model instances or .values() rows that include the
+    ordering fields.
+    """
+    ordering = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 20
+    max_limit = 50
+
+    def get_position(self, obj):
+        return [_get(obj, "created_at").isoformat(), _get(obj, "id")]
+
+    def parse_position(self, values):
+        created_at, pk = values
+        return datetime.fromisoformat(created_at), int(pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request.query_params)))
+
+    async def apaginate_queryset(self, queryset, params):
+        """paginate_queryset() for async views; params is request.GET."""
+        return self.set_page([row async for row in self.page_queryset(queryset, params)])
+
+    def page_queryset(self, queryset, params):
+        self.limit = self.get_limit(params)
+        position = self.decode_cursor(params.get(self.cursor_query_param))
+
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        # One extra row tells us whether there is a next page without a COUNT.
+        return queryset.order_by(*self.ordering)[: self.limit + 1]
+
+    def set_page(self, rows):
+        self.has_more = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        return self.page
+
+    def after(self, position):
+        """(a, b) strictly after the cursor: a > x OR (a = x AND b > y)."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        next_cursor = None
+        if self.has_more and self.page:
+            next_cursor = self.encode_cursor(self.get_position(self.page[-1]))
+
+        return {
+            "next_cursor": next_cursor,
+            "has_more": self.has_more,
+            # Index of the card at which the client should request the
+            # next page so it arrives before the deck runs dry.
+            "prefetch_at": self.get_prefetch_at(),
+            "results": data,
+        }
+
+    def get_limit(self, params):
+        try:
+            limit = int(params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_prefetch_at(self):
+        if not self.has_more:
+            return None
+        return max(0, len(self.page) // 2)
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8")
+            return self.parse_position(json.loads(raw))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound("Invalid cursor.")
+
+
+class JobListPagination(SwipeFeedPagination):
+    """The job lists (/api/jobs/, /api/my-jobs/), whose pages are cached."""
+    default_limit = 50
+    max_limit = 100
+
+
+class RankedFeedPagination(SwipeFeedPagination):
+    """Keyset pagination over the materialized ranking: best score first."""
+    ordering = ("-feed_score", "id")
+
+    def get_position(self, obj):
+        return [_get(obj, "feed_score"), _get(obj, "id")]
+
+    def parse_position(self, values):
+        score, pk = values
+        return float(score), int(pk)
+
+
+class SearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
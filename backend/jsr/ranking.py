@@ -0,0 +1,378 @@
+"""
+Ranked jobseeker feed.
+
+Jobs are scored per jobseeker on skill overlap, experience fit and the
+jobseeker's category/governorate affinity (share of their likes), using NumPy
+over (owner, skill id) incidence arrays. The best FEED_TOP_K jobs per
+jobseeker are materialized in RankedJob so the feed is a plain indexed read.
+
+Refreshes follow writes (see jsr.signals), off the request path:
+  - a jobseeker profile save re-ranks that jobseeker against every job
+  - a job save re-scores that job against every jobseeker, in batches of
+    RANKING_BATCH_SIZE that read only their own jobseekers' likes and feeds;
+    full feeds it drops out of (swiped, or scored below their floor) are
+    re-ranked whole so the next job takes its slot
+Both read whole tables, so the signals only schedule() them: after commit,
+a Celery task (jsr.tasks.refresh_ranking) runs RANKING_DEBOUNCE seconds
+later, and saves of the same row meanwhile ride on the task already queued. Saves
+that leave the scored fields (JOB_FIELDS, PROFILE_FIELDS) alone schedule
+nothing when they name their update_fields.
+"""
+import logging
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Window, F
+from django.db.models.functions import RowNumber
+
+from api.models import UserProfile
+from .models import Job, JobLike, RankedJob
+from .skills import parse_skills
+
+logger = logging.getLogger(__name__)
+
+FEED_TOP_K = 200
+# Jobseekers re-scored per transaction when a job changes.
+RANKING_BATCH_SIZE = 500
+
+RANKING_DEBOUNCE = 5
+# Longer than a queued task should wait: a lost task only holds refreshes of
+# its row back this long.
+PENDING_TTL = 300
+JOB_FIELDS = {"skills", "category", "governorate", "min_experience_years", "max_experience_years"}
+PROFILE_FIELDS = {"role", "skills", "experience_years"}
+
+SKILL_WEIGHT = 0.55
+EXPERIENCE_WEIGHT = 0.25
+CATEGORY_WEIGHT = 0.1
+GOVERNORATE_WEIGHT = 0.1
+
+
+def _as_float_array(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _encode(rows, vocabulary, grow=True):
+    """
+    Turn a list of token lists into parallel (owner index, skill id) arrays.
+    With grow=False, tokens missing from the vocabulary are dropped.
+    """
+    owners, ids = [], []
+    for owner, tokens in enumerate(rows):
+        for token in tokens:
+            skill_id = vocabulary.get(token)
+            if skill_id is None:
+                if not grow:
+                    continue
+                skill_id = vocabulary[token] = len(vocabulary)
+            owners.append(owner)
+            ids.append(skill_id)
+    return np.array(owners, dtype=np.int64), np.array(ids, dtype=np.int64)
+
+
+def _overlap(owners, ids, size, query_ids):
+    """Per owner, how many of its skill ids are in query_ids."""
+    if not len(ids) or not query_ids:
+        return np.zeros(size)
+    hit = np.isin(ids, np.fromiter(query_ids, dtype=np.int64))
+    return np.bincount(owners[hit], minlength=size).astype(float)
+
+
+def experience_fit(years, low, high):
+    """
+    1.0 inside [low, high], decaying with the distance in years outside it.
+    Missing bounds are open; a missing `years` is scored neutrally (0.5).
+    Works element-wise on scalars or arrays.
+    """
+    years = np.asarray(years, dtype=float)
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+
+    below = np.nan_to_num(low - years, nan=0.0).clip(min=0)
+    above = np.nan_to_num(years - high, nan=0.0).clip(min=0)
+    return np.where(np.isnan(years), 0.5, 1.0 / (1.0 + below + above))
+
+
+def _combine(skill, experience, category, governorate):
+    return (
+        SKILL_WEIGHT * skill
+        + EXPERIENCE_WEIGHT * experience
+        + CATEGORY_WEIGHT * category
+        + GOVERNORATE_WEIGHT * governorate
+    )
+
+
+class JobTable:
+    """Column arrays for every job, loaded once and reused across jobseekers."""
+
+    def __init__(self, queryset=None):
+        rows = list(
+            (queryset if queryset is not None else Job.objects.all()).values_list(
+                "id",
+                "skills",
+                "category",
+                "governorate",
+                "min_experience_years",
+                "max_experience_years",
+            )
+        )
+        self.ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.categories = np.array([r[2] for r in rows], dtype=object)
+        self.governorates = np.array([r[3] for r in rows], dtype=object)
+        self.min_years = _as_float_array(r[4] for r in rows)
+        self.max_years = _as_float_array(r[5] for r in rows)
+
+        self.vocabulary = {}
+        tokens = [parse_skills(r[1]) for r in rows]
+        self.owners, self.skill_ids = _encode(tokens, self.vocabulary)
+        self.skill_counts = np.array([len(t) for t in tokens], dtype=float)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def score(self, profile, category_share, governorate_share):
+        query = {
+            self.vocabulary[t] for t in parse_skills(profile.skills) if t in self.vocabulary
+        }
+        skill = _overlap(self.owners, self.skill_ids, len(self), query)
+        skill /= np.maximum(self.skill_counts, 1)
+
+        years = np.nan if profile.experience_years is None else profile.experience_years
+        experience = experience_fit(years, self.min_years, self.max_years)
+
+        category = np.array([category_share.get(c, 0.0) for c in self.categories])
+        governorate = np.array(
+            [governorate_share.get(g, 0.0) if g else 0.0 for g in self.governorates]
+        )
+        return _combine(skill, experience, category, governorate)
+
+
+def _like_shares(profile):
+    liked = JobLike.objects.filter(jobseeker=profile, action="like")
+    total = liked.count()
+    if not total:
+        return {}, {}
+
+    categories = liked.values_list("job__category").annotate(n=Count("id"))
+    governorates = liked.values_list("job__governorate").annotate(n=Count("id"))
+    return (
+        {c: n / total for c, n in categories},
+        {g: n / total for g, n in governorates},
+    )
+
+
+def _top_k(scores, ids, k):
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    # Highest score first, lowest job id breaks ties (matches the feed order).
+    order = np.lexsort((ids[candidates], -scores[candidates]))
+    return candidates[order]
+
+
+def refresh_jobseeker_feed(profile, table=None):
+    """Re-rank every job for one jobseeker and replace their materialized feed."""
+    if profile.role != "jobseeker":
+        return
+
+    table = table if table is not None else JobTable()
+    scores = table.score(profile, *_like_shares(profile))
+
+    swiped = JobLike.objects.filter(jobseeker=profile).values_list("job_id", flat=True)
+    scores[np.isin(table.ids, np.fromiter(swiped, dtype=np.int64))] = -np.inf
+
+    keep = _top_k(scores, table.ids, FEED_TOP_K)
+    keep = keep[np.isfinite(scores[keep])]
+
+    with transaction.atomic():
+        RankedJob.objects.filter(jobseeker=profile).delete()
+        RankedJob.objects.bulk_create(
+            RankedJob(jobseeker=profile, job_id=int(table.ids[i]), score=float(scores[i]))
+            for i in keep
+        )
+
+
+def refresh_job_rankings(job):
+    """
+    Re-score one job against every jobseeker and splice it into their top-K,
+    RANKING_BATCH_SIZE jobseekers (by id) per transaction. Full feeds the job
+    may have dropped out of are re-ranked whole, so they keep FEED_TOP_K rows.
+    """
+    vocabulary = {token: i for i, token in enumerate(parse_skills(job.skills))}
+    jobseekers = (
+        UserProfile.objects.filter(role="jobseeker")
+        .exclude(job_likes__job=job)
+        .order_by("id")
+        .values_list("id", "skills", "experience_years")
+    )
+    table = None
+    last = 0
+    while True:
+        profiles = list(jobseekers.filter(id__gt=last)[:RANKING_BATCH_SIZE])
+        full = len(profiles) == RANKING_BATCH_SIZE
+        with transaction.atomic():
+            # The job's rows in this batch's id range, those of jobseekers
+            # who have swiped it since included.
+            stale = RankedJob.objects.filter(job=job, jobseeker_id__gt=last)
+            if full:
+                stale = stale.filter(jobseeker_id__lte=profiles[-1][0])
+            previous = dict(stale.values_list("jobseeker_id", "score"))
+            stale.delete()
+            displaced = _swiped_from_full_feeds(set(previous) - {p[0] for p in profiles})
+            if profiles:
+                displaced |= _splice_job(job, vocabulary, profiles, previous)
+        if displaced:
+            table = table if table is not None else JobTable()
+            _backfill(displaced, table)
+        if not full:
+            return
+        last = profiles[-1][0]
+
+
+def _swiped_from_full_feeds(jobseeker_ids):
+    """Of the jobseekers who lost the job to a swipe, those whose feed was full."""
+    if not jobseeker_ids:
+        return set()
+    counts = (
+        RankedJob.objects.filter(jobseeker_id__in=jobseeker_ids)
+        .values_list("jobseeker_id")
+        .annotate(n=Count("id"))
+    )
+    return {pid for pid, n in counts if n >= FEED_TOP_K - 1}
+
+
+def _backfill(jobseeker_ids, table):
+    """Re-rank the given jobseekers, refilling the slot the job left."""
+    for profile in UserProfile.objects.filter(id__in=jobseeker_ids):
+        refresh_jobseeker_feed(profile, table=table)
+
+
+def _splice_job(job, vocabulary, profiles, previous):
+    """
+    Insert the job into the given jobseekers' top-K where it makes the cut.
+    `previous` maps jobseekers to the score of the row the job had in their
+    feed. Returns those whose full feed the job may have dropped out of: its
+    new score is below the old floor, so a job past the top-K can now beat it.
+    """
+    profile_ids = np.array([p[0] for p in profiles], dtype=np.int64)
+    owners, ids = _encode((parse_skills(p[1]) for p in profiles), vocabulary, grow=False)
+    skill = _overlap(owners, ids, len(profiles), set(vocabulary.values()))
+    skill /= max(len(vocabulary), 1)
+
+    experience = experience_fit(
+        _as_float_array(p[2] for p in profiles),
+        np.nan if job.min_experience_years is None else job.min_experience_years,
+        np.nan if job.max_experience_years is None else job.max_experience_years,
+    )
+
+    batch_ids = profile_ids.tolist()
+    likes = JobLike.objects.filter(action="like", jobseeker_id__in=batch_ids)
+    totals = dict(likes.values_list("jobseeker_id").annotate(n=Count("id")))
+    same_category = dict(
+        likes.filter(job__category=job.category)
+        .values_list("jobseeker_id")
+        .annotate(n=Count("id"))
+    )
+    same_governorate = {}
+    if job.governorate:
+        same_governorate = dict(
+            likes.filter(job__governorate=job.governorate)
+            .values_list("jobseeker_id")
+            .annotate(n=Count("id"))
+        )
+    total = np.array([totals.get(pid, 0) for pid in batch_ids], dtype=float)
+    denominator = np.maximum(total, 1)
+    category = np.array([same_category.get(pid, 0) for pid in batch_ids]) / denominator
+    governorate = np.array([same_governorate.get(pid, 0) for pid in batch_ids]) / denominator
+
+    scores = _combine(skill, experience, category, governorate)
+
+    # Only jobseekers whose feed is not full, or whose current floor
+    # this job beats, get a new row.
+    floors = {
+        row["jobseeker_id"]: (row["n"], row["floor"])
+        for row in RankedJob.objects.filter(jobseeker_id__in=batch_ids)
+        .values("jobseeker_id")
+        .annotate(n=Count("id"), floor=Min("score"))
+    }
+    entries = []
+    overflowing = []
+    displaced = set()
+    for pid, score in zip(batch_ids, scores.tolist()):
+        n, floor = floors.get(pid, (0, None))
+        if pid in previous and n == FEED_TOP_K - 1:
+            old_floor = previous[pid] if floor is None else min(previous[pid], floor)
+            if score < old_floor:
+                displaced.add(pid)
+                continue
+        if n < FEED_TOP_K:
+            entries.append(RankedJob(jobseeker_id=pid, job=job, score=score))
+        elif score > floor:
+            entries.append(RankedJob(jobseeker_id=pid, job=job, score=score))
+            overflowing.append(pid)
+    RankedJob.objects.bulk_create(entries)
+
+    if overflowing:
+        _trim(overflowing)
+    return displaced
+
+
+def _trim(jobseeker_ids):
+    """Drop rows ranked past FEED_TOP_K for the given jobseekers."""
+    ranked = RankedJob.objects.filter(jobseeker_id__in=jobseeker_ids).annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=F("jobseeker_id"),
+            order_by=[F("score").desc(), F("job_id").asc()],
+        )
+    )
+    excess = list(ranked.filter(position__gt=FEED_TOP_K).values_list("pk", flat=True))
+    RankedJob.objects.filter(pk__in=excess).delete()
+
+
+def rebuild_all_feeds():
+    """Recompute every jobseeker's feed from scratch; returns the count."""
+    table = JobTable()
+    count = 0
+    for profile in UserProfile.objects.filter(role="jobseeker").iterator():
+        refresh_jobseeker_feed(profile, table=table)
+        count += 1
+    return count
+
+
+def _pending_key(kind, pk):
+    return f"ranking:pending:{kind}:{pk}"
+
+
+def schedule(kind, pk):
+    """Refresh the rankings of a "job" or a "jobseeker" once this transaction commits."""
+    from .tasks import refresh_ranking
+
+    def enqueue():
+        key = _pending_key(kind, pk)
+        if not cache.add(key, True, PENDING_TTL):
+            return
+        try:
+            refresh_ranking.apply_async((kind, pk), countdown=RANKING_DEBOUNCE)
+        except Exception:
+            cache.delete(key)
+            # Feeds catch up on the next rebuild (manage.py rebuild_feeds).
+            logger.exception("Could not queue the ranking refresh of %s %s", kind, pk)
+
+    transaction.on_commit(enqueue)
+
+
+def refresh(kind, pk):
+    """The task behind schedule(), reading the row as it is now."""
+    # Saves from here on need a task of their own.
+    cache.delete(_pending_key(kind, pk))
+    if kind == "job":
+        job = Job.objects.filter(pk=pk).first()
+        if job is not None:
+            refresh_job_rankings(job)
+    else:
+        profile = UserProfile.objects.filter(pk=pk, role="jobseeker").first()
+        if profile is not None:
+            refresh_jobseeker_feed(profile)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import MatchEventsConsumer
+
+websocket_urlpatterns = [
+    path("ws/matches/", MatchEventsConsumer.as_asgi()),
+]
@@ -0,0 +1,122 @@
+"""
+Job full-text search.
+
+On PostgreSQL this uses Job.search_vector, a weighted tsvector kept current by
+a database trigger and covered by a GIN index (see migration
+0007_job_search_vector):
+
+    A  title
+    B  skills, tags
+    C  short_description
+    D  description
+
+Every query term is matched as a prefix ("pyth" finds "python"), once per
+part of the vector with the text search config that part was built with
+(VECTOR_PARTS): stemmed for the prose, as typed for skills and tags. Other
+backends (SQLite in local development) fall back to icontains lookups with
+the same weights, so results are comparable but unindexed.
+"""
+import operator
+import re
+from functools import reduce
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+
+from .skill_links import jobs_with_skills
+
+# (text search config, weights) of the parts of Job.search_vector; must
+# match the trigger in migration 0007.
+VECTOR_PARTS = (("english", "ACD"), ("simple", "B"))
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Field weights used by the fallback, mirroring the A/B/C/D vector weights.
+FALLBACK_WEIGHTS = {
+    "title": 1.0,
+    "skills": 0.4,
+    "tags": 0.4,
+    "short_description": 0.2,
+    "description": 0.1,
+}
+
+
+def search_terms(text) -> list:
+    return _TERM.findall((text or "").lower())
+
+
+def filter_jobs(queryset, category=None, governorate=None, experience=None, skills=None):
+    """
+    Structured filters shared by search and the plain job lists. `skills` is
+    a list of canonical names (jsr.skills.parse_skills), all required.
+    """
+    if skills:
+        queryset = jobs_with_skills(queryset, skills)
+    if category:
+        queryset = queryset.filter(category=category)
+    if governorate:
+        queryset = queryset.filter(governorate=governorate)
+    if experience is not None:
+        queryset = queryset.filter(
+            Q(min_experience_years__isnull=True) | Q(min_experience_years__lte=experience),
+            Q(max_experience_years__isnull=True) | Q(max_experience_years__gte=experience),
+        )
+    return queryset
+
+
+def search_jobs(queryset, text):
+    """
+    Restrict `queryset` to jobs matching every term of `text`, annotated with
+    `search_rank` and ordered best first.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == "postgresql":
+        return _search_postgres(queryset, terms)
+    return _search_fallback(queryset, terms)
+
+
+def _term_query(term):
+    # Terms are \w+ only, so they are safe to splice into a raw tsquery.
+    parts = [
+        SearchQuery(f"{term}:*{weights}", search_type="raw", config=config)
+        for config, weights in VECTOR_PARTS
+    ]
+    return reduce(operator.or_, parts)
+
+
+def _search_postgres(queryset, terms):
+    query = reduce(operator.and_, map(_term_query, terms))
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(search_rank=SearchRank(F("search_vector"), query))
+        .order_by("-search_rank", "-created_at", "-id")
+    )
+
+
+def _search_fallback(queryset, terms):
+    rank = Value(0.0)
+    for term in terms:
+        matches_term = Q()
+        for field, weight in FALLBACK_WEIGHTS.items():
+            lookup = {f"{field}__icontains": term}
+            matches_term |= Q(**lookup)
+            rank = rank + Case(
+                When(Q(**lookup), then=Value(weight)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        queryset = queryset.filter(matches_term)
+
+    return queryset.annotate(search_rank=rank).order_by("-search_rank", "-created_at", "-id")
+
+
+def naive_search(queryset, text):
+    """The pre-index approach: OR of icontains over every text column, unranked."""
+    condition = Q()
+    for field in FALLBACK_WEIGHTS:
+        condition |= Q(**{f"{field}__icontains": text})
+    return queryset.filter(condition).order_by("-created_at")
@@ -1,14 +1,21 @@
 from rest_framework import serializers
+from Projet_Mobile.instrumentation import TimedDataMixin, TimedListSerializer
+from api import avatars
 from api.models import UserProfile
-from .models import Job, Match, JobLike
+from api.profiles import get_user_profile
+from . import facet_index
+from .fast_json import JOB_VIEWS
+from .models import Job, JobImport, Match, JobLike
+from .skills import parse_skills
 
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(TimedDataMixin, serializers.ModelSerializer):
     recruiter_id = serializers.IntegerField(source="recruiter.id", read_only=True)
     recruiter_name = serializers.CharField(source="recruiter.company_name", read_only=True)
 
     class Meta:
         model = Job
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "title",
@@ -30,35 +37,168 @@ class JobSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        request = self.context["request"]
-        profile = UserProfile.objects.get(user=request.user)
-        return Job.objects.create(recruiter=profile, **validated_data)
+        if "recruiter" not in validated_data:
+            validated_data["recruiter"] = get_user_profile(self.context["request"].user)
+        return Job.objects.create(**validated_data)
+
+    def update(self, instance, validated_data):
+        # Save only what changed: the post_save signals (jsr.signals) skip
+        # the skill links, rankings and match touches of untouched fields.
+        changed = [k for k, v in validated_data.items() if getattr(instance, k) != v]
+        for k in changed:
+            setattr(instance, k, validated_data[k])
+        if changed:
+            instance.save(update_fields=changed)
+        return instance
+
+
+class JobFacetParamsSerializer(serializers.Serializer):
+    category = serializers.ChoiceField(choices=Job.CATEGORY_CHOICES, required=False)
+    governorate = serializers.ChoiceField(choices=Job.GOVERNORATE_CHOICES, required=False)
+    experience = serializers.IntegerField(min_value=0, required=False)
+
+    def validate_experience(self, value):
+        # The facet index has no bitmaps past MAX_YEARS; the SQL filters
+        # read the same capped value so counts and results agree.
+        return min(value, facet_index.MAX_YEARS)
+
+
+class JobSearchParamsSerializer(JobFacetParamsSerializer):
+    q = serializers.CharField(max_length=200, required=False)
+    # Comma form, as in Job.skills: "python, react".
+    skills = serializers.CharField(max_length=255, required=False)
+
+    def validate_skills(self, value):
+        return parse_skills(value)
+
+    def validate(self, attrs):
+        if not attrs.get("q") and not attrs.get("skills"):
+            raise serializers.ValidationError("Provide q, skills or both.")
+        return attrs
+
+
+class JobFieldsParamsSerializer(serializers.Serializer):
+    """
+    ?view=card|detail or ?fields=id,title,... for the job feeds and search.
+    validated_data["fields"] is the tuple of JobSerializer fields to return,
+    in JobSerializer order; "id" is always included. Default: detail.
+    """
+    view = serializers.ChoiceField(choices=list(JOB_VIEWS), required=False)
+    fields = serializers.CharField(max_length=500, required=False)
+
+    def validate_fields(self, value):
+        names = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = names - set(JobSerializer.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+        return names | {"id"}
+
+    def validate(self, attrs):
+        if "view" in attrs and "fields" in attrs:
+            raise serializers.ValidationError("Provide either view or fields, not both.")
+        if "fields" in attrs:
+            names = attrs["fields"]
+            return {"fields": tuple(f for f in JobSerializer.Meta.fields if f in names)}
+        return {"fields": JOB_VIEWS[attrs.get("view", "detail")]}
 
 
 class JobLikeSerializer(serializers.Serializer):
     action = serializers.ChoiceField(choices=JobLike.LIKE_CHOICES)
 
 
-class MatchSerializer(serializers.ModelSerializer):
+class SwipeSerializer(serializers.Serializer):
+    job_id = serializers.IntegerField(min_value=1)
+    action = serializers.ChoiceField(choices=JobLike.LIKE_CHOICES)
+    client_ts = serializers.DateTimeField(required=False)
+
+
+class SwipeBatchSerializer(serializers.Serializer):
+    swipes = SwipeSerializer(many=True, allow_empty=False, max_length=200)
+
+
+class MatchTriageItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=Match.STATUS_CHOICES)
+
+
+class MatchTriageSerializer(serializers.Serializer):
+    updates = MatchTriageItemSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class JobImportSerializer(TimedDataMixin, serializers.ModelSerializer):
+    class Meta:
+        model = JobImport
+        fields = ["id", "status", "format", "report", "created_at", "finished_at"]
+
+
+class MatchSerializer(TimedDataMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source="job.title", read_only=True)
     company_name = serializers.CharField(source="job.company_name", read_only=True)
     jobseeker_name = serializers.CharField(source="jobseeker.user.username", read_only=True)
+    jobseeker_avatar = serializers.SerializerMethodField()
 
     class Meta:
         model = Match
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "job",
             "job_title",
             "company_name",
             "jobseeker_name",
+            "jobseeker_avatar",
             "created_at",
+            "updated_at",
             "status",
         ]
         # Only allow status update via PATCH
-        read_only_fields = ["id", "job", "job_title", "company_name", "jobseeker_name", "created_at"]
+        read_only_fields = [
+            "id",
+            "job",
+            "job_title",
+            "company_name",
+            "jobseeker_name",
+            "jobseeker_avatar",
+            "created_at",
+            "updated_at",
+        ]
+
+    def get_jobseeker_avatar(self, obj):
+        # Thumbnail URL; avatar changes touch the matches (jsr.signals).
+        return avatars.variant_url(obj.jobseeker, "thumb", request=self.context.get("request"))
 
     def validate_status(self, value: str):
         if value not in {"pending", "accepted", "rejected"}:
             raise serializers.ValidationError("Invalid status.")
         return value
+
+
+class CandidateParamsSerializer(serializers.Serializer):
+    mode = serializers.ChoiceField(choices=["and", "or"], default="and")
+    # Clamped to the view's range rather than rejected.
+    limit = serializers.IntegerField(default=50)
+
+
+class CandidateSerializer(TimedDataMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source="user.username", read_only=True)
+    matched_skills = serializers.SerializerMethodField()
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UserProfile
+        list_serializer_class = TimedListSerializer
+        fields = [
+            "id",
+            "name",
+            "skills",
+            "experience_years",
+            "bio",
+            "matched_skills",
+            "score",
+        ]
+
+    def get_matched_skills(self, obj):
+        return self.context["ranking"][obj.id][0]
+
+    def get_score(self, obj):
+        return round(self.context["ranking"][obj.id][1], 4)
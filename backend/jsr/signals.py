@@ -0,0 +1,97 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.avatars import avatar_processed
+from api.models import UserProfile
+from . import job_cache, match_sync, ranking, skill_links
+from .facet_index import index as facet_index
+from .skill_index import index as skill_index
+from .models import Job, Match
+
+
+def _scored_fields_changed(update_fields, scored):
+    return update_fields is None or not scored.isdisjoint(update_fields)
+
+
+@receiver(post_save, sender=Job)
+def rerank_job(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _scored_fields_changed(update_fields, ranking.JOB_FIELDS):
+        return
+    ranking.schedule("job", instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def link_job_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _scored_fields_changed(update_fields, skill_links.JOB_FIELDS):
+        return
+    skill_links.link_jobs([instance])
+
+
+@receiver(post_save, sender=Job)
+def touch_job_matches(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created or not _scored_fields_changed(update_fields, match_sync.JOB_FIELDS):
+        return
+    match_sync.touch(Match.objects.filter(job=instance))
+
+
+@receiver(post_save, sender=Job)
+def reindex_job_facets(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    facet_index.update(instance)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_job_facets(sender, instance, **kwargs):
+    facet_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_lists(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    job_cache.invalidate_jobs(instance.recruiter_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_recruiter_job_lists(sender, instance, raw=False, **kwargs):
+    # Job lists show the recruiter's company name.
+    if raw or instance.role != "recruiter":
+        return
+    job_cache.invalidate_jobs(instance.id)
+
+
+@receiver(post_save, sender=UserProfile)
+def rerank_jobseeker(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.role != "jobseeker":
+        return
+    if _scored_fields_changed(update_fields, ranking.PROFILE_FIELDS):
+        ranking.schedule("jobseeker", instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def reindex_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _scored_fields_changed(update_fields, skill_index.PROFILE_FIELDS):
+        return
+    skill_index.update(instance)
+
+
+@receiver(post_delete, sender=UserProfile)
+def unindex_skills(sender, instance, **kwargs):
+    skill_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def touch_profile_matches(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    # Match lists show the jobseeker's avatar, which a new upload hides
+    # until it is processed.
+    if raw or created or instance.role != "jobseeker":
+        return
+    if _scored_fields_changed(update_fields, {"avatar"}):
+        match_sync.touch(Match.objects.filter(jobseeker=instance))
+
+
+@receiver(avatar_processed)
+def touch_processed_avatar_matches(sender, profile_id, **kwargs):
+    match_sync.touch(Match.objects.filter(jobseeker_id=profile_id))
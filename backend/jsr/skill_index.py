@@ -0,0 +1,152 @@
+"""
+In-process inverted index over jobseeker skills.
+
+skill token -> sorted int64 array of UserProfile ids. Boolean AND/OR
+queries are answered with NumPy set operations on those postings instead of
+`icontains` scans over UserProfile.skills.
+
+The index is built lazily on first use and kept current in this process by
+the UserProfile signals in jsr.signals. Other worker processes pick up
+changes when their copy expires after MAX_AGE seconds.
+"""
+import threading
+import time
+
+import numpy as np
+
+from api.models import UserProfile
+from .ranking import experience_fit
+from .skills import parse_skills
+
+MAX_AGE = 300
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class SkillIndex:
+    # The UserProfile fields the index reads.
+    PROFILE_FIELDS = {"role", "skills", "experience_years"}
+
+    def __init__(self):
+        self.postings = {}
+        self.profile_skills = {}
+        self.experience = {}
+        self.built_at = None
+        self.lock = threading.RLock()
+
+    def build(self):
+        postings = {}
+        profile_skills = {}
+        experience = {}
+        rows = UserProfile.objects.filter(role="jobseeker").values_list(
+            "id", "skills", "experience_years"
+        )
+        for pk, skills, years in rows.iterator():
+            tokens = parse_skills(skills)
+            profile_skills[pk] = tokens
+            experience[pk] = years
+            for token in tokens:
+                postings.setdefault(token, []).append(pk)
+
+        with self.lock:
+            self.postings = {
+                token: np.unique(np.array(ids, dtype=np.int64))
+                for token, ids in postings.items()
+            }
+            self.profile_skills = profile_skills
+            self.experience = experience
+            self.built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self.built_at is None or time.monotonic() - self.built_at > MAX_AGE:
+            self.build()
+
+    def _add(self, token, pk):
+        ids = self.postings.get(token, _EMPTY)
+        at = np.searchsorted(ids, pk)
+        if at < len(ids) and ids[at] == pk:
+            return
+        self.postings[token] = np.insert(ids, at, pk)
+
+    def _remove(self, token, pk):
+        ids = self.postings.get(token)
+        if ids is None:
+            return
+        at = np.searchsorted(ids, pk)
+        if at < len(ids) and ids[at] == pk:
+            ids = np.delete(ids, at)
+            if len(ids):
+                self.postings[token] = ids
+            else:
+                del self.postings[token]
+
+    def update(self, profile):
+        """Re-index one profile; non-jobseekers are removed."""
+        with self.lock:
+            if self.built_at is None:
+                return
+            old = set(self.profile_skills.pop(profile.pk, ()))
+            self.experience.pop(profile.pk, None)
+            new = parse_skills(profile.skills) if profile.role == "jobseeker" else []
+
+            for token in old - set(new):
+                self._remove(token, profile.pk)
+            for token in set(new) - old:
+                self._add(token, profile.pk)
+
+            if profile.role == "jobseeker":
+                self.profile_skills[profile.pk] = new
+                self.experience[profile.pk] = profile.experience_years
+
+    def remove(self, pk):
+        with self.lock:
+            for token in self.profile_skills.pop(pk, ()):
+                self._remove(token, pk)
+            self.experience.pop(pk, None)
+
+    def search(self, tokens, mode="and"):
+        """
+        Profile ids having all (mode="and") or any (mode="or") of the tokens,
+        with the number of tokens each one matched.
+        """
+        self.ensure_built()
+        with self.lock:
+            lists = [self.postings.get(t, _EMPTY) for t in set(tokens)]
+
+        if not lists:
+            return _EMPTY, _EMPTY
+
+        if mode == "and":
+            lists.sort(key=len)
+            ids = lists[0]
+            for other in lists[1:]:
+                if not len(ids):
+                    break
+                ids = np.intersect1d(ids, other, assume_unique=True)
+            return ids, np.full(len(ids), len(lists), dtype=np.int64)
+
+        return np.unique(np.concatenate(lists), return_counts=True)
+
+    def rank(self, tokens, mode="and", min_years=None, max_years=None, limit=50):
+        """
+        Search, then order by matched skills, experience fit and id.
+        Returns a list of (profile id, matched skills, score).
+        """
+        ids, matched = self.search(tokens, mode)
+        if not len(ids):
+            return []
+
+        years = [self.experience.get(pk) for pk in ids.tolist()]
+        years = np.array([np.nan if y is None else y for y in years], dtype=float)
+        fit = experience_fit(
+            years,
+            np.nan if min_years is None else min_years,
+            np.nan if max_years is None else max_years,
+        )
+        score = matched / max(len(set(tokens)), 1) + 0.5 * fit
+
+        order = np.lexsort((ids, -score))[:limit]
+        return [(int(ids[i]), int(matched[i]), float(score[i])) for i in order]
+
+
+index = SkillIndex()
@@ -0,0 +1,86 @@
+"""
+Skill and tag links derived from the comma-separated text fields.
+
+Job.skills and Job.tags stay what the API reads and writes. On every save
+that may change them (JOB_FIELDS) the job's rows in the many-to-many tables
+(Job.skill_set, Job.tag_set) are replaced by the canonical tokens of its
+text (jsr.skills.parse_skills), so skill filters become lookups on the
+through tables' indexes instead of LIKE '%x%' scans over the text.
+JobSerializer.update() saves only the fields a request changed, so edits
+that leave the text alone do not relink.
+
+Jobseeker skills are not linked: candidate search reads them from the
+in-process jsr.skill_index.
+
+Saves are linked by the post_save signals in jsr.signals; code that
+bulk-inserts jobs calls link_jobs() itself.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Job, Skill
+from .skills import parse_skills
+
+MAX_NAME_LENGTH = Skill._meta.get_field("name").max_length
+# The text fields the links are derived from.
+JOB_FIELDS = {"skills", "tags"}
+
+
+def skill_names(text):
+    return [name for name in parse_skills(text) if len(name) <= MAX_NAME_LENGTH]
+
+
+def skill_ids(names):
+    """{name: Skill id}, creating the skills that do not exist yet."""
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+    missing = names - ids.keys()
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(Skill.objects.filter(name__in=missing).values_list("name", "id"))
+    return ids
+
+
+def _replace(through, owner_field, names_by_owner):
+    ids = skill_ids(name for names in names_by_owner.values() for name in names)
+    with transaction.atomic():
+        through.objects.filter(**{f"{owner_field}__in": list(names_by_owner)}).delete()
+        through.objects.bulk_create(
+            [
+                through(**{owner_field: owner_id, "skill_id": ids[name]})
+                for owner_id, names in names_by_owner.items()
+                for name in names
+            ],
+            batch_size=1000,
+        )
+
+
+def link_jobs(jobs):
+    jobs = [job for job in jobs if job.pk is not None]
+    if not jobs:
+        return
+    _replace(Job.skill_set.through, "job_id", {job.pk: skill_names(job.skills) for job in jobs})
+    _replace(Job.tag_set.through, "job_id", {job.pk: skill_names(job.tags) for job in jobs})
+
+
+def _with_all(queryset, through, owner_field, names):
+    names = set(names)
+    ids = list(Skill.objects.filter(name__in=names).values_list("id", flat=True))
+    if len(ids) < len(names):
+        return queryset.none()
+    for skill_id in ids:
+        links = through.objects.filter(**{owner_field: OuterRef("pk")}, skill_id=skill_id)
+        queryset = queryset.filter(Exists(links))
+    return queryset
+
+
+def jobs_with_skills(queryset, names):
+    """Jobs linked to every one of the canonical skill names."""
+    return _with_all(queryset, Job.skill_set.through, "job_id", names)
+
+
+def jobs_with_tags(queryset, names):
+    return _with_all(queryset, Job.tag_set.through, "job_id", names)
+
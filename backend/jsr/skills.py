@@ -0,0 +1,59 @@
+import re
+
+_SEPARATORS = re.compile(r"[,;\n]+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Spellings folded into one canonical skill name. Keys are normalized.
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "reactjs": "react",
+    "react.js": "react",
+    "react js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "django rest framework": "drf",
+    "amazon web services": "aws",
+}
+
+
+def normalize_skill(value: str) -> str:
+    return _WHITESPACE.sub(" ", value).strip().lower()
+
+
+def canonical_skill(value: str) -> str:
+    token = normalize_skill(value)
+    return SKILL_ALIASES.get(token, token)
+
+
+def parse_skills(text) -> list:
+    """
+    Split a free-text skills field ("Python, Django;  ReactJS") into
+    canonical, de-duplicated tokens, keeping their original order.
+    """
+    if not text:
+        return []
+
+    tokens = []
+    seen = set()
+    for part in _SEPARATORS.split(text):
+        token = canonical_skill(part)
+        if token and token not in seen:
+            seen.add(token)
+            tokens.append(token)
+    return tokens
@@ -0,0 +1,251 @@
+"""
+Write-behind swipe queue.
+
+With SWIPE_WRITE_BEHIND enabled, JobLikeView and SwipeBatchView only append
+swipes here and answer immediately; jsr.tasks.drain_swipe_queue later coalesces queued swipes per
+(jobseeker, job), last write wins, and bulk-upserts JobLike/Match through
+jsr.swipes.upsert_swipes.
+
+A batch that fails is bisected (keeping each (jobseeker, job) in one half,
+so coalescing is unchanged) until the swipes that fail on their own are
+isolated; those are dead-lettered and the rest of the batch goes through,
+so one poison swipe (e.g. from a jobseeker deleted since) cannot hold the
+queue back. OperationalErrors (lost connection, deadlock) are taken as
+transient instead: the whole batch stays queued for the next drain.
+
+Backends (settings.SWIPE_QUEUE_BACKEND):
+  - "database": the append-only PendingSwipe table; batches are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED and deleted in the same transaction as
+    the upsert, so a crashed worker leaves them queued. Each attempt runs in
+    a savepoint; dead letters stay in the table with failed_at and error set.
+  - "memory": a process-local deque, for tests and single-process runs.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+from prometheus_client import Counter
+from prometheus_client.core import GaugeMetricFamily
+
+from Projet_Mobile.instrumentation import register_scrape_collector
+
+from .models import JobLike, Match, PendingSwipe
+from .swipes import latest_per_key, upsert_swipes
+
+logger = logging.getLogger(__name__)
+
+SWIPES_PROCESSED = Counter(
+    "jsr_swipes_processed_total", "Swipes drained from the write-behind queue."
+)
+SWIPES_COALESCED = Counter(
+    "jsr_swipes_coalesced_total", "Queued swipes superseded by a later swipe on the same job."
+)
+SWIPES_DEAD_LETTERED = Counter(
+    "jsr_swipes_dead_lettered_total", "Queued swipes that could not be materialized."
+)
+
+
+def _swipe_key(swipe):
+    return swipe["jobseeker_id"], swipe["job_id"]
+
+
+def apply_isolated(handler, batch):
+    """
+    handler(batch), bisecting on failure. Returns [(swipes, exception)] for
+    the keys whose swipes failed on their own; OperationalError propagates.
+    """
+    groups = {}
+    for swipe in batch:
+        groups.setdefault(_swipe_key(swipe), []).append(swipe)
+    failed = []
+
+    def attempt(groups):
+        try:
+            handler([swipe for group in groups for swipe in group])
+        except OperationalError:
+            raise
+        except Exception as exc:
+            if len(groups) == 1:
+                failed.append((groups[0], exc))
+                return
+            middle = len(groups) // 2
+            attempt(groups[:middle])
+            attempt(groups[middle:])
+
+    attempt(list(groups.values()))
+    for swipes, exc in failed:
+        logger.warning("Dead-lettering %d swipe(s) for %s: %r", len(swipes), _swipe_key(swipes[0]), exc)
+        SWIPES_DEAD_LETTERED.inc(len(swipes))
+    return failed
+
+
+class InMemorySwipeQueue:
+    def __init__(self):
+        self.items = deque()
+        self.dead = []
+        self.lock = threading.Lock()
+
+    def push(self, jobseeker_id, job_id, action, client_ts=None):
+        self.push_many([(jobseeker_id, job_id, action, client_ts)])
+
+    def push_many(self, swipes):
+        now = time.time()
+        with self.lock:
+            self.items.extend(
+                {
+                    "jobseeker_id": jobseeker_id,
+                    "job_id": job_id,
+                    "action": action,
+                    "client_ts": client_ts,
+                    "enqueued_at": now,
+                }
+                for jobseeker_id, job_id, action, client_ts in swipes
+            )
+
+    def drain(self, handler, limit):
+        with self.lock:
+            batch = [self.items.popleft() for _ in range(min(limit, len(self.items)))]
+        if not batch:
+            return 0
+        try:
+            failed = apply_isolated(handler, batch)
+        except Exception:
+            with self.lock:
+                self.items.extendleft(reversed(batch))
+            raise
+        with self.lock:
+            self.dead.extend(
+                dict(swipe, error=repr(exc)) for swipes, exc in failed for swipe in swipes
+            )
+        return len(batch)
+
+    def depth(self):
+        return len(self.items)
+
+    def lag(self):
+        with self.lock:
+            oldest = self.items[0]["enqueued_at"] if self.items else None
+        return 0.0 if oldest is None else time.time() - oldest
+
+
+class DatabaseSwipeQueue:
+    def push(self, jobseeker_id, job_id, action, client_ts=None):
+        PendingSwipe.objects.create(
+            jobseeker_id=jobseeker_id, job_id=job_id, action=action, client_ts=client_ts
+        )
+
+    def push_many(self, swipes):
+        PendingSwipe.objects.bulk_create(
+            PendingSwipe(
+                jobseeker_id=jobseeker_id, job_id=job_id, action=action, client_ts=client_ts
+            )
+            for jobseeker_id, job_id, action, client_ts in swipes
+        )
+
+    def drain(self, handler, limit):
+        def attempt(rows):
+            with transaction.atomic():
+                handler(rows)
+
+        with transaction.atomic():
+            rows = list(
+                self.pending()
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values("id", "jobseeker_id", "job_id", "action", "client_ts")[:limit]
+            )
+            if not rows:
+                return 0
+            failed = apply_isolated(attempt, rows)
+            dead = {}
+            for swipes, exc in failed:
+                for swipe in swipes:
+                    dead[swipe["id"]] = repr(exc)
+            for row_id, error in dead.items():
+                PendingSwipe.objects.filter(id=row_id).update(failed_at=timezone.now(), error=error)
+            PendingSwipe.objects.filter(
+                id__in=[row["id"] for row in rows if row["id"] not in dead]
+            ).delete()
+        return len(rows)
+
+    def pending(self):
+        return PendingSwipe.objects.filter(failed_at__isnull=True)
+
+    def depth(self):
+        return self.pending().count()
+
+    def lag(self):
+        oldest = self.pending().aggregate(oldest=Min("enqueued_at"))["oldest"]
+        return 0.0 if oldest is None else (timezone.now() - oldest).total_seconds()
+
+
+_BACKENDS = {"database": DatabaseSwipeQueue, "memory": InMemorySwipeQueue}
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = _BACKENDS[settings.SWIPE_QUEUE_BACKEND]()
+        return _queue
+
+
+def materialize(swipes):
+    actions = latest_per_key(swipes, _swipe_key)
+    with transaction.atomic():
+        upsert_swipes(actions)
+        # Foreign keys are checked at commit, which may be the caller's (the
+        # database queue's claim); check them now so that a swipe of a
+        # deleted jobseeker fails here, where apply_isolated can bisect.
+        connection.check_constraints(
+            table_names=[JobLike._meta.db_table, Match._meta.db_table]
+        )
+    SWIPES_PROCESSED.inc(len(swipes))
+    SWIPES_COALESCED.inc(len(swipes) - len(actions))
+
+
+def drain(batch_size=1000, max_batches=None):
+    """Drain until the queue is empty (or max_batches); returns swipes processed."""
+    queue = get_queue()
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        processed = queue.drain(materialize, batch_size)
+        if not processed:
+            break
+        total += processed
+        batches += 1
+    return total
+
+
+class QueueCollector:
+    """Depth and lag gauges, read from the queue when scraped."""
+
+    GAUGES = {
+        "jsr_swipe_queue_depth": "Swipes waiting in the write-behind queue.",
+        "jsr_swipe_queue_lag_seconds": "Age of the oldest queued swipe.",
+    }
+
+    def describe(self):
+        # Lets the registry check names without querying the queue.
+        for name, documentation in self.GAUGES.items():
+            yield GaugeMetricFamily(name, documentation)
+
+    def collect(self):
+        queue = get_queue()
+        values = {
+            "jsr_swipe_queue_depth": queue.depth(),
+            "jsr_swipe_queue_lag_seconds": queue.lag(),
+        }
+        for name, documentation in self.GAUGES.items():
+            yield GaugeMetricFamily(name, documentation, values[name])
+
+
+register_scrape_collector(QueueCollector())
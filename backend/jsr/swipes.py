@@ -0,0 +1,170 @@
+"""
+Set-based swipe ingestion.
+
+upsert_swipes() writes any number of swipes, for any number of jobseekers,
+with a fixed number of queries per few hundred swipes: JobLike rows are upserted with
+INSERT ... ON CONFLICT, likes create missing Match rows (and notify the
+recruiter, see jsr.notifications), dislikes deactivate existing ones. The
+semantics match JobLikeView for a single swipe.
+
+The rows' previous states are read (and locked) first, so the per-job
+counters (jsr.job_stats) move by exactly what the batch changed.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import job_stats, notifications
+from .models import Job, JobLike, Match
+
+
+def latest_swipes(swipes, key):
+    """
+    Collapse swipes to one per key(swipe), last write wins. Each swipe is a
+    mapping with an action and an optional client_ts; without timestamps the
+    later item in the sequence wins. Returns {key: winning swipe}.
+    """
+    latest = {}
+    for position, swipe in enumerate(swipes):
+        rank = (swipe.get("client_ts") is not None, swipe.get("client_ts"), position)
+        current = latest.get(key(swipe))
+        if current is None or rank >= current[0]:
+            latest[key(swipe)] = (rank, swipe)
+    return {k: swipe for k, (_, swipe) in latest.items()}
+
+
+def latest_per_key(swipes, key):
+    """latest_swipes(), as {key: action}."""
+    return {k: swipe["action"] for k, swipe in latest_swipes(swipes, key).items()}
+
+
+# (jobseeker_id, job_id) pairs per OR'd filter: SQLite rejects expression
+# trees deeper than 1000, which a drain batch of distinct pairs can reach.
+PAIR_CHUNK_SIZE = 300
+
+
+def _pairs(keys):
+    """Yield Q filters that together match exactly the given pairs."""
+    keys = list(keys)
+    for start in range(0, len(keys), PAIR_CHUNK_SIZE):
+        condition = Q()
+        for jobseeker_id, job_id in keys[start : start + PAIR_CHUNK_SIZE]:
+            condition |= Q(jobseeker_id=jobseeker_id, job_id=job_id)
+        yield condition
+
+
+def upsert_swipes(actions):
+    """
+    Persist {(jobseeker_id, job_id): action} in one transaction.
+    Swipes on jobs that no longer exist are dropped; returns their keys.
+    """
+    recruiters = dict(
+        Job.objects.filter(id__in={job_id for _, job_id in actions}).values_list(
+            "id", "recruiter_id"
+        )
+    )
+    missing = {key for key in actions if key[1] not in recruiters}
+    actions = {key: action for key, action in actions.items() if key not in missing}
+    if not actions:
+        return missing
+
+    liked = [key for key, action in actions.items() if action == "like"]
+    disliked = [key for key, action in actions.items() if action == "dislike"]
+
+    with transaction.atomic():
+        old_actions = {}
+        old_matches = {}
+        for keys in _pairs(actions):
+            for jobseeker_id, job_id, action in (
+                JobLike.objects.select_for_update()
+                .filter(keys)
+                .values_list("jobseeker_id", "job_id", "action")
+            ):
+                old_actions[jobseeker_id, job_id] = action
+            for jobseeker_id, job_id, is_active, status in (
+                Match.objects.select_for_update()
+                .filter(keys)
+                .values_list("jobseeker_id", "job_id", "is_active", "status")
+            ):
+                old_matches[jobseeker_id, job_id] = (is_active, status)
+
+        JobLike.objects.bulk_create(
+            [
+                JobLike(jobseeker_id=jobseeker_id, job_id=job_id, action=action)
+                for (jobseeker_id, job_id), action in actions.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["job", "jobseeker"],
+            update_fields=["action"],
+        )
+
+        if liked:
+            Match.objects.bulk_create(
+                [
+                    Match(
+                        jobseeker_id=jobseeker_id,
+                        job_id=job_id,
+                        status="pending",
+                        is_active=True,
+                    )
+                    for jobseeker_id, job_id in liked
+                ],
+                ignore_conflicts=True,
+            )
+            # ignore_conflicts does not report which rows are new, so repeat
+            # likes notify again; clients dedupe on their next sync.
+            for jobseeker_id, job_id in liked:
+                notifications.match_liked(recruiters[job_id], job_id, jobseeker_id)
+
+        now = timezone.now()
+        for keys in _pairs(disliked):
+            Match.objects.filter(keys).update(
+                is_active=False, status="rejected", updated_at=now
+            )
+
+        job_stats.apply(_stat_deltas(actions, old_actions, old_matches))
+
+    return missing
+
+
+def _stat_deltas(actions, old_actions, old_matches):
+    deltas = defaultdict(Counter)
+    for key, action in actions.items():
+        delta = deltas[key[1]]
+        delta.update(job_stats.swipe_delta(old_actions.get(key), action))
+        old_match = old_matches.get(key)
+        if action == "like":
+            # Likes only create missing matches; existing ones are left as they are.
+            new_match = old_match or (True, "pending")
+        else:
+            new_match = old_match and (False, "rejected")
+        delta.update(job_stats.match_delta(old_match, new_match))
+    return deltas
+
+
+def apply_swipes(profile, actions):
+    """
+    Persist {job_id: action} for one jobseeker.
+
+    Returns (match ids by liked job id, set of job ids that do not exist).
+    """
+    missing = upsert_swipes(
+        {(profile.id, job_id): action for job_id, action in actions.items()}
+    )
+    missing = {job_id for _, job_id in missing}
+
+    liked = [
+        job_id
+        for job_id, action in actions.items()
+        if action == "like" and job_id not in missing
+    ]
+    match_ids = {}
+    if liked:
+        match_ids = dict(
+            Match.objects.filter(jobseeker=profile, job_id__in=liked).values_list(
+                "job_id", "id"
+            )
+        )
+    return match_ids, missing
@@ -0,0 +1,23 @@
+from celery import shared_task
+
+from . import bulk, ranking, swipe_queue
+
+
+@shared_task(ignore_result=True)
+def drain_swipe_queue(batch_size=1000, max_batches=50):
+    return swipe_queue.drain(batch_size=batch_size, max_batches=max_batches)
+
+
+@shared_task(ignore_result=True)
+def refresh_ranking(kind, pk):
+    return ranking.refresh(kind, pk)
+
+
+@shared_task(ignore_result=True)
+def rebuild_ranked_feeds():
+    return ranking.rebuild_all_feeds()
+
+
+@shared_task(ignore_result=True)
+def import_jobs(import_id):
+    return bulk.run_import(import_id)
@@ -1,3 +1,1587 @@
-from django.test import TestCase
+import csv
+import importlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from Projet_Mobile import health, instrumentation
+from Projet_Mobile.asgi import application
+from api import avatars
+from api.models import UserProfile
+from api.serializers import ProfileTokenObtainPairSerializer
+from . import (
+    async_views,
+    bulk,
+    facet_index,
+    fast_json,
+    job_stats,
+    loadtest,
+    ranking,
+    skill_index,
+    skill_links,
+    swipe_queue,
+    tasks,
+    views,
+)
+from .fast_json import FastJSONRenderer
+from .models import Job, JobImport, JobLike, Match, PendingSwipe, RankedJob, Skill
+from .search import filter_jobs
+from .serializers import JobSerializer, MatchSerializer
+from .skills import parse_skills
+
+# The async and sync list views side by side, whatever settings.ASYNC_VIEWS
+# selects in jsr.urls (AsyncViewTests).
+urlpatterns = [
+    path("async/feed/", async_views.AsyncJobFeedView.as_view()),
+    path("sync/feed/", views.JobFeedView.as_view()),
+    path("async/matches/", async_views.AsyncMatchListView.as_view()),
+    path("sync/matches/", views.MatchListView.as_view()),
+]
+
+
+class QueryBudgetMixin:
+    """
+    Assert that an endpoint runs at most `budget` queries and that the count
+    does not grow with the number of rows it returns.
+
+    `grow(n)` must bring the dataset behind `url` up to n rows.
+    """
+    budget_sizes = (2, 12)
+
+    def assertQueryBudget(self, client, url, budget, grow):
+        counts = []
+        for size in self.budget_sizes:
+            grow(size)
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            counts.append(len(ctx))
+
+        queries = "\n".join(q["sql"] for q in ctx.captured_queries)
+        self.assertLessEqual(max(counts), budget, f"{url} ran {counts} queries:\n{queries}")
+        self.assertEqual(
+            len(set(counts)), 1, f"{url} query count grows with rows {counts}:\n{queries}"
+        )
+
+
+def make_profile(username, role, **fields):
+    user = User.objects.create_user(username, f"{username}@example.com", "password")
+    return UserProfile.objects.create(user=user, role=role, **fields)
+
+
+class ListEndpointQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.jobseeker = make_profile("seeker", "jobseeker", skills="python")
+        self.client = APIClient()
+        cache.clear()
+
+    def login(self, profile):
+        self.client.force_authenticate(profile.user)
+
+    def grow_jobs(self, size):
+        for i in range(Job.objects.count(), size):
+            Job.objects.create(
+                recruiter=self.recruiter,
+                title=f"Job {i}",
+                company_name="Acme",
+                description="Description",
+            )
+
+    def grow_matches(self, size, status="pending"):
+        self.grow_jobs(size)
+        for job in Job.objects.filter(matches__isnull=True).order_by("id")[:size]:
+            seeker = make_profile(f"seeker-{job.id}", "jobseeker")
+            JobLike.objects.create(job=job, jobseeker=seeker, action="like")
+            Match.objects.create(job=job, jobseeker=seeker, status=status)
+            if status == "accepted":
+                Match.objects.create(job=job, jobseeker=self.jobseeker, status=status)
+
+    def test_jobs_for_jobseeker(self):
+        self.login(self.jobseeker)
+        self.assertQueryBudget(self.client, "/api/jobs/", 2, self.grow_jobs)
+
+    # Recruiter lists add one read of the jobs' counters (jsr.job_stats).
+    def test_jobs_for_recruiter(self):
+        self.login(self.recruiter)
+        self.assertQueryBudget(self.client, "/api/jobs/", 3, self.grow_jobs)
+
+    def test_swipe_feed(self):
+        self.login(self.jobseeker)
+        self.assertQueryBudget(self.client, "/api/jobs/feed/?limit=50", 2, self.grow_jobs)
+
+    def test_recruiter_jobs(self):
+        self.login(self.recruiter)
+        self.assertQueryBudget(self.client, "/api/my-jobs/", 2, self.grow_jobs)
+
+    # Matches add one aggregate over the updated_at index for the ETag.
+    def test_matches_for_recruiter(self):
+        self.login(self.recruiter)
+        self.assertQueryBudget(self.client, "/api/matches/", 3, self.grow_matches)
+
+    def test_matches_for_jobseeker(self):
+        self.login(self.jobseeker)
+        self.assertQueryBudget(
+            self.client,
+            "/api/matches/",
+            3,
+            lambda size: self.grow_matches(size, status="accepted"),
+        )
+
+
+class IndexUsageMixin:
+    """
+    Assert that every query an endpoint runs reaches jsr tables through an
+    index. The plan is read with EXPLAIN: on PostgreSQL with sequential scans
+    disabled (so a remaining Seq Scan means no usable index), on SQLite via
+    EXPLAIN QUERY PLAN, where a bare "SCAN <table>" is a full table scan and
+    "SCAN <table> USING INDEX" followed by a temp B-tree sort is a full walk
+    of an index that does not match the ordering.
+    """
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("EXPLAIN " + sql)
+                return [row[0] for row in cursor.fetchall()]
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def full_scans(self, plan):
+        lines = [line.strip() for line in plan]
+        if connection.vendor == "postgresql":
+            pattern = re.compile(r"Seq Scan on (jsr_\w+)")
+        elif "USE TEMP B-TREE FOR ORDER BY" in lines:
+            pattern = re.compile(r"^SCAN (jsr_\w+)")
+        else:
+            pattern = re.compile(r"^SCAN (jsr_\w+)$")
+        return [m.group(1) for line in lines for m in [pattern.search(line)] if m]
+
+    def assertUsesIndexes(self, client, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        for query in ctx.captured_queries:
+            if "jsr_" not in query["sql"]:
+                continue
+            plan = self.explain(query["sql"])
+            self.assertEqual(
+                self.full_scans(plan),
+                [],
+                f"{url} scans a table:\n{query['sql']}\n" + "\n".join(plan),
+            )
+
+
+class ListEndpointIndexUsageTests(IndexUsageMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        recruiters = [make_profile(f"recruiter-{i}", "recruiter") for i in range(10)]
+        cls.jobseekers = [make_profile(f"seeker-{i}", "jobseeker") for i in range(20)]
+        cls.recruiter = recruiters[0]
+
+        # bulk_create keeps the ranking signals out of the seeding cost.
+        jobs = Job.objects.bulk_create(
+            Job(
+                recruiter=recruiters[i % len(recruiters)],
+                title=f"Job {i}",
+                company_name="Acme",
+                description="Description",
+                skills=["Python, SQL", "JS, React", "Go"][i % 3],
+            )
+            for i in range(300)
+        )
+        skill_links.link_jobs(jobs)
+        job_ids = list(Job.objects.values_list("id", flat=True))
+        likes = []
+        matches = []
+        for n, seeker in enumerate(cls.jobseekers):
+            for job_id in job_ids[n::7]:
+                action = "like" if job_id % 2 else "dislike"
+                likes.append(JobLike(job_id=job_id, jobseeker=seeker, action=action))
+                matches.append(
+                    Match(
+                        job_id=job_id,
+                        jobseeker=seeker,
+                        status="accepted" if job_id % 3 else "pending",
+                        is_active=job_id % 5 != 0,
+                    )
+                )
+        JobLike.objects.bulk_create(likes)
+        Match.objects.bulk_create(matches)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        self.client = APIClient()
+        # Job lists are cached; bulk_create does not invalidate them.
+        cache.clear()
+
+    def test_jobseeker_endpoints(self):
+        self.client.force_authenticate(self.jobseekers[0].user)
+        for url in ["/api/jobs/", "/api/jobs/feed/", "/api/jobs/feed/ranked/", "/api/matches/"]:
+            with self.subTest(url=url):
+                self.assertUsesIndexes(self.client, url)
+
+    def test_recruiter_endpoints(self):
+        self.client.force_authenticate(self.recruiter.user)
+        for url in ["/api/jobs/", "/api/my-jobs/", "/api/matches/"]:
+            with self.subTest(url=url):
+                self.assertUsesIndexes(self.client, url)
+
+    def test_search(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("The icontains fallback cannot use an index.")
+        self.client.force_authenticate(self.recruiter.user)
+        self.assertUsesIndexes(self.client, "/api/jobs/search/?q=job")
+
+    def test_skill_filter(self):
+        self.client.force_authenticate(self.recruiter.user)
+        url = "/api/jobs/search/?skills=py,%20sql"
+        self.assertUsesIndexes(self.client, url)
+        self.assertEqual(self.client.get(url).data["count"], 100)
+
+
+@override_settings(SWIPE_WRITE_BEHIND=False)
+class MatchNotificationTests(TestCase):
+    """
+    Runs each scenario on one event loop; the HTTP calls go through
+    sync_to_async so they share the test's database connection.
+    """
+
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.jobseeker = make_profile("seeker", "jobseeker")
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title="Job", company_name="Acme", description="Description"
+        )
+        self.tokens = {
+            profile.id: str(ProfileTokenObtainPairSerializer.get_token(profile.user).access_token)
+            for profile in [self.recruiter, self.jobseeker]
+        }
+
+    def token(self, profile):
+        return self.tokens[profile.id]
+
+    def request(self, profile, method, url, data):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token(profile)}")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 300, response.content)
+        return response
+
+    async def connect(self, profile):
+        communicator = WebsocketCommunicator(
+            application, f"/ws/matches/?token={self.token(profile)}"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    def test_like_and_status_events(self):
+        async def scenario():
+            recruiter = await self.connect(self.recruiter)
+            jobseeker = await self.connect(self.jobseeker)
+
+            response = await sync_to_async(self.request)(
+                self.jobseeker, "post", f"/api/jobs/{self.job.id}/like/", {"action": "like"}
+            )
+            match_id = response.data["match_id"]
+            self.assertEqual(
+                await recruiter.receive_json_from(),
+                {
+                    "type": "match.liked",
+                    "job_id": self.job.id,
+                    "jobseeker_id": self.jobseeker.id,
+                    "match_id": match_id,
+                },
+            )
+
+            await sync_to_async(self.request)(
+                self.recruiter, "patch", f"/api/matches/{match_id}/", {"status": "accepted"}
+            )
+            self.assertEqual(
+                await jobseeker.receive_json_from(),
+                {
+                    "type": "match.status",
+                    "match_id": match_id,
+                    "job_id": self.job.id,
+                    "status": "accepted",
+                },
+            )
+            self.assertTrue(await recruiter.receive_nothing())
+
+            await recruiter.disconnect()
+            await jobseeker.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_rejects_missing_or_bad_token(self):
+        async def scenario():
+            for path in ["/ws/matches/", "/ws/matches/?token=nope"]:
+                communicator = WebsocketCommunicator(application, path)
+                connected, code = await communicator.connect()
+                self.assertFalse(connected)
+                self.assertEqual(code, 4401)
+
+        async_to_sync(scenario)()
+
+
+@override_settings(SWIPE_WRITE_BEHIND=False)
+class SwipeBatchTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.jobseeker = make_profile("seeker", "jobseeker")
+        self.jobs = [
+            Job.objects.create(
+                recruiter=self.recruiter, title=f"Job {n}", company_name="Acme", description="D"
+            )
+            for n in range(2)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.jobseeker.user)
+
+    def swipe(self, swipes, status=200):
+        response = self.client.post("/api/jobs/swipes/", {"swipes": swipes}, format="json")
+        self.assertEqual(response.status_code, status, response.content)
+        return response.data
+
+    def test_latest_client_ts_wins(self):
+        liked, disliked = (job.id for job in self.jobs)
+        results = self.swipe(
+            [
+                {"job_id": liked, "action": "like", "client_ts": "2026-01-01T10:00:05Z"},
+                {"job_id": liked, "action": "dislike", "client_ts": "2026-01-01T10:00:00Z"},
+                {"job_id": disliked, "action": "like"},
+                {"job_id": disliked, "action": "dislike"},
+                {"job_id": 999999, "action": "like"},
+            ]
+        )["results"]
+
+        match = Match.objects.get(job_id=liked, jobseeker=self.jobseeker)
+        self.assertEqual(
+            results,
+            [
+                {"job_id": liked, "status": "ok", "action": "like", "match_id": match.id},
+                {"job_id": disliked, "status": "ok", "action": "dislike", "match_id": None},
+                {"job_id": 999999, "status": "not_found"},
+            ],
+        )
+        self.assertEqual(
+            dict(JobLike.objects.values_list("job_id", "action")),
+            {liked: "like", disliked: "dislike"},
+        )
+        self.assertFalse(Match.objects.filter(job_id=disliked).exists())
+
+    def test_replayed_batch_moves_counters_once(self):
+        job_id = self.jobs[0].id
+        for _ in range(2):
+            self.swipe([{"job_id": job_id, "action": "like"}])
+        self.assertEqual(
+            job_stats.counters([job_id])[job_id],
+            {"likes": 1, "dislikes": 0, "matches": 1, "accepted": 0},
+        )
+        self.swipe([{"job_id": job_id, "action": "dislike"}])
+        self.assertEqual(
+            job_stats.counters([job_id])[job_id],
+            {"likes": 0, "dislikes": 1, "matches": 0, "accepted": 0},
+        )
+
+    def test_validation(self):
+        self.swipe([], status=400)
+        self.swipe([{"job_id": self.jobs[0].id, "action": "love"}], status=400)
+        self.client.force_authenticate(self.recruiter.user)
+        self.swipe([{"job_id": self.jobs[0].id, "action": "like"}], status=403)
+
+
+class MatchTriageTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.other = make_profile("other", "recruiter", company_name="Other")
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def make_matches(self, recruiter, size):
+        job = Job.objects.create(
+            recruiter=recruiter, title="Job", company_name="Acme", description="Description"
+        )
+        seekers = [make_profile(f"seeker-{job.id}-{i}", "jobseeker") for i in range(size)]
+        ids = [Match.objects.create(job=job, jobseeker=seeker).id for seeker in seekers]
+        job_stats.reconcile([job.id])
+        return ids
+
+    def triage(self, updates):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/api/matches/triage/", {"updates": updates}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data["results"], len(ctx)
+
+    def test_query_count_does_not_grow(self):
+        counts = []
+        for size in (2, 12):
+            ids = self.make_matches(self.recruiter, size)
+            updates = [
+                {"id": pk, "status": "accepted" if n % 2 else "rejected"} for n, pk in enumerate(ids)
+            ]
+            results, queries = self.triage(updates)
+            counts.append(queries)
+            self.assertEqual({r["outcome"] for r in results}, {"updated"})
+        self.assertEqual(len(set(counts)), 1, counts)
+        self.assertLessEqual(counts[0], 8, counts)
+
+    def test_outcomes_and_counters(self):
+        own = self.make_matches(self.recruiter, 3)
+        foreign = self.make_matches(self.other, 1)
+        results, _ = self.triage(
+            [
+                {"id": own[0], "status": "accepted"},
+                {"id": own[1], "status": "rejected"},
+                {"id": own[2], "status": "pending"},
+                {"id": foreign[0], "status": "rejected"},
+            ]
+        )
+        self.assertEqual(
+            [r["outcome"] for r in results], ["updated", "updated", "unchanged", "not_found"]
+        )
+        self.assertFalse(Match.objects.get(pk=own[1]).is_active)
+        self.assertTrue(Match.objects.get(pk=foreign[0]).is_active)
+
+        job_id = Match.objects.get(pk=own[0]).job_id
+        self.assertEqual(
+            job_stats.counters([job_id])[job_id],
+            {"likes": 0, "dislikes": 0, "matches": 2, "accepted": 1},
+        )
+
+
+    def test_single_update_locks_the_match(self):
+        (match_id,) = self.make_matches(self.recruiter, 1)
+        query = views.MatchUpdateStatusView().get_queryset().query
+        self.assertTrue(query.select_for_update)
+        self.assertEqual(query.select_for_update_of, ("self",))
+
+        for status in ("accepted", "accepted", "rejected"):
+            response = self.client.patch(
+                f"/api/matches/{match_id}/", {"status": status}, format="json"
+            )
+            self.assertEqual(response.status_code, 200, response.content)
+        job_id = Match.objects.get(pk=match_id).job_id
+        self.assertEqual(
+            job_stats.counters([job_id])[job_id],
+            {"likes": 0, "dislikes": 0, "matches": 0, "accepted": 0},
+        )
+
+
+class MatchSyncTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title="Job", company_name="Acme", description="D"
+        )
+        self.seekers = [make_profile(f"seeker-{n}", "jobseeker") for n in range(3)]
+        self.matches = [
+            Match.objects.create(job=self.job, jobseeker=seeker, status=status)
+            for seeker, status in zip(self.seekers[:2], ["pending", "accepted"])
+        ]
+        # The accepted match is older than the first cursor and its overlap.
+        for match, age in zip(self.matches, [1, 2]):
+            Match.objects.filter(pk=match.pk).update(
+                updated_at=timezone.now() - timedelta(hours=age)
+            )
+        self.client = APIClient()
+
+    def get(self, profile, since=None, status=200, **headers):
+        self.client.force_authenticate(profile.user)
+        params = {} if since is None else {"since": since}
+        response = self.client.get("/api/matches/", params, **headers)
+        self.assertEqual(response.status_code, status, response.content)
+        return response
+
+    def test_full_then_delta(self):
+        full = self.get(self.recruiter, since="").json()
+        self.assertEqual({row["id"] for row in full["results"]}, {m.id for m in self.matches})
+        self.assertEqual(full["removed"], [])
+
+        pending, accepted = self.matches
+        Match.objects.filter(pk=pending.pk).update(
+            is_active=False, status="rejected", updated_at=timezone.now()
+        )
+        new = Match.objects.create(job=self.job, jobseeker=self.seekers[2])
+
+        delta = self.get(self.recruiter, since=full["cursor"]).json()
+        self.assertEqual([row["id"] for row in delta["results"]], [new.id])
+        self.assertEqual(delta["removed"], [pending.id])
+        self.assertGreater(delta["cursor"], full["cursor"])
+
+        empty = self.get(self.recruiter, since=delta["cursor"]).json()
+        # The overlap repeats what changed just before the cursor.
+        self.assertEqual([row["id"] for row in empty["results"]], [new.id])
+        self.assertEqual(empty["removed"], [pending.id])
+
+    def test_jobseeker_tombstone_when_no_longer_accepted(self):
+        seeker = self.seekers[1]
+        full = self.get(seeker, since="").json()
+        self.assertEqual([row["id"] for row in full["results"]], [self.matches[1].id])
+
+        Match.objects.filter(pk=self.matches[1].pk).update(
+            status="pending", updated_at=timezone.now()
+        )
+        delta = self.get(seeker, since=full["cursor"]).json()
+        self.assertEqual(delta["results"], [])
+        self.assertEqual(delta["removed"], [self.matches[1].id])
+
+    def test_plain_timestamp_and_bad_since(self):
+        data = self.get(self.recruiter, since="2000-01-01T00:00:00").json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIn("since", self.get(self.recruiter, since="yesterday", status=400).json())
+
+    def test_not_modified_until_a_match_changes(self):
+        etag = self.get(self.recruiter, since="")["ETag"]
+        self.get(self.recruiter, since="", status=304, HTTP_IF_NONE_MATCH=etag)
+        Match.objects.filter(pk=self.matches[0].pk).update(
+            status="accepted", updated_at=timezone.now()
+        )
+        self.get(self.recruiter, since="", HTTP_IF_NONE_MATCH=etag)
+
+
+    def test_listed_job_and_avatar_changes_touch_matches(self):
+        full = self.get(self.recruiter, since="")
+        cursor, etag = full.json()["cursor"], full["ETag"]
+
+        self.client.force_authenticate(self.recruiter.user)
+        response = self.client.patch(f"/api/jobs/{self.job.pk}/", {"title": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        delta = self.get(self.recruiter, since=cursor, HTTP_IF_NONE_MATCH=etag).json()
+        self.assertEqual({row["job_title"] for row in delta["results"]}, {"Renamed"})
+        self.assertEqual(len(delta["results"]), 2)
+
+        seeker = self.seekers[1]
+        Match.objects.filter(jobseeker=seeker).update(updated_at=timezone.now() - timedelta(hours=1))
+        etag = self.get(seeker, since="")["ETag"]
+        seeker.save(update_fields=["bio"])
+        self.get(seeker, since="", status=304, HTTP_IF_NONE_MATCH=etag)
+        avatars.avatar_processed.send(sender=UserProfile, profile_id=seeker.pk)
+        self.get(seeker, since="", HTTP_IF_NONE_MATCH=etag)
+
+
+class JobDetailTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title="Dev", company_name="Acme", description="D"
+        )
+        self.client = APIClient()
+
+    def test_update_loads_the_job_once(self):
+        self.client.force_authenticate(self.recruiter.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(f"/api/jobs/{self.job.pk}/", {"title": "Lead"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "jsr_job"')]
+        self.assertEqual(len(selects), 1, selects)
+
+        other = make_profile("other", "recruiter", company_name="Other")
+        self.client.force_authenticate(other.user)
+        response = self.client.patch(f"/api/jobs/{self.job.pk}/", {"title": "Mine"}, format="json")
+        self.assertEqual(response.status_code, 403)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, "Lead")
+
+
+class JobCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.seeker = make_profile("seeker", "jobseeker")
+        self.jobs = [self.make_job(n) for n in range(5)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker.user)
+
+    def make_job(self, n, category="software_engineer"):
+        return Job.objects.create(
+            recruiter=self.recruiter,
+            title=f"Job {n}",
+            company_name="Acme",
+            description="D",
+            category=category,
+        )
+
+    def get(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **headers)
+        job_reads = [q for q in ctx.captured_queries if 'FROM "jsr_job"' in q["sql"]]
+        return response, len(job_reads)
+
+    def ids(self, response):
+        return [job["id"] for job in response.json()["results"]]
+
+    def test_pages_are_cached_per_cursor_and_filters(self):
+        first, reads = self.get("/api/jobs/?limit=2")
+        self.assertEqual(reads, 1)
+        self.assertEqual(self.ids(first), [self.jobs[4].id, self.jobs[3].id])
+        self.assertEqual(self.get("/api/jobs/?limit=2")[1], 0)
+
+        cursor = first.json()["next_cursor"]
+        second, reads = self.get(f"/api/jobs/?limit=2&cursor={cursor}")
+        self.assertEqual(reads, 1)
+        self.assertEqual(self.ids(second), [self.jobs[2].id, self.jobs[1].id])
+
+        other = self.make_job(5, category="data_scientist")
+        filtered, reads = self.get("/api/jobs/?category=data_scientist")
+        self.assertEqual((self.ids(filtered), reads), ([other.id], 1))
+
+    def test_job_changes_invalidate(self):
+        self.get("/api/jobs/?limit=2")
+        job = self.make_job(5)
+        response, reads = self.get("/api/jobs/?limit=2")
+        self.assertEqual(reads, 1)
+        self.assertEqual(self.ids(response)[0], job.id)
+
+        # A recruiter's company name is in every page of theirs.
+        self.recruiter.company_name = "Acme Inc"
+        self.recruiter.save()
+        response, _ = self.get("/api/jobs/?limit=2")
+        self.assertEqual(response.json()["results"][0]["recruiter_name"], "Acme Inc")
+
+    def test_dislikes_are_left_out_of_the_shared_page(self):
+        JobLike.objects.create(job=self.jobs[4], jobseeker=self.seeker, action="dislike")
+        response, _ = self.get("/api/jobs/?limit=2")
+        self.assertEqual(self.ids(response), [self.jobs[3].id])
+        self.assertTrue(response.json()["has_more"])
+
+        self.client.force_authenticate(make_profile("other", "jobseeker").user)
+        response, reads = self.get("/api/jobs/?limit=2")
+        self.assertEqual((self.ids(response), reads), ([self.jobs[4].id, self.jobs[3].id], 0))
+
+    def test_not_modified(self):
+        response, _ = self.get("/api/jobs/?limit=2")
+        etag = response["ETag"]
+        response, reads = self.get("/api/jobs/?limit=2", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, reads), (304, 0))
+        # Another page has another ETag.
+        self.assertEqual(self.get("/api/jobs/?limit=3", HTTP_IF_NONE_MATCH=etag)[0].status_code, 200)
+
+        JobLike.objects.create(job=self.jobs[4], jobseeker=self.seeker, action="dislike")
+        self.assertEqual(self.get("/api/jobs/?limit=2", HTTP_IF_NONE_MATCH=etag)[0].status_code, 200)
+
+        self.client.force_authenticate(self.recruiter.user)
+        response, _ = self.get("/api/my-jobs/")
+        self.assertEqual(len(response.json()["results"]), 5)
+        self.make_job(5)
+        response, _ = self.get("/api/my-jobs/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 6)
+
+
+class BulkImportExportTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def upload(self, name, content):
+        """Upload, run the queued import inline, return its status response."""
+        run_inline = mock.patch.object(tasks.import_jobs, "delay", side_effect=tasks.import_jobs)
+        with run_inline, mock.patch.object(tasks.refresh_ranking, "apply_async") as self.apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    "/api/my-jobs/import/",
+                    {"file": SimpleUploadedFile(name, content.encode("utf-8"))},
+                    format="multipart",
+                )
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual(response.data["status"], "pending")
+        return self.client.get(response["Location"])
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_import_reports_invalid_rows(self):
+        response = self.upload(
+            "jobs.csv",
+            "title,company_name,description,skills\n"
+            "Backend,Acme,Build APIs,python\n"
+            ",Acme,No title,\n"
+            "Frontend,Acme,Build screens,react\n",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual(response.data["report"]["created"], 2)
+        self.assertEqual([e["line"] for e in response.data["report"]["errors"]], [3])
+        # One debounced ranking refresh per imported job, not a full rebuild.
+        self.assertEqual(
+            sorted(call.args[0] for call in self.apply_async.call_args_list),
+            [("job", pk) for pk in Job.objects.order_by("pk").values_list("pk", flat=True)],
+        )
+        self.assertEqual(
+            set(Job.objects.filter(recruiter=self.recruiter).values_list("title", flat=True)),
+            {"Backend", "Frontend"},
+        )
+
+        response = self.upload("jobs.ndjson", '{"title": "Data"}\n[1]\n')
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual(response.data["report"]["failed"], 2)
+
+        # Stored uploads are deleted once imported.
+        self.assertFalse(JobImport.objects.exclude(file="").exists())
+        self.assertEqual(os.listdir(os.path.join(settings.MEDIA_ROOT, "imports")), [])
+
+    def test_import_runs_in_chunks(self):
+        row = '{"title": "Job", "company_name": "Acme", "description": "D"}\n'
+        with mock.patch.object(bulk, "IMPORT_CHUNK_SIZE", 2):
+            response = self.upload("jobs.ndjson", row * 5)
+        self.assertEqual(response.data["report"]["created"], 5)
+        self.assertEqual(Job.objects.count(), 5)
+        # A redelivered task leaves a finished import alone.
+        self.assertIsNone(bulk.run_import(response.data["id"]))
+
+    def test_import_status_is_private(self):
+        job_import = JobImport.objects.create(recruiter=self.recruiter, format=bulk.CSV)
+        other = APIClient()
+        other.force_authenticate(make_profile("rival", "recruiter").user)
+        response = other.get(f"/api/my-jobs/import/{job_import.pk}/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unqueued_import_fails(self):
+        with mock.patch.object(tasks.import_jobs, "delay", side_effect=OSError("broker down")):
+            with self.assertLogs("jsr.bulk"), self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    "/api/my-jobs/import/",
+                    {"file": SimpleUploadedFile("jobs.csv", b"title\nJob\n")},
+                    format="multipart",
+                )
+        job_import = JobImport.objects.get(pk=response.data["id"])
+        self.assertEqual(job_import.status, "failed")
+        self.assertFalse(job_import.file)
+
+    def test_csv_export_neutralises_formulas(self):
+        Job.objects.create(
+            recruiter=self.recruiter,
+            title='=HYPERLINK("http://evil","x")',
+            company_name="@Acme",
+            description="D",
+            salary_range="-1+1",
+            tags="+tag",
+        )
+        header, row = list(csv.reader(io.StringIO(self.export("/api/my-jobs/export/"))))
+        job = dict(zip(header, row))
+        self.assertEqual(job["title"], "'=HYPERLINK(\"http://evil\",\"x\")")
+        self.assertEqual(job["company_name"], "'@Acme")
+        self.assertEqual(job["salary_range"], "'-1+1")
+        self.assertEqual(job["tags"], "'+tag")
+        self.assertEqual(job["description"], "D")
+
+        line = self.export("/api/my-jobs/export/?fmt=ndjson")
+        self.assertEqual(json.loads(line)["title"], '=HYPERLINK("http://evil","x")')
+
+
+class RankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.seeker = make_profile("seeker", "jobseeker", skills="python, django", experience_years=3)
+
+    def make_job(self, title, skills, **fields):
+        return Job.objects.create(
+            recruiter=self.recruiter,
+            title=title,
+            company_name="Acme",
+            description="D",
+            skills=skills,
+            **fields,
+        )
+
+    def ranked(self, profile):
+        return list(
+            RankedJob.objects.filter(jobseeker=profile)
+            .order_by("-score", "job_id")
+            .values_list("job__title", flat=True)
+        )
+
+    @mock.patch.object(tasks.refresh_ranking, "apply_async")
+    def test_saves_schedule_one_refresh_after_commit(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = self.make_job("Backend", "python")
+            job.title = "Backend developer"
+            job.save()
+            self.assertFalse(apply_async.called)
+        apply_async.assert_called_once_with(("job", job.pk), countdown=ranking.RANKING_DEBOUNCE)
+
+        # Fields the scores do not read.
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save(update_fields=["title"])
+            self.seeker.save(update_fields=["bio"])
+        self.assertEqual(apply_async.call_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seeker.save(update_fields=["skills"])
+        apply_async.assert_called_with(
+            ("jobseeker", self.seeker.pk), countdown=ranking.RANKING_DEBOUNCE
+        )
+
+        # Once the task has started, saves queue a new one.
+        ranking.refresh("job", job.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save()
+        self.assertEqual(apply_async.call_count, 3)
+
+    def test_refresh_ranks_and_skips_swiped_jobs(self):
+        python = self.make_job("Python", "python, django", min_experience_years=2)
+        self.make_job("Java", "java")
+        swiped = self.make_job("Django", "django")
+        JobLike.objects.create(job=swiped, jobseeker=self.seeker, action="dislike")
+
+        ranking.refresh("jobseeker", self.seeker.pk)
+        self.assertEqual(self.ranked(self.seeker), ["Python", "Java"])
+
+        # A new job is spliced in by score.
+        self.make_job("Go", "go", min_experience_years=9)
+        ranking.refresh("job", Job.objects.get(title="Go").pk)
+        self.assertEqual(self.ranked(self.seeker), ["Python", "Java", "Go"])
+        self.assertEqual(
+            RankedJob.objects.get(jobseeker=self.seeker, job=python).score,
+            max(RankedJob.objects.values_list("score", flat=True)),
+        )
+
+    def test_job_refresh_in_batches(self):
+        seekers = [self.seeker] + [
+            make_profile(f"seeker{n}", "jobseeker", skills="python") for n in range(4)
+        ]
+        job = self.make_job("Backend", "python")
+        ranking.refresh("job", job.pk)
+        expected = dict(RankedJob.objects.filter(job=job).values_list("jobseeker_id", "score"))
+        self.assertEqual(len(expected), 5)
+
+        # Swiped since the last refresh: the row goes.
+        JobLike.objects.create(job=job, jobseeker=seekers[2], action="like")
+        del expected[seekers[2].pk]
+        for size in (1, 2, 4, 5):
+            with mock.patch.object(ranking, "RANKING_BATCH_SIZE", size):
+                ranking.refresh("job", job.pk)
+            self.assertEqual(
+                dict(RankedJob.objects.filter(job=job).values_list("jobseeker_id", "score")),
+                expected,
+                size,
+            )
+
+    @mock.patch.object(ranking, "FEED_TOP_K", 2)
+    def test_job_refresh_backfills_full_feeds(self):
+        python = self.make_job("Python", "python")
+        java = self.make_job("Java", "java, python")
+        self.make_job("Go", "go, python", min_experience_years=9)
+        ranking.refresh("jobseeker", self.seeker.pk)
+        self.assertEqual(self.ranked(self.seeker), ["Python", "Java"])
+
+        # Scored below the floor: the next job past the top-K takes its slot.
+        python.skills = "cobol"
+        python.save()
+        ranking.refresh("job", python.pk)
+        self.assertEqual(self.ranked(self.seeker), ["Java", "Go"])
+
+        # Swiped: likewise.
+        JobLike.objects.create(job=java, jobseeker=self.seeker, action="dislike")
+        ranking.refresh("job", java.pk)
+        self.assertEqual(self.ranked(self.seeker), ["Go", "Python"])
+
+    def test_refresh_of_deleted_rows(self):
+        job = self.make_job("Backend", "python")
+        job_id, seeker_id = job.pk, self.seeker.pk
+        job.delete()
+        self.seeker.delete()
+        ranking.refresh("job", job_id)
+        ranking.refresh("jobseeker", seeker_id)
+        self.assertFalse(RankedJob.objects.exists())
+
+
+class JobCandidatesTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.job = Job.objects.create(
+            recruiter=self.recruiter,
+            title="Backend",
+            company_name="Acme",
+            description="D",
+            skills="python, django",
+            min_experience_years=2,
+            max_experience_years=5,
+        )
+        # Equal scores, then the best match.
+        self.tied = [
+            make_profile(f"tied-{n}", "jobseeker", skills="python", experience_years=3)
+            for n in range(3)
+        ]
+        self.best = make_profile("best", "jobseeker", skills="python, django", experience_years=3)
+        make_profile("other", "jobseeker", skills="java", experience_years=3)
+        skill_index.index.build()
+        self.client = APIClient()
+        self.client.force_authenticate(self.recruiter.user)
+
+    def candidates(self, query="", status=200):
+        response = self.client.get(f"/api/jobs/{self.job.id}/candidates/?{query}")
+        self.assertEqual(response.status_code, status, response.content)
+        return response.data
+
+    def names(self, data):
+        return [candidate["name"] for candidate in data]
+
+    def test_order_and_modes(self):
+        self.assertEqual(self.names(self.candidates()), ["best"])
+        self.assertEqual(
+            self.names(self.candidates("mode=or")), ["best", "tied-0", "tied-1", "tied-2"]
+        )
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(self.names(self.candidates("mode=or&limit=2")), ["best", "tied-0"])
+        for limit in (0, -5):
+            self.assertEqual(self.names(self.candidates(f"mode=or&limit={limit}")), ["best"])
+        self.assertEqual(len(self.candidates("mode=or&limit=100000")), 4)
+
+    def test_invalid_params(self):
+        self.assertIn("limit", self.candidates("limit=ten", status=400))
+        self.assertIn("mode", self.candidates("mode=xor", status=400))
+
+    def test_only_the_jobs_recruiter(self):
+        self.client.force_authenticate(make_profile("rival", "recruiter").user)
+        self.candidates(status=403)
+
+
+class SwipeQueueTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.seeker = make_profile("seeker", "jobseeker")
+        self.jobs = [
+            Job.objects.create(
+                recruiter=self.recruiter, title=f"Job {n}", company_name="Acme", description="D"
+            )
+            for n in range(3)
+        ]
+        self.now = timezone.now()
+
+    def swipes(self, *swipes):
+        """(job index, action, seconds after now) -> queue items."""
+        return [
+            (self.seeker.id, self.jobs[n].id, action, self.now + timedelta(seconds=offset))
+            for n, action, offset in swipes
+        ]
+
+    def actions(self):
+        return dict(JobLike.objects.values_list("job_id", "action"))
+
+    def test_coalesces_last_write_wins(self):
+        for queue in (swipe_queue.InMemorySwipeQueue(), swipe_queue.DatabaseSwipeQueue()):
+            JobLike.objects.all().delete()
+            # Job 0's dislike arrives last but was made first.
+            queue.push_many(self.swipes((0, "like", 2), (1, "like", 0), (1, "dislike", 1)))
+            queue.push(*self.swipes((0, "dislike", 1))[0])
+            self.assertEqual(queue.depth(), 4)
+            self.assertEqual(queue.drain(swipe_queue.materialize, 100), 4)
+            self.assertEqual(queue.depth(), 0)
+            self.assertEqual(
+                self.actions(), {self.jobs[0].id: "like", self.jobs[1].id: "dislike"}
+            )
+        self.assertEqual(Match.objects.get(job=self.jobs[0]).status, "pending")
+
+    def test_poison_swipes_are_dead_lettered(self):
+        gone = self.seeker.id + 1000
+        for queue in (swipe_queue.InMemorySwipeQueue(), swipe_queue.DatabaseSwipeQueue()):
+            JobLike.objects.all().delete()
+            queue.push_many(self.swipes((0, "like", 0), (1, "like", 0)))
+            queue.push(gone, self.jobs[2].id, "like", self.now)
+            queue.push_many(self.swipes((2, "dislike", 0)))
+            with self.assertLogs("jsr.swipe_queue", "WARNING"):
+                self.assertEqual(queue.drain(swipe_queue.materialize, 100), 4)
+            self.assertEqual(queue.depth(), 0)
+            self.assertEqual(len(self.actions()), 3)
+            self.assertEqual(queue.drain(swipe_queue.materialize, 100), 0)
+
+        dead = PendingSwipe.objects.get()
+        self.assertEqual(dead.jobseeker_id, gone)
+        self.assertIsNotNone(dead.failed_at)
+        self.assertIn("IntegrityError", dead.error)
+
+    def test_drains_a_full_batch_of_distinct_pairs(self):
+        seekers = [self.seeker] + [
+            make_profile(f"seeker{n}", "jobseeker") for n in range(3)
+        ]
+        jobs = Job.objects.bulk_create(
+            Job(recruiter=self.recruiter, title=f"Bulk {n}", company_name="Acme", description="D")
+            for n in range(250)
+        )
+        queue = swipe_queue.DatabaseSwipeQueue()
+        queue.push_many(
+            (seeker.id, job.id, "like" if job.id % 2 else "dislike", self.now)
+            for seeker in seekers
+            for job in jobs
+        )
+        self.assertEqual(queue.drain(swipe_queue.materialize, 1000), 1000)
+        self.assertEqual(queue.depth(), 0)
+        self.assertEqual(JobLike.objects.count(), 1000)
+        self.assertEqual(Match.objects.count(), 500)
+
+    def test_transient_errors_keep_the_batch(self):
+        queue = swipe_queue.DatabaseSwipeQueue()
+        queue.push_many(self.swipes((0, "like", 0), (1, "like", 0)))
+        with mock.patch.object(
+            swipe_queue, "upsert_swipes", side_effect=swipe_queue.OperationalError("deadlock")
+        ):
+            with self.assertRaises(swipe_queue.OperationalError):
+                queue.drain(swipe_queue.materialize, 100)
+        self.assertEqual(queue.depth(), 2)
+        self.assertFalse(PendingSwipe.objects.filter(failed_at__isnull=False).exists())
+
+    @override_settings(SWIPE_WRITE_BEHIND=True)
+    def test_batch_view_queues_client_timestamps(self):
+        client = APIClient()
+        client.force_authenticate(self.seeker.user)
+        queue = swipe_queue.InMemorySwipeQueue()
+        client_ts = self.now - timedelta(minutes=5)
+        with mock.patch.object(views, "get_swipe_queue", return_value=queue):
+            response = client.post(
+                "/api/jobs/swipes/",
+                {
+                    "swipes": [
+                        {"job_id": self.jobs[0].id, "action": "like", "client_ts": client_ts},
+                        {"job_id": self.jobs[1].id, "action": "dislike"},
+                    ]
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        queued = {item["job_id"]: item["client_ts"] for item in queue.items}
+        self.assertEqual(queued[self.jobs[0].id], client_ts)
+        self.assertGreaterEqual(queued[self.jobs[1].id], self.now)
+
+
+class LoadtestCommandTests(TestCase):
+    def command(self, *args):
+        out = io.StringIO()
+        call_command(*args, stdout=out)
+        return out.getvalue()
+
+    def seed(self):
+        return json.loads(
+            self.command(
+                "seed_data",
+                "--jobseekers=6",
+                "--recruiters=2",
+                "--jobs=12",
+                "--likes-per-jobseeker=4",
+                "--rank",
+            )
+        )
+
+    def test_seed_data(self):
+        counts = self.seed()
+        self.assertEqual(counts["users"], 8)
+        self.assertEqual(counts["jobs"], 12)
+        self.assertEqual(counts["likes"], 24)
+        self.assertEqual(JobLike.objects.count(), 24)
+        self.assertEqual(Match.objects.count(), counts["matches"])
+        self.assertEqual(counts["ranked_feeds"], 6)
+        likes = job_stats.counters(list(Job.objects.values_list("id", flat=True)))
+        self.assertEqual(sum(c["likes"] + c["dislikes"] for c in likes.values()), 24)
+
+        # Another seed adds a batch next to the first.
+        self.command("seed_data", "--jobseekers=1", "--recruiters=1", "--jobs=1", "--seed=1")
+        self.assertEqual(User.objects.filter(username__startswith="bench-").count(), 10)
+
+    def test_benchmark_rolls_back(self):
+        self.seed()
+        before = sorted(JobLike.objects.values_list("job_id", "jobseeker_id", "action"))
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "report.json")
+            self.command(
+                "benchmark", "--requests=40", "--warmup=5", "--users=3", f"--output={output}"
+            )
+            with open(output) as f:
+                report = json.load(f)
+
+        self.assertEqual(report["requests"], 40)
+        self.assertEqual(sum(e["requests"] for e in report["endpoints"].values()), 40)
+        self.assertEqual({e["errors"] for e in report["endpoints"].values()}, {0})
+        for endpoint in report["endpoints"].values():
+            self.assertLessEqual(endpoint["p50_ms"], endpoint["p99_ms"])
+        self.assertEqual(
+            sorted(JobLike.objects.values_list("job_id", "jobseeker_id", "action")), before
+        )
+
+    def test_benchmark_needs_data(self):
+        with self.assertRaises(ValueError):
+            loadtest.run(requests=1, warmup=0)
+
+    def test_percentile(self):
+        self.assertIsNone(loadtest.percentile([], 50))
+        self.assertEqual(loadtest.percentile([5, 1, 3], 50), 3)
+        self.assertEqual(loadtest.percentile(range(101), 99), 99)
+
+
+class SkillLinkTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+
+    def make_job(self, skills, tags=""):
+        return Job.objects.create(
+            recruiter=self.recruiter,
+            title="Job",
+            company_name="Acme",
+            description="D",
+            skills=skills,
+            tags=tags,
+        )
+
+    def names(self, related):
+        return set(related.values_list("name", flat=True))
+
+    def test_aliases_fold_to_one_name(self):
+        self.assertEqual(
+            parse_skills("JS, javascript;  ReactJS\nk8s , Py, python3"),
+            ["javascript", "react", "kubernetes", "python"],
+        )
+        self.assertEqual(parse_skills(" ,; "), [])
+
+    def test_saves_replace_links(self):
+        job = self.make_job("Golang, postgres", tags="Remote")
+        self.assertEqual(self.names(job.skill_set), {"go", "postgresql"})
+        self.assertEqual(self.names(job.tag_set), {"remote"})
+        job.skills = "go, k8s"
+        job.save()
+        self.assertEqual(self.names(job.skill_set), {"go", "kubernetes"})
+
+    def test_search_by_alias(self):
+        job = self.make_job("TypeScript, React")
+        self.make_job("Java")
+        client = APIClient()
+        client.force_authenticate(make_profile("seeker", "jobseeker").user)
+        response = client.get("/api/jobs/search/", {"skills": "ts, reactjs"})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([row["id"] for row in response.json()["results"]], [job.id])
+
+    def test_text_search_reads_tags_as_typed(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("Only the tsvector search stems terms.")
+        # "it" is an English stop word and "happy" stems to "happi"; the
+        # tags are indexed unstemmed.
+        job = self.make_job("Python", tags="IT, happy")
+        self.make_job("Java", tags="remote")
+        client = APIClient()
+        client.force_authenticate(make_profile("seeker", "jobseeker").user)
+        for q in ("it", "happy", "happ"):
+            response = client.get("/api/jobs/search/", {"q": q})
+            self.assertEqual([row["id"] for row in response.json()["results"]], [job.id], q)
+
+    def test_saves_without_skills_keep_links(self):
+        job = self.make_job("python", tags="remote")
+        seeker = make_profile("seeker", "jobseeker", skills="go")
+        client = APIClient()
+        client.force_authenticate(seeker.user)
+        with mock.patch.object(skill_links, "_replace") as replace:
+            job.title = "Renamed"
+            job.save(update_fields=["title"])
+            # Jobseeker skills are not linked at all.
+            response = client.patch("/api/auth/me/", {"skills": "go, rust"}, format="json")
+            self.assertEqual(response.status_code, 200, response.content)
+
+            # A full PUT that leaves skills and tags as they were.
+            client.force_authenticate(self.recruiter.user)
+            data = {**JobSerializer(job).data, "title": "Backend"}
+            response = client.put(f"/api/jobs/{job.pk}/", data, format="json")
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertFalse(replace.called)
+
+            data["skills"] = "python, django"
+            client.put(f"/api/jobs/{job.pk}/", data, format="json")
+            self.assertEqual(replace.call_count, 2)  # skills and tags
+        job.refresh_from_db()
+        self.assertEqual((job.title, job.skills), ("Backend", "python, django"))
+
+    def test_data_migration_links_existing_rows(self):
+        job = self.make_job("Py, Django, " + "x" * 101, tags="remote, Remote")
+        # Rows from before the Skill table.
+        for through in (Job.skill_set.through, Job.tag_set.through):
+            through.objects.all().delete()
+        Skill.objects.all().delete()
+
+        migration = importlib.import_module("jsr.migrations.0012_link_existing_skills")
+        with mock.patch.object(migration, "BATCH_SIZE", 1):
+            for _ in range(2):  # re-running adds nothing
+                migration.link_existing_skills(apps, None)
+
+        self.assertEqual(self.names(job.skill_set), {"python", "django"})
+        self.assertEqual(self.names(job.tag_set), {"remote"})
+        self.assertEqual(Skill.objects.count(), 3)
+
+
+class FastJSONTests(TestCase):
+    """jsr.fast_json must give the bytes of the serializers + JSONRenderer."""
+
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Société X")
+        seeker = make_profile("seeker", "jobseeker")
+        processed = make_profile("processed", "jobseeker")
+        processed.avatar = "avatars/v/abc.jpg"
+        processed.avatar_variants = {"thumb": {"webp": "avatars/v/abc-thumb.webp"}}
+        processed.save()
+        jobs = [
+            Job.objects.create(
+                recruiter=self.recruiter,
+                title='Dév "backend" \U0001F680',
+                company_name="Acme",
+                description="Line\nbreak\ttab \\ \x01 \u2028",
+                min_experience_years=2,
+            ),
+            Job.objects.create(
+                recruiter=self.recruiter, title="Job", company_name="Acme", description="D"
+            ),
+        ]
+        for job in jobs:
+            for profile in (seeker, processed):
+                Match.objects.create(job=job, jobseeker=profile)
+
+    def assertSameBytes(self, serializer_data, rows):
+        self.assertEqual(JSONRenderer().render(serializer_data), FastJSONRenderer().render(rows))
+
+    def test_jobs(self):
+        queryset = Job.objects.select_related("recruiter").order_by("-created_at")
+        self.assertSameBytes(
+            JobSerializer(queryset, many=True).data,
+            fast_json.job_rows(fast_json.job_values(queryset)),
+        )
+
+    def test_matches(self):
+        request = APIRequestFactory().get("/api/matches/")
+        queryset = Match.objects.select_related("job", "jobseeker__user").order_by("id")
+        self.assertSameBytes(
+            MatchSerializer(queryset, many=True, context={"request": request}).data,
+            fast_json.match_rows(fast_json.match_values(queryset), request),
+        )
+        self.assertSameBytes(
+            MatchSerializer(queryset, many=True).data,
+            fast_json.match_rows(fast_json.match_values(queryset)),
+        )
+
+    def test_other_types_fall_back_to_drf_encoding(self):
+        data = {"at": timezone.now(), "amount": Decimal("1.50"), "cursor": None}
+        self.assertSameBytes(data, data)
+
+
+class JobFieldsTests(TestCase):
+    def setUp(self):
+        recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        seeker = make_profile("seeker", "jobseeker")
+        for i in range(3):
+            Job.objects.create(
+                recruiter=recruiter,
+                title=f"Job {i}",
+                company_name="Acme",
+                short_description="Short",
+                description="Long " * 200,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(seeker.user)
+
+    def get_feed(self, query):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/jobs/feed/?{query}")
+        sql = "\n".join(q["sql"] for q in ctx.captured_queries if '"jsr_job"' in q["sql"])
+        return response, sql
+
+    def test_card_view_leaves_columns_out_of_the_query(self):
+        response, sql = self.get_feed("view=card&limit=2")
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(list(body["results"][0]), list(fast_json.JOB_VIEWS["card"]))
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn("api_userprofile", sql.split("WHERE")[0])
+
+        # The cursor still pages through the card view.
+        response, _ = self.get_feed(f"view=card&limit=2&cursor={body['next_cursor']}")
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_fields(self):
+        response, sql = self.get_feed("fields=title,%20image_url")
+        self.assertEqual(list(response.json()["results"][0]), ["id", "title", "image_url"])
+        self.assertNotIn('"short_description"', sql)
+
+        response, _ = self.get_feed("")
+        self.assertEqual(list(response.json()["results"][0]), JobSerializer.Meta.fields)
+
+    def test_invalid_params(self):
+        for query in ("fields=title,salary", "view=full", "view=card&fields=title"):
+            response, _ = self.get_feed(query)
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_job_list_views(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/jobs/?view=card&limit=2")
+        self.assertEqual(response.status_code, 200, response.content)
+        card = response.json()
+        self.assertEqual(list(card["results"][0]), list(fast_json.JOB_VIEWS["card"]))
+        sql = "\n".join(q["sql"] for q in ctx.captured_queries if '"jsr_job"' in q["sql"])
+        self.assertNotIn('"description"', sql)
+
+        # Each view is cached and tagged on its own.
+        response = self.client.get("/api/jobs/?limit=2")
+        self.assertEqual(list(response.json()["results"][0]), JobSerializer.Meta.fields)
+        self.assertNotEqual(response["ETag"], self.client.get("/api/jobs/?view=card&limit=2")["ETag"])
+
+
+class FacetIndexTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.seeker = make_profile("seeker", "jobseeker")
+        categories = [value for value, _ in Job.CATEGORY_CHOICES]
+        governorates = ["tunis", "bizerte", ""]
+        ranges = [(None, None), (0, 1), (2, 5), (3, None), (None, 4), (12, 20), (50, None)]
+        for i in range(42):
+            low, high = ranges[i % len(ranges)]
+            self.make_job(
+                i,
+                category=categories[i % len(categories)],
+                governorate=governorates[i % len(governorates)],
+                min_experience_years=low,
+                max_experience_years=high,
+            )
+        facet_index.index.build()
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker.user)
+
+    def make_job(self, i, **fields):
+        return Job.objects.create(
+            recruiter=self.recruiter, title=f"Job {i}", company_name="Acme", description="D", **fields
+        )
+
+    def expected_counts(self, **filters):
+        def count(**params):
+            return filter_jobs(Job.objects.all(), **params).count()
+
+        def bucket(first, last, **params):
+            overlaps = Q(max_experience_years__isnull=True) | Q(max_experience_years__gte=first)
+            if last is not None:
+                overlaps &= Q(min_experience_years__isnull=True) | Q(min_experience_years__lte=last)
+            return filter_jobs(Job.objects.filter(overlaps), **params).count()
+
+        others = lambda facet: {k: v for k, v in filters.items() if k != facet}
+        return {
+            "count": count(**filters),
+            "facets": {
+                "category": {
+                    value: count(**{**others("category"), "category": value})
+                    for value in facet_index.FACET_VALUES["category"]
+                },
+                "governorate": {
+                    value: count(**{**others("governorate"), "governorate": value})
+                    for value in facet_index.FACET_VALUES["governorate"]
+                },
+                "experience": {
+                    name: bucket(first, last, **others("experience"))
+                    for name, (first, last) in facet_index.EXPERIENCE_BUCKETS.items()
+                },
+            },
+        }
+
+    def test_counts_match_queries(self):
+        for filters in (
+            {},
+            {"category": "data_scientist"},
+            {"category": "data_scientist", "governorate": "tunis"},
+            {"governorate": "bizerte", "experience": 3},
+            {"experience": 0},
+        ):
+            self.assertEqual(facet_index.index.counts(**filters), self.expected_counts(**filters))
+
+        response = self.client.get("/api/jobs/facets/?category=data_scientist&experience=3")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), self.expected_counts(category="data_scientist", experience=3))
+
+    def test_follows_job_writes(self):
+        job = self.make_job(100, category="product_manager", governorate="tunis")
+        filters = {"category": "product_manager", "governorate": "tunis"}
+        self.assertEqual(facet_index.index.counts(**filters), self.expected_counts(**filters))
+
+        job.category = "data_scientist"
+        job.save()
+        self.assertEqual(facet_index.index.counts(**filters), self.expected_counts(**filters))
+
+        job.delete()
+        filters = {"category": "data_scientist"}
+        self.assertEqual(facet_index.index.counts(**filters), self.expected_counts(**filters))
+
+    def test_experience_past_max_years(self):
+        self.make_job(100, min_experience_years=30, max_experience_years=45)
+        self.make_job(101, min_experience_years=45, max_experience_years=None)
+        expected = self.expected_counts(experience=facet_index.MAX_YEARS)
+        for years in (facet_index.MAX_YEARS, 45, 60):
+            facets = self.client.get(f"/api/jobs/facets/?experience={years}").json()
+            self.assertEqual(facets, expected, years)
+            feed = self.client.get(f"/api/jobs/feed/?experience={years}&limit=50").json()
+            self.assertEqual(len(feed["results"]), facets["count"], years)
+
+    def test_filtered_feed(self):
+        query = "category=software_engineer&governorate=tunis&limit=2"
+        jobs = filter_jobs(Job.objects.all(), category="software_engineer", governorate="tunis")
+        for job in jobs.order_by("id")[:2]:
+            JobLike.objects.create(job=job, jobseeker=self.seeker, action="like")
+        expected = list(
+            jobs.exclude(likes__jobseeker=self.seeker)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            body = self.client.get(f"/api/jobs/feed/?{query}&cursor={cursor}").json()
+            seen += [job["id"] for job in body["results"]]
+            cursor = body["next_cursor"]
+        self.assertEqual(seen, expected)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewTests(TestCase):
+    """The async list views must answer exactly as their sync twins."""
+
+    def setUp(self):
+        self.recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        self.jobseeker = make_profile("seeker", "jobseeker")
+        for i in range(5):
+            job = Job.objects.create(
+                recruiter=self.recruiter, title=f"Job {i}", company_name="Acme", description="D"
+            )
+            if i % 2:
+                Match.objects.create(job=job, jobseeker=self.jobseeker, status="accepted")
+
+    def get_both(self, profile, url):
+        token = ProfileTokenObtainPairSerializer.get_token(profile.user).access_token
+        client = APIClient(enforce_csrf_checks=True)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        responses = [client.get(f"/{kind}/{url}") for kind in ("async", "sync")]
+        for response in responses:
+            self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(responses[0]["Content-Type"], responses[1]["Content-Type"])
+        self.assertEqual(responses[0].content, responses[1].content)
+        return responses[0]
+
+    def test_feed(self):
+        body = self.get_both(self.jobseeker, "feed/?limit=2&view=card").json()
+        self.assertEqual(len(body["results"]), 2)
+        self.get_both(self.jobseeker, f"feed/?limit=2&cursor={body['next_cursor']}")
+        self.get_both(self.jobseeker, "feed/?category=software_engineer")
+
+    def test_matches(self):
+        UserProfile.objects.filter(pk=self.jobseeker.pk).update(
+            avatar="avatars/v/1-abc.jpg",
+            avatar_variants={"thumb": {"webp": "avatars/v/1-abc-thumb.webp"}},
+        )
+        for profile in (self.jobseeker, self.recruiter):
+            matches = self.get_both(profile, "matches/").json()
+            self.assertEqual(len(matches), 2)
+            self.assertEqual(
+                matches[0]["jobseeker_avatar"], "http://testserver/media/avatars/v/1-abc-thumb.webp"
+            )
+        self.get_both(self.recruiter, "matches/?since=2000-01-01T00:00:00Z")
+
+    def test_errors(self):
+        client = APIClient()
+        for kind in ("async", "sync"):
+            self.assertEqual(client.get(f"/{kind}/feed/").status_code, 401)
+        client.force_authenticate(self.recruiter.user)
+        # Recruiters have no swipe feed.
+        self.assertEqual(client.get("/async/feed/").status_code, 403)
+
+
+class HealthTests(TestCase):
+    def test_ok(self):
+        response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_database_down(self):
+        with mock.patch.object(health.connection, "cursor", side_effect=DatabaseError):
+            response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "unavailable"})
+
+
+class MetricsTests(TestCase):
+    def scrape(self, **headers):
+        return self.client.get("/metrics", **headers)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN="")
+    def test_closed_without_token(self):
+        self.assertEqual(self.scrape().status_code, 403)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_requires_token(self):
+        self.assertEqual(self.scrape().status_code, 403)
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION="Bearer nope").status_code, 403)
+        response = self.scrape(HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"jsr_swipe_queue_depth", response.content)
+
+    @override_settings(METRICS_SLOW_REQUEST_MS=0)
+    def test_serializer_time(self):
+        def serializer_seconds(route):
+            return REGISTRY.get_sample_value(
+                "http_request_serializer_duration_seconds_sum",
+                {"route": route, "method": "GET"},
+            ) or 0
+
+        recruiter = make_profile("recruiter", "recruiter", company_name="Acme")
+        job = Job.objects.create(recruiter=recruiter, title="Job", company_name="Acme", description="D")
+        client = APIClient()
+        client.force_authenticate(recruiter.user)
+        # A clock that moves a second per reading.
+        clock = mock.patch.object(instrumentation.time, "perf_counter", side_effect=range(10_000))
+        for url, route in ((f"/api/jobs/{job.pk}/", "api/jobs/<int:pk>/"), ("/api/jobs/", "api/jobs/")):
+            before = serializer_seconds(route)
+            with clock:
+                self.assertEqual(client.get(url).status_code, 200)
+            self.assertGreater(serializer_seconds(route), before, url)
+
+        # DRF's serializers are left as they are.
+        self.assertEqual(BaseSerializer.data.fget.__module__, "rest_framework.serializers")
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_queue_gauges_in_multiprocess_mode(self):
+        PendingSwipe.objects.create(jobseeker_id=1, job_id=1, action="like")
+        with tempfile.TemporaryDirectory() as path:
+            with mock.patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": path}):
+                response = self.scrape(HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"jsr_swipe_queue_depth 1.0", response.content)
+        self.assertIn(b"jsr_swipe_queue_lag_seconds", response.content)
@@ -0,0 +1,66 @@
+"""
+Set-based match triage for recruiters.
+
+triage_matches() applies {match_id: status} for one recruiter with a fixed
+number of queries, however many matches are reviewed: one joined SELECT
+(locked) that both loads the matches and authorizes them against
+job__recruiter, one UPDATE per target status, and the counter update
+(jsr.job_stats). Rejected matches are deactivated, as in
+MatchUpdateStatusView; each changed match notifies its jobseeker.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import job_stats, notifications
+from .models import Match
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+
+
+def _target(state, status):
+    is_active, _ = state
+    return (False if status == "rejected" else is_active, status)
+
+
+def triage_matches(profile, statuses):
+    """
+    Returns {match_id: outcome} for every id in statuses. Matches that do
+    not exist and matches on other recruiters' jobs are both "not_found".
+    """
+    outcomes = dict.fromkeys(statuses, NOT_FOUND)
+    with transaction.atomic():
+        rows = (
+            Match.objects.select_for_update(of=("self",))
+            .filter(id__in=list(statuses), job__recruiter=profile)
+            .values_list("id", "job_id", "jobseeker_id", "is_active", "status")
+        )
+
+        by_status = defaultdict(list)
+        deltas = defaultdict(Counter)
+        changed = []
+        for match_id, job_id, jobseeker_id, is_active, status in rows:
+            old = (is_active, status)
+            new = _target(old, statuses[match_id])
+            if new == old:
+                outcomes[match_id] = UNCHANGED
+                continue
+            outcomes[match_id] = UPDATED
+            by_status[new[1]].append(match_id)
+            deltas[job_id].update(job_stats.match_delta(old, new))
+            changed.append(Match(id=match_id, job_id=job_id, jobseeker_id=jobseeker_id, status=new[1]))
+
+        now = timezone.now()
+        for status, ids in by_status.items():
+            fields = {"status": status, "updated_at": now}
+            if status == "rejected":
+                fields["is_active"] = False
+            Match.objects.filter(id__in=ids).update(**fields)
+        job_stats.apply(deltas)
+
+        for match in changed:
+            notifications.match_status(match)
+    return outcomes
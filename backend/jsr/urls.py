@@ -1,15 +1,40 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+if settings.ASYNC_VIEWS:
+    feed_view = async_views.AsyncJobFeedView
+    ranked_feed_view = async_views.AsyncRankedJobFeedView
+    match_list_view = async_views.AsyncMatchListView
+else:
+    feed_view = views.JobFeedView
+    ranked_feed_view = views.RankedJobFeedView
+    match_list_view = views.MatchListView
 
 urlpatterns = [
     # Jobs
     path("jobs/", views.JobListCreateView.as_view(), name="job-list-create"),
+    path("jobs/feed/", feed_view.as_view(), name="job-feed"),
+    path("jobs/swipes/", views.SwipeBatchView.as_view(), name="job-swipe-batch"),
+    path("jobs/search/", views.JobSearchView.as_view(), name="job-search"),
+    path("jobs/facets/", views.JobFacetsView.as_view(), name="job-facets"),
+    path("jobs/feed/ranked/", ranked_feed_view.as_view(), name="job-feed-ranked"),
     path("jobs/<int:pk>/", views.JobDetailView.as_view(), name="job-detail"),
 
+    path("jobs/<int:pk>/candidates/", views.JobCandidatesView.as_view(), name="job-candidates"),
     path("jobs/<int:pk>/like/", views.JobLikeView.as_view(), name="job-like"),
-    path("matches/", views.MatchListView.as_view(), name="match-list"),
+    path("matches/", match_list_view.as_view(), name="match-list"),
     path("matches/<int:pk>/", views.MatchUpdateStatusView.as_view(), name="match-update-status"),
+    path("matches/export/", views.RecruiterMatchExportView.as_view(), name="match-export"),
+    path("matches/triage/", views.MatchTriageView.as_view(), name="match-triage"),
 
     path("my-jobs/", views.RecruiterJobListCreateView.as_view(),name="recruiter-job-list-create"),
+    path("my-jobs/import/", views.RecruiterJobImportView.as_view(), name="recruiter-job-import"),
+    path(
+        "my-jobs/import/<int:pk>/",
+        views.RecruiterJobImportDetailView.as_view(),
+        name="recruiter-job-import-detail",
+    ),
+    path("my-jobs/export/", views.RecruiterJobExportView.as_view(), name="recruiter-job-export"),
     
 ]
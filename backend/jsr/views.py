@@ -1,25 +1,119 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, FilteredRelation, OuterRef, Q
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from api.authentication import StatelessProfileJWTAuthentication
 from api.models import UserProfile
-from .models import Job, JobLike, Match
-from .serializers import JobSerializer, JobLikeSerializer, MatchSerializer
+from api.profiles import get_user_profile
+from . import bulk, fast_json, job_cache, job_stats, match_sync, notifications, triage
+from .etags import is_not_modified, make_etag, not_modified, with_etag
+from .models import Job, JobImport, JobLike, Match
+from .pagination import (
+    JobListPagination,
+    RankedFeedPagination,
+    SearchPagination,
+    SwipeFeedPagination,
+)
+from .search import filter_jobs, search_jobs
+from .serializers import (
+    CandidateParamsSerializer,
+    CandidateSerializer,
+    JobFacetParamsSerializer,
+    JobFieldsParamsSerializer,
+    JobImportSerializer,
+    JobSerializer,
+    JobLikeSerializer,
+    JobSearchParamsSerializer,
+    MatchSerializer,
+    MatchTriageSerializer,
+    SwipeBatchSerializer,
+)
+from .facet_index import index as facet_index
+from .skill_index import index as skill_index
+from .skills import parse_skills
+from .swipe_queue import get_queue as get_swipe_queue
+from .swipes import apply_swipes, latest_swipes
+
+
+if settings.JSR_STATELESS_AUTH:
+    JSR_AUTHENTICATION = [StatelessProfileJWTAuthentication]
+else:
+    JSR_AUTHENTICATION = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+
+class CachedJobListMixin:
+    """
+    GET ?cursor=<cursor>&limit=<n>[&category=&governorate=&experience=<years>]
+        [&view=card|detail][&fields=a,b]
+
+    Serves keyset-paginated job lists (newest first) from the shared page
+    cache (jsr.job_cache), one entry per scope, filters, cursor, limit and
+    fields. view= and fields= work as on the swipe feed (JobFeedView) and
+    only the columns asked for are selected.
+    Responses carry an ETag; a matching If-None-Match gets a 304 without a
+    body.
+
+    A recruiter's own list also carries each job's "stats" (jsr.job_stats).
+    They change with every swipe, so they are read per request, one indexed
+    row per active job, and merged into the cached page.
 
+    Pages are built and rendered by jsr.fast_json.
+    """
+    renderer_classes = fast_json.RENDERER_CLASSES
+    pagination_class = JobListPagination
+
+    def cached_jobs(self, scope, queryset, exclude=frozenset(), stats_for=None):
+        params = self.request.query_params
+        filters = facet_filters(params)
+        paginator = self.paginator
+        cursor = params.get(paginator.cursor_query_param)
+        fields = job_fields(params)
+        key = job_cache.page_params(filters, cursor, paginator.get_limit(params), fields)
+
+        version = job_cache.get_version(scope)
+        stats = job_stats.recruiter_counters(stats_for) if stats_for is not None else None
+        etag = make_etag(scope, version, key, sorted(exclude), stats and sorted(stats.items()))
+        if is_not_modified(self.request, etag):
+            return not_modified(etag)
+
+        def build():
+            ordering = [field.lstrip("-") for field in paginator.ordering]
+            rows = fast_json.job_values(
+                filter_jobs(queryset, **filters), *ordering, fields=fields
+            )
+            page = paginator.paginate_queryset(rows, self.request)
+            return paginator.get_paginated_data(fast_json.job_rows(page, fields))
 
-def get_user_profile(user) -> UserProfile:
-    return UserProfile.objects.get(user=user)
+        data = job_cache.get_page(scope, version, build, params=key)
+        jobs = data["results"]
+        if exclude:
+            jobs = [job for job in jobs if job["id"] not in exclude]
+        if stats is not None:
+            jobs = [{**job, "stats": stats.get(job["id"], job_stats.ZERO)} for job in jobs]
+        return with_etag(Response({**data, "results": jobs}), etag)
 
 
-class JobListCreateView(generics.ListCreateAPIView):
+class JobListCreateView(CachedJobListMixin, generics.ListCreateAPIView):
     """
     GET: list jobs
       - jobseeker: jobs excluding disliked
       - recruiter: own jobs
     POST: create job (recruiter only)
+
+    Jobseekers share the cached pages of all jobs; their dislikes are
+    filtered out of each page per request. See CachedJobListMixin for the
+    paging and filter parameters.
     """
     serializer_class = JobSerializer
+    authentication_classes = JSR_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -29,72 +123,309 @@ class JobListCreateView(generics.ListCreateAPIView):
             disliked_ids = JobLike.objects.filter(
                 jobseeker=profile, action="dislike"
             ).values_list("job_id", flat=True)
-            return Job.objects.exclude(id__in=disliked_ids).order_by("-created_at")
+            return (
+                Job.objects.exclude(id__in=disliked_ids)
+                .select_related("recruiter")
+                .order_by("-created_at")
+            )
 
         if profile.role == "recruiter":
-            return Job.objects.filter(recruiter=profile).order_by("-created_at")
+            return (
+                Job.objects.filter(recruiter=profile)
+                .select_related("recruiter")
+                .order_by("-created_at")
+            )
 
         return Job.objects.none()
 
+    def list(self, request, *args, **kwargs):
+        profile = get_user_profile(request.user)
+
+        if profile.role == "jobseeker":
+            disliked = set(
+                JobLike.objects.filter(jobseeker=profile, action="dislike").values_list(
+                    "job_id", flat=True
+                )
+            )
+            return self.cached_jobs(job_cache.ALL_JOBS, Job.objects.all(), exclude=disliked)
+
+        if profile.role == "recruiter":
+            return self.cached_jobs(
+                job_cache.recruiter_scope(profile.id), self.get_queryset(), stats_for=profile.id
+            )
+
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         profile = get_user_profile(self.request.user)
         if profile.role != "recruiter":
-            raise permissions.PermissionDenied("Only recruiters can create jobs.")
+            raise PermissionDenied("Only recruiters can create jobs.")
         serializer.save(recruiter=profile)
 
 
+def job_fields(params):
+    """The fields asked for with ?view= / ?fields=, see JobFieldsParamsSerializer."""
+    serializer = JobFieldsParamsSerializer(data=params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data["fields"]
+
+
+def facet_filters(params):
+    """The category/governorate/experience filters given, see jsr.facet_index."""
+    serializer = JobFacetParamsSerializer(data=params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def feed_queryset(profile):
+    if profile.role != "jobseeker":
+        raise PermissionDenied("Only jobseekers have a swipe feed.")
+
+    swiped = JobLike.objects.filter(job=OuterRef("pk"), jobseeker=profile)
+    return Job.objects.filter(~Exists(swiped)).select_related("recruiter")
+
+
+def ranked_feed_queryset(profile):
+    if profile.role != "jobseeker":
+        raise PermissionDenied("Only jobseekers have a swipe feed.")
+
+    swiped = JobLike.objects.filter(job=OuterRef("pk"), jobseeker=profile)
+    return (
+        Job.objects.annotate(
+            entry=FilteredRelation(
+                "ranked_entries", condition=Q(ranked_entries__jobseeker=profile)
+            )
+        )
+        .filter(entry__isnull=False)
+        .filter(~Exists(swiped))
+        .annotate(feed_score=F("entry__score"))
+        .select_related("recruiter")
+    )
+
+
+class JobFeedView(generics.ListAPIView):
+    """
+    GET /api/jobs/feed/?cursor=<cursor>&limit=<n>[&view=card|detail][&fields=a,b]
+                       [&category=&governorate=&experience=<years>]
+    Swipe feed for jobseekers: jobs they have neither liked nor disliked,
+    newest first, keyset-paginated on (created_at, id).
+
+    The filters are applied in SQL (jsr.search.filter_jobs); their counts
+    come from GET /api/jobs/facets/.
+
+    view=card leaves out the description, tags and recruiter (only the
+    card's columns are selected); clients load the full job from
+    GET /api/jobs/<id>/ when it is opened. fields= picks any JobSerializer
+    fields. The default is every field (view=detail).
+    """
+    serializer_class = JobSerializer
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SwipeFeedPagination
+    renderer_classes = fast_json.RENDERER_CLASSES
+
+    def get_queryset(self):
+        return feed_queryset(get_user_profile(self.request.user))
+
+    def list(self, request, *args, **kwargs):
+        fields = job_fields(request.query_params)
+        filters = facet_filters(request.query_params)
+        ordering = [field.lstrip("-") for field in self.paginator.ordering]
+        queryset = fast_json.job_values(
+            filter_jobs(self.get_queryset(), **filters), *ordering, fields=fields
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(fast_json.job_rows(page, fields))
+
+
+class RankedJobFeedView(JobFeedView):
+    """
+    GET /api/jobs/feed/ranked/?cursor=<cursor>&limit=<n>
+    Same as the swipe feed, but served from the jobseeker's precomputed
+    ranking (jsr.ranking), best match first. When it runs out
+    (has_more=false) clients fall back to the chronological feed.
+    """
+    pagination_class = RankedFeedPagination
+
+    def get_queryset(self):
+        return ranked_feed_queryset(get_user_profile(self.request.user))
+
+
+class JobSearchView(generics.ListAPIView):
+    """
+    GET /api/jobs/search/?q=<text>&skills=<a, b>&category=&governorate=&experience=<years>
+    Ranked full-text search over title, skills, tags and descriptions,
+    see jsr.search. Terms match as prefixes; all terms must match.
+    skills requires every listed skill (aliases folded, see jsr.skills),
+    looked up through Job.skill_set; without q, newest jobs come first.
+    view= and fields= work as on the swipe feed.
+    """
+    serializer_class = JobSerializer
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SearchPagination
+    renderer_classes = fast_json.RENDERER_CLASSES
+
+    def get_queryset(self):
+        params = JobSearchParamsSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        queryset = filter_jobs(
+            Job.objects.select_related("recruiter"),
+            category=filters.get("category"),
+            governorate=filters.get("governorate"),
+            experience=filters.get("experience"),
+            skills=filters.get("skills"),
+        )
+        if not filters.get("q"):
+            return queryset.order_by("-created_at", "-id")
+        return search_jobs(queryset, filters["q"])
+
+    def list(self, request, *args, **kwargs):
+        fields = job_fields(request.query_params)
+        page = self.paginate_queryset(fast_json.job_values(self.get_queryset(), fields=fields))
+        return self.get_paginated_response(fast_json.job_rows(page, fields))
+
+
+class JobFacetsView(APIView):
+    """
+    GET /api/jobs/facets/?category=&governorate=&experience=<years>
+    { "count": <jobs matching every filter>,
+      "facets": {"category": {value: count}, "governorate": {...},
+                 "experience": {"0-1": count, "2-4": ..., "5-9": ..., "10+": ...}} }
+    Each facet is counted with the other filters applied but not its own.
+    Served from jsr.facet_index, so counts can trail writes made by other
+    processes by up to facet_index.MAX_AGE seconds.
+    """
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = fast_json.RENDERER_CLASSES
+
+    def get(self, request):
+        return Response(facet_index.counts(**facet_filters(request.query_params)))
+
+
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = JobSerializer
+    authentication_classes = JSR_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
-    queryset = Job.objects.all()
+    queryset = Job.objects.select_related("recruiter")
 
     def perform_update(self, serializer):
         profile = get_user_profile(self.request.user)
-        job = self.get_object()
-        if job.recruiter != profile:
-            raise permissions.PermissionDenied("You can only edit your own jobs.")
+        if serializer.instance.recruiter_id != profile.id:
+            raise PermissionDenied("You can only edit your own jobs.")
         serializer.save()
 
     def perform_destroy(self, instance):
         profile = get_user_profile(self.request.user)
-        if instance.recruiter != profile:
-            raise permissions.PermissionDenied("You can only delete your own jobs.")
+        if instance.recruiter_id != profile.id:
+            raise PermissionDenied("You can only delete your own jobs.")
         instance.delete()
 
 
+class JobCandidatesView(APIView):
+    """
+    GET /api/jobs/<id>/candidates/?mode=and|or&limit=<n>
+    Recruiter only: jobseekers whose skills match the job's skills,
+    looked up in the in-process skill index (jsr.skill_index).
+    """
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 200
+
+    def get(self, request, pk):
+        profile = get_user_profile(request.user)
+        job = get_object_or_404(Job, pk=pk)
+        if job.recruiter_id != profile.id:
+            raise PermissionDenied("You can only search candidates for your own jobs.")
+
+        params = CandidateParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        mode = params.validated_data["mode"]
+        limit = max(1, min(params.validated_data["limit"], self.max_limit))
+
+        ranked = skill_index.rank(
+            parse_skills(job.skills),
+            mode=mode,
+            min_years=job.min_experience_years,
+            max_years=job.max_experience_years,
+            limit=limit,
+        )
+        ranking = {pk: (matched, score) for pk, matched, score in ranked}
+        profiles = UserProfile.objects.filter(id__in=ranking).select_related("user")
+        # In the index's order: best score first, lowest id on ties.
+        position = {pk: n for n, pk in enumerate(ranking)}
+        profiles = sorted(profiles, key=lambda p: position[p.id])
+
+        serializer = CandidateSerializer(profiles, many=True, context={"ranking": ranking})
+        return Response(serializer.data)
+
+
 class JobLikeView(APIView):
     """
     POST /api/jobs/<id>/like/
     Body: { "action": "like" | "dislike" }
+
+    With SWIPE_WRITE_BEHIND the swipe is queued (202, match_id null) and
+    JobLike/Match rows are written by the swipe queue worker.
     """
+    authentication_classes = JSR_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, pk):
         profile = get_user_profile(request.user)
         if profile.role != "jobseeker":
-            raise permissions.PermissionDenied("Only jobseekers can like jobs.")
+            raise PermissionDenied("Only jobseekers can like jobs.")
 
-        job = get_object_or_404(Job, pk=pk)
+        job = get_object_or_404(Job.objects.only("id", "recruiter_id"), pk=pk)
         serializer = JobLikeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         action = serializer.validated_data["action"]
 
-        JobLike.objects.update_or_create(
-            job=job,
-            jobseeker=profile,
-            defaults={"action": action},
-        )
+        if settings.SWIPE_WRITE_BEHIND:
+            get_swipe_queue().push(profile.id, job.id, action, timezone.now())
+            return Response(
+                {"status": "queued", "action": action, "match_id": None},
+                status=status.HTTP_202_ACCEPTED,
+            )
 
-        match = None
-        if action == "like":
-            match, _ = Match.objects.get_or_create(
+        with transaction.atomic():
+            like, created = JobLike.objects.select_for_update().get_or_create(
                 job=job,
                 jobseeker=profile,
-                defaults={"status": "pending", "is_active": True},
+                defaults={"action": action},
             )
-        else:
-            # If they dislike after previously liking, optionally deactivate any existing match
-            Match.objects.filter(job=job, jobseeker=profile).update(is_active=False, status="rejected")
+            delta = job_stats.swipe_delta(None if created else like.action, action)
+            if not created and like.action != action:
+                like.action = action
+                like.save(update_fields=["action"])
+
+            match = None
+            if action == "like":
+                match, created = Match.objects.get_or_create(
+                    job=job,
+                    jobseeker=profile,
+                    defaults={"status": "pending", "is_active": True},
+                )
+                if created:
+                    delta.update(job_stats.match_delta(None, (True, "pending")))
+                    notifications.match_liked(job.recruiter_id, job.id, profile.id, match.id)
+            else:
+                # If they dislike after previously liking, optionally deactivate any existing match
+                previous = (
+                    Match.objects.select_for_update()
+                    .filter(job=job, jobseeker=profile)
+                    .values_list("is_active", "status")
+                    .first()
+                )
+                if previous is not None:
+                    Match.objects.filter(job=job, jobseeker=profile).update(
+                        is_active=False, status="rejected", updated_at=timezone.now()
+                    )
+                    delta.update(job_stats.match_delta(previous, (False, "rejected")))
+            job_stats.apply({job.id: delta})
 
         return Response(
             {
@@ -106,70 +437,302 @@ class JobLikeView(APIView):
         )
 
 
+class SwipeBatchView(APIView):
+    """
+    POST /api/jobs/swipes/
+    Body: { "swipes": [{ "job_id": 1, "action": "like" | "dislike", "client_ts": "..." }, ...] }
+
+    Applies up to 200 swipes in one transaction (see jsr.swipes), or queues
+    them with SWIPE_WRITE_BEHIND. Repeated job ids keep the swipe with the
+    latest client_ts. Returns one result per distinct job id.
+    """
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        profile = get_user_profile(request.user)
+        if profile.role != "jobseeker":
+            raise PermissionDenied("Only jobseekers can like jobs.")
+
+        serializer = SwipeBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        swipes = serializer.validated_data["swipes"]
+        latest = latest_swipes(swipes, lambda swipe: swipe["job_id"])
+        actions = {job_id: swipe["action"] for job_id, swipe in latest.items()}
+
+        if settings.SWIPE_WRITE_BEHIND:
+            missing = set(actions) - set(
+                Job.objects.filter(id__in=actions).values_list("id", flat=True)
+            )
+            # The client's timestamps decide against swipes still queued;
+            # swipes without one are stamped now, as JobLikeView's.
+            now = timezone.now()
+            get_swipe_queue().push_many(
+                (profile.id, job_id, swipe["action"], swipe.get("client_ts") or now)
+                for job_id, swipe in latest.items()
+                if job_id not in missing
+            )
+            outcome, match_ids = "queued", {}
+        else:
+            match_ids, missing = apply_swipes(profile, actions)
+            outcome = "ok"
+
+        results = []
+        for job_id, action in actions.items():
+            if job_id in missing:
+                results.append({"job_id": job_id, "status": "not_found"})
+                continue
+            results.append(
+                {
+                    "job_id": job_id,
+                    "status": outcome,
+                    "action": action,
+                    "match_id": match_ids.get(job_id),
+                }
+            )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+def match_scope(profile):
+    """(every match the profile can see in any state, filter for listed ones)"""
+    if profile.role == "jobseeker":
+        return Match.objects.filter(jobseeker=profile), Q(is_active=True, status="accepted")
+
+    if profile.role == "recruiter":
+        return Match.objects.filter(job__recruiter=profile), Q(is_active=True)
+
+    return Match.objects.none(), Q()
+
+
 class MatchListView(generics.ListAPIView):
     """
     GET /api/matches/
     - jobseeker: accepted matches only
     - recruiter: pending + accepted matches across their jobs
+
+    GET /api/matches/?since=<cursor>
+    Delta sync, see jsr.match_sync:
+    { "results": [...], "removed": [ids], "cursor": "<next since>" }
+    An empty since returns everything. Both forms answer a matching
+    If-None-Match with a 304.
     """
     serializer_class = MatchSerializer
+    authentication_classes = JSR_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = fast_json.RENDERER_CLASSES
 
     def get_queryset(self):
-        profile = get_user_profile(self.request.user)
+        scope, listed = match_scope(get_user_profile(self.request.user))
+        return (
+            scope.filter(listed)
+            .select_related("job", "jobseeker__user")
+            .order_by("-created_at")
+        )
 
-        if profile.role == "jobseeker":
-            return Match.objects.filter(
-                jobseeker=profile,
-                is_active=True,
-                status="accepted",
-            ).order_by("-created_at")
+    def list(self, request, *args, **kwargs):
+        since_param = request.query_params.get("since")
+        since = match_sync.parse_since(since_param)
+        scope, listed = match_scope(get_user_profile(request.user))
 
-        if profile.role == "recruiter":
-            return Match.objects.filter(
-                job__recruiter=profile,
-                is_active=True,
-            ).order_by("-created_at")
+        last_updated, count = match_sync.scope_state(scope)
+        etag = make_etag("matches", request.user.pk, since_param, last_updated, count)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        if since_param is None:
+            data = fast_json.match_rows(fast_json.match_values(self.get_queryset()), request)
+            return with_etag(Response(data), etag)
 
-        return Match.objects.none()
+        results, removed = match_sync.changes(scope, listed, since)
+        data = {
+            "results": fast_json.match_rows(fast_json.match_values(results), request),
+            "removed": list(removed),
+            "cursor": match_sync.encode_cursor(last_updated),
+        }
+        return with_etag(Response(data), etag)
 
 
-class RecruiterJobListCreateView(generics.ListCreateAPIView):
+class RecruiterJobListCreateView(CachedJobListMixin, generics.ListCreateAPIView):
     serializer_class = JobSerializer
+    authentication_classes = JSR_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Job.objects.filter(recruiter__user=self.request.user).order_by("-created_at")
+        return (
+            Job.objects.filter(recruiter=get_user_profile(self.request.user))
+            .select_related("recruiter")
+            .order_by("-created_at")
+        )
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
         ctx["request"] = self.request
         return ctx
 
+    def list(self, request, *args, **kwargs):
+        profile = get_user_profile(request.user)
+        return self.cached_jobs(
+            job_cache.recruiter_scope(profile.id), self.get_queryset(), stats_for=profile.id
+        )
+
 
 class MatchUpdateStatusView(generics.UpdateAPIView):
     """
     PATCH /api/matches/<id>/
     Body: { "status": "accepted" | "rejected" }
     """
-    queryset = Match.objects.all()
+    queryset = Match.objects.select_related("job", "jobseeker__user")
     serializer_class = MatchSerializer
+    authentication_classes = JSR_AUTHENTICATION
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        # Locked, so concurrent PATCHes each see the status the other left
+        # and the job stats deltas are applied once.
+        return super().get_queryset().select_for_update(of=("self",))
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
     def perform_update(self, serializer):
         profile = get_user_profile(self.request.user)
-        match = self.get_object()
+        match = serializer.instance
 
         if profile.role != "recruiter":
-            raise permissions.PermissionDenied("Only recruiters can update match status.")
+            raise PermissionDenied("Only recruiters can update match status.")
 
-        if match.job.recruiter != profile:
-            raise permissions.PermissionDenied("You can only update matches for your own jobs.")
+        if match.job.recruiter_id != profile.id:
+            raise PermissionDenied("You can only update matches for your own jobs.")
 
         new_status = serializer.validated_data.get("status")
+        previous = (match.is_active, match.status)
 
         # If rejected, deactivate (so it disappears from recruiter lists too)
         if new_status == "rejected":
-            serializer.save(is_active=False)
+            match = serializer.save(is_active=False)
         else:
-            serializer.save()
+            match = serializer.save()
+        job_stats.apply(
+            {match.job_id: job_stats.match_delta(previous, (match.is_active, match.status))}
+        )
+        notifications.match_status(match)
+
+
+class MatchTriageView(APIView):
+    """
+    POST /api/matches/triage/
+    Body: { "updates": [{ "id": <match id>, "status": "accepted" | "rejected" | "pending" }] }
+    -> { "results": [{ "id", "status", "outcome": "updated" | "unchanged" | "not_found" }] }
+
+    Recruiter only. The whole list is authorized and applied with a fixed
+    number of queries, see jsr.triage. A repeated id keeps its last status.
+    """
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        profile = get_user_profile(request.user)
+        if profile.role != "recruiter":
+            raise PermissionDenied("Only recruiters can update match status.")
+
+        serializer = MatchTriageSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        statuses = {item["id"]: item["status"] for item in serializer.validated_data["updates"]}
+
+        outcomes = triage.triage_matches(profile, statuses)
+        results = [
+            {"id": match_id, "status": target, "outcome": outcomes[match_id]}
+            for match_id, target in statuses.items()
+        ]
+        return Response({"results": results})
+
+
+class RecruiterOnlyMixin:
+    def get_recruiter(self):
+        profile = get_user_profile(self.request.user)
+        if profile.role != "recruiter":
+            raise PermissionDenied("Only recruiters can import or export jobs.")
+        return profile
+
+
+class RecruiterJobImportView(RecruiterOnlyMixin, APIView):
+    """
+    POST /api/my-jobs/import/  (multipart, field "file": .csv or .ndjson)
+    -> 202 { "id", "status": "pending", ... }, Location: the import's status URL
+    The file is imported by a worker, see jsr.bulk.
+    """
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        profile = self.get_recruiter()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+        fmt = bulk.upload_format(upload)
+        if fmt is None:
+            raise ValidationError({"file": ["Upload a .csv or .ndjson file."]})
+
+        job_import = JobImport.objects.create(recruiter=profile, format=fmt, file=upload)
+        bulk.schedule(job_import)
+        location = reverse("recruiter-job-import-detail", args=[job_import.pk])
+        return Response(
+            JobImportSerializer(job_import).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": request.build_absolute_uri(location)},
+        )
+
+
+class RecruiterJobImportDetailView(RecruiterOnlyMixin, APIView):
+    """
+    GET /api/my-jobs/import/<id>/
+    -> { "id", "status": pending|running|done|failed, "report", "created_at", "finished_at" }
+    A finished import's report is { "created", "failed", "errors": [{"line", "errors"}],
+    "errors_truncated" }, or { "error" } if it failed as a whole.
+    """
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        profile = self.get_recruiter()
+        job_import = get_object_or_404(JobImport, pk=pk, recruiter=profile)
+        return Response(JobImportSerializer(job_import).data)
+
+
+class ExportView(RecruiterOnlyMixin, APIView):
+    """GET ?fmt=csv|ndjson (default csv), streamed."""
+    authentication_classes = JSR_AUTHENTICATION
+    permission_classes = [permissions.IsAuthenticated]
+    filename = None
+    header = ()
+
+    def rows(self, profile):
+        raise NotImplementedError
+
+    def get(self, request):
+        profile = self.get_recruiter()
+        fmt = request.query_params.get("fmt", bulk.CSV)
+        if fmt not in bulk.FORMATS:
+            raise ValidationError({"fmt": [f"Must be one of: {', '.join(bulk.FORMATS)}."]})
+        chunks = bulk.render_rows(self.header, self.rows(profile), fmt)
+        return bulk.stream_response(request, chunks, fmt, self.filename)
+
+
+class RecruiterJobExportView(ExportView):
+    """GET /api/my-jobs/export/"""
+    filename = "jobs"
+    header = bulk.JOB_EXPORT_FIELDS
+
+    def rows(self, profile):
+        return bulk.export_jobs(profile)
+
+
+class RecruiterMatchExportView(ExportView):
+    """GET /api/matches/export/: matches on the recruiter's jobs, rejected included."""
+    filename = "matches"
+    header = list(bulk.MATCH_EXPORT_FIELDS)
+
+    def rows(self, profile):
+        return bulk.export_matches(profile)